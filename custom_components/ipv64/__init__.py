@@ -2,121 +2,194 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
+from functools import partial
 import logging
+import time
+from typing import Any
+
+import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components.persistent_notification import async_create, async_dismiss
-from homeassistant.const import CONF_DOMAIN, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import CONF_DOMAIN, CONF_DOMAINS, Platform
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import CONF_API_ECONOMY, CONF_API_KEY, DOMAIN, SERVICE_ADD_DOMAIN, SERVICE_DELETE_DOMAIN, SERVICE_REFRESH
-from .coordinator import IPv64DataUpdateCoordinator, add_domain, delete_domain
+from .const import (
+    ATTR_ACTION,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_TOKENS,
+    CONF_API_ECONOMY,
+    CONF_API_KEY,
+    CONF_HEALTHCHECK_INTERVAL,
+    DATA_PINGER,
+    DEFAULT_HEALTHCHECK_INTERVAL,
+    DOMAIN,
+    PING_ACTIONS,
+    SERVICE_ADD_DOMAIN,
+    SERVICE_ADD_DOMAINS,
+    SERVICE_DELETE_DOMAIN,
+    SERVICE_DELETE_DOMAINS,
+    SERVICE_PING_HEALTHCHECK,
+    SERVICE_REFRESH,
+    SIGNAL_DOMAINS_REASSIGNED,
+)
+from .coordinator import IPv64DataUpdateCoordinator, add_domain, bulk_domains, delete_domain
+from .healthchecks import IPv64HealthcheckCoordinator
+from .pinger import PING_FAILED, PING_QUEUED, PING_SENT, HealthcheckPinger
+from .watcher import async_create_watcher
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+BULK_DOMAINS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+PING_HEALTHCHECK_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TOKENS): vol.All(cv.ensure_list, [cv.string], vol.Length(min=1)),
+        vol.Optional(ATTR_ACTION, default="success"): vol.In(PING_ACTIONS),
+    }
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """Set up the IPv64.net component."""
-    _LOGGER.debug("Initializing IPv64.net component")
-    hass.data.setdefault(DOMAIN, {})
-    return True
+def _get_coordinators(hass: HomeAssistant) -> dict[str, IPv64DataUpdateCoordinator]:
+    """Return the coordinators of all loaded config entries."""
+    return {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data[DOMAIN].items()
+        if isinstance(coordinator, IPv64DataUpdateCoordinator)
+    }
 
 
-async def async_migrate_entry(hass: HomeAssistant, config_entry: config_entries.ConfigEntry) -> bool:
-    """Migrate old config entries to new format."""
-    _LOGGER.debug("Migrating config entry %s", config_entry.entry_id)
-    if config_entry.version == 1:
-        new_options = {**config_entry.options}
-        if CONF_API_ECONOMY not in new_options:
-            new_options[CONF_API_ECONOMY] = True
-            hass.config_entries.async_update_entry(config_entry, options=new_options)
-            _LOGGER.info("Migrated config entry %s to set CONF_API_ECONOMY=True", config_entry.entry_id)
-    return True
+@callback
+def _async_get_target_coordinators(
+    hass: HomeAssistant, call: ServiceCall, domain: str | None = None, refresh: bool = False
+) -> list[IPv64DataUpdateCoordinator]:
+    """Return the coordinators a service call is targeted at.
 
+    A call is targeted by config entry ID or by domain. Without a target, a refresh
+    applies to all entries while the domain services need a single account.
+    """
+    coordinators = _get_coordinators(hass)
+    if not coordinators:
+        raise ServiceValidationError("No IPv64.net config entry is loaded")
+    if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+        if entry_id not in coordinators:
+            raise ServiceValidationError(f"Config entry {entry_id} is not a loaded IPv64.net entry")
+        return [coordinators[entry_id]]
 
-async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
-    """Configure based on config entry."""
-    _LOGGER.debug("Configuring IPv64.net for entry %s with domain %s", entry.entry_id, entry.data.get("domain"))
-    if not entry.data.get("domain"):
-        _LOGGER.error("Invalid config entry: missing domain for entry %s", entry.entry_id)
-        async_create(
-            hass,
-            f"IPv64.net: Invalid config entry for ID {entry.entry_id}. Domain is missing.",
-            title="IPv64.net Configuration Error",
-            notification_id=f"{DOMAIN}_{entry.entry_id}_config_error",
+    candidates = list(coordinators.values())
+    if domain:
+        # The configured domain targets its entry, any other domain the entries of its account
+        matches = [c for c in candidates if c.config_entry.data.get(CONF_DOMAIN) == domain]
+        if not matches:
+            matches = [c for c in candidates if domain in c.domains]
+        if matches:
+            candidates = matches
+        elif refresh:
+            raise ServiceValidationError(f"No IPv64.net config entry found for domain {domain}")
+    if refresh:
+        return candidates
+    if len({c.config_entry.data.get(CONF_API_KEY) for c in candidates}) > 1:
+        raise ServiceValidationError(
+            f"The service call matches {len(candidates)} IPv64.net accounts, select one with {ATTR_CONFIG_ENTRY_ID}"
         )
-        return False
-    async_dismiss(
-        hass,
-        notification_id=f"{DOMAIN}_{entry.entry_id}_config_error",
-    )
+    return candidates[:1]
 
-    if not await async_migrate_entry(hass, entry):
-        return False
 
-    coordinator = IPv64DataUpdateCoordinator(hass, entry)
+async def _async_handle_bulk_domains(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Handle service call to add or delete several domains."""
+    delete = call.service == SERVICE_DELETE_DOMAINS
+    domains = call.data[CONF_DOMAINS]
+    # Deleting is targeted at the account that owns the domains
+    coordinator = _async_get_target_coordinators(hass, call, domains[0] if delete and domains else None)[0]
+    entry_id = coordinator.config_entry.entry_id
+    _LOGGER.debug("Service call to %s domains %s for entry %s", call.service, call.data[CONF_DOMAINS], entry_id)
     try:
-        await coordinator.async_config_entry_first_refresh()
-    except (ValueError, ConnectionError) as err:
-        _LOGGER.error("Failed to refresh config entry %s: %s", entry.entry_id, err)
+        results = await bulk_domains(
+            hass, coordinator, call.data[CONF_DOMAINS], coordinator.config_entry.data.get(CONF_API_KEY), delete=delete
+        )
+    except ValueError as err:
+        _LOGGER.error("Failed to %s: %s", call.service, err)
+        raise ServiceValidationError(str(err)) from err
+
+    notification_id = f"{DOMAIN}_{entry_id}_{call.service}_error"
+    if failed := [domain for domain, result in results.items() if not result["success"]]:
         async_create(
             hass,
-            f"IPv64.net: Error while loading configuration for {entry.data.get('domain')}: {err}",
-            title="IPv64.net Initialization Error",
-            notification_id=f"{DOMAIN}_{entry.entry_id}_init_error",
+            f"IPv64.net: {len(failed)} of {len(results)} domains could not be {'deleted' if delete else 'created'}: "
+            f"{', '.join(failed)}",
+            title="IPv64.net Domain Error",
+            notification_id=notification_id,
         )
-        return False
-    async_dismiss(
-        hass,
-        notification_id=f"{DOMAIN}_{entry.entry_id}_init_error",
-    )
+    else:
+        async_dismiss(hass, notification_id=notification_id)
+    return {
+        CONF_DOMAINS: results,
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+    }
 
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(options_update_listener))
 
-    async def refresh(call: ServiceCall) -> None:
-        """Handle service call to update IP address."""
-        if len(hass.data[DOMAIN]) != 1:
-            _LOGGER.error("Expected exactly one config entry, found %d", len(hass.data[DOMAIN]))
-            async_create(
-                hass,
-                f"IPv64.net: Invalid number of config entries: {len(hass.data[DOMAIN])}. Only one instance is allowed.",
-                title="IPv64.net Service Error",
-                notification_id=f"{DOMAIN}_service_error",
-            )
-            return
-        async_dismiss(
-            hass,
-            notification_id=f"{DOMAIN}_service_error",
-        )
-        entry_id = next(iter(hass.data[DOMAIN]))
-        _LOGGER.debug("Service call to refresh IP address for entry %s", entry_id)
-        coordinator: IPv64DataUpdateCoordinator = hass.data[DOMAIN][entry_id]
-        await coordinator.async_update(call)
-
-    async def handle_add_domain(call: ServiceCall) -> None:
-        """Handle service call to add a domain."""
-        if len(hass.data[DOMAIN]) != 1:
-            _LOGGER.error("Expected exactly one config entry, found %d", len(hass.data[DOMAIN]))
-            async_create(
-                hass,
-                f"IPv64.net: Invalid number of config entries: {len(hass.data[DOMAIN])}. Only one instance is allowed.",
-                title="IPv64.net Service Error",
-                notification_id=f"{DOMAIN}_service_error",
-            )
-            return
-        async_dismiss(
-            hass,
-            notification_id=f"{DOMAIN}_service_error",
-        )
-        entry_id = next(iter(hass.data[DOMAIN]))
+async def _async_handle_ping_healthcheck(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Handle service call to ping several healthchecks."""
+    pinger: HealthcheckPinger = hass.data[DOMAIN][DATA_PINGER]
+    results = await pinger.async_ping(call.data[ATTR_TOKENS], call.data[ATTR_ACTION])
+    return {
+        "results": results,
+        **{result: sum(value == result for value in results.values()) for result in (PING_SENT, PING_QUEUED, PING_FAILED)},
+    }
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the IPv64.net component."""
+    _LOGGER.debug("Initializing IPv64.net component")
+    hass.data.setdefault(DOMAIN, {})
+
+    async def refresh(call: ServiceCall) -> ServiceResponse:
+        """Handle service call to update IP address, returns the result of each entry."""
+        coordinators = _async_get_target_coordinators(hass, call, call.data.get(CONF_DOMAIN), refresh=True)
+        # A manual refresh fetches the account data again, once for each API key
+        for scheduler in {coordinator.scheduler for coordinator in coordinators}:
+            scheduler.async_invalidate()
+        results: dict[str, dict[str, Any]] = {}
+        errors: list[HomeAssistantError] = []
+        for coordinator in coordinators:
+            _LOGGER.debug("Service call to refresh IP address for entry %s", coordinator.config_entry.entry_id)
+            try:
+                result = await coordinator.async_update(call)
+            except HomeAssistantError as err:
+                # The other entries are still refreshed
+                errors.append(err)
+                domain = coordinator.config_entry.data.get(CONF_DOMAIN, "")
+                results[domain] = {CONF_DOMAIN: domain, "success": False, "error": str(err)}
+            else:
+                results[result[CONF_DOMAIN]] = {**result, "success": True, "error": None}
+        # Without a response the failure is reported as before
+        if errors and not call.return_response:
+            raise errors[0]
+        return {
+            CONF_DOMAINS: results,
+            "succeeded": len(results) - len(errors),
+            "failed": len(errors),
+        }
+
+    async def handle_add_domain(call: ServiceCall) -> ServiceResponse:
+        """Handle service call to add a domain, returns whether it succeeded."""
         domain = call.data.get(CONF_DOMAIN)
+        coordinator = _async_get_target_coordinators(hass, call, domain)[0]
+        entry_id = coordinator.config_entry.entry_id
         if not domain:
             _LOGGER.error("No domain provided for add_domain service")
             async_create(
@@ -125,13 +198,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
                 title="IPv64.net Service Error",
                 notification_id=f"{DOMAIN}_{entry_id}_add_domain_error",
             )
-            return
+            return {CONF_DOMAIN: domain, "success": False, "error": "No domain specified", "duration": 0.0}
         async_dismiss(
             hass,
             notification_id=f"{DOMAIN}_{entry_id}_add_domain_error",
         )
         _LOGGER.debug("Service call to add domain %s for entry %s", domain, entry_id)
-        coordinator: IPv64DataUpdateCoordinator = hass.data[DOMAIN][entry_id]
+        started = time.monotonic()
+        error: str | None = None
         try:
             await add_domain(hass, coordinator, domain, coordinator.config_entry.data.get(CONF_API_KEY))
             async_create(
@@ -140,46 +214,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
                 title="IPv64.net Domain Created",
                 notification_id=f"{DOMAIN}_{entry_id}_add_domain_success",
             )
-            # Reload integration to recreate sensors with new subdomains
-            await hass.config_entries.async_reload(entry_id)
             async_dismiss(
                 hass,
                 notification_id=f"{DOMAIN}_{entry_id}_add_domain_error",
             )
-        except ValueError as err:
+        except (ValueError, HomeAssistantError) as err:
             _LOGGER.error("Failed to add domain %s: %s", domain, err)
+            error = str(err)
             async_create(
                 hass,
                 f"IPv64.net: Error while creating domain {domain}: {err}",
                 title="IPv64.net Domain Error",
                 notification_id=f"{DOMAIN}_{entry_id}_add_domain_error",
             )
-        except ConnectionError as err:
-            _LOGGER.error("Connection error while adding domain %s: %s", domain, err)
-            async_create(
-                hass,
-                f"IPv64.net: Connection error while creating domain {domain}: {err}",
-                title="IPv64.net Domain Error",
-                notification_id=f"{DOMAIN}_{entry_id}_add_domain_error",
-            )
+            # Without a response the failure is reported like the one of a refresh
+            if not call.return_response:
+                if isinstance(err, ValueError):
+                    raise ServiceValidationError(str(err)) from err
+                raise
+        return {
+            CONF_DOMAIN: domain,
+            "success": error is None,
+            "error": error,
+            # Milliseconds, including the refresh that follows a change
+            "duration": round((time.monotonic() - started) * 1000, 1),
+        }
 
-    async def handle_delete_domain(call: ServiceCall) -> None:
-        """Handle service call to delete a domain."""
-        if len(hass.data[DOMAIN]) != 1:
-            _LOGGER.error("Expected exactly one config entry, found %d", len(hass.data[DOMAIN]))
-            async_create(
-                hass,
-                f"IPv64.net: Invalid number of config entries: {len(hass.data[DOMAIN])}. Only one instance is allowed.",
-                title="IPv64.net Service Error",
-                notification_id=f"{DOMAIN}_service_error",
-            )
-            return
-        async_dismiss(
-            hass,
-            notification_id=f"{DOMAIN}_service_error",
-        )
-        entry_id = next(iter(hass.data[DOMAIN]))
+    async def handle_delete_domain(call: ServiceCall) -> ServiceResponse:
+        """Handle service call to delete a domain, returns whether it succeeded."""
         domain = call.data.get(CONF_DOMAIN)
+        coordinator = _async_get_target_coordinators(hass, call, domain)[0]
+        entry_id = coordinator.config_entry.entry_id
         if not domain:
             _LOGGER.error("No domain provided for delete_domain service")
             async_create(
@@ -188,13 +253,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
                 title="IPv64.net Service Error",
                 notification_id=f"{DOMAIN}_{entry_id}_delete_domain_error",
             )
-            return
+            return {CONF_DOMAIN: domain, "success": False, "error": "No domain specified", "duration": 0.0}
         async_dismiss(
             hass,
             notification_id=f"{DOMAIN}_{entry_id}_delete_domain_error",
         )
         _LOGGER.debug("Service call to delete domain %s for entry %s", domain, entry_id)
-        coordinator: IPv64DataUpdateCoordinator = hass.data[DOMAIN][entry_id]
+        started = time.monotonic()
+        error: str | None = None
         try:
             await delete_domain(hass, coordinator, domain, coordinator.config_entry.data.get(CONF_API_KEY))
             async_create(
@@ -203,44 +269,159 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
                 title="IPv64.net Domain Deleted",
                 notification_id=f"{DOMAIN}_{entry_id}_delete_domain_success",
             )
-            # Reload integration to recreate sensors with updated subdomains
-            await hass.config_entries.async_reload(entry_id)
             async_dismiss(
                 hass,
                 notification_id=f"{DOMAIN}_{entry_id}_delete_domain_error",
             )
-        except ValueError as err:
+        except (ValueError, HomeAssistantError) as err:
             _LOGGER.error("Failed to delete domain %s: %s", domain, err)
+            error = str(err)
             async_create(
                 hass,
                 f"IPv64.net: Error while deleting domain {domain}: {err}",
                 title="IPv64.net Domain Error",
                 notification_id=f"{DOMAIN}_{entry_id}_delete_domain_error",
             )
-        except ConnectionError as err:
-            _LOGGER.error("Connection error while deleting domain %s: %s", domain, err)
-            async_create(
-                hass,
-                f"IPv64.net: Connection error while deleting domain {domain}: {err}",
-                title="IPv64.net Domain Error",
-                notification_id=f"{DOMAIN}_{entry_id}_delete_domain_error",
-            )
+            # Without a response the failure is reported like the one of a refresh
+            if not call.return_response:
+                if isinstance(err, ValueError):
+                    raise ServiceValidationError(str(err)) from err
+                raise
+        return {
+            CONF_DOMAIN: domain,
+            "success": error is None,
+            "error": error,
+            # Milliseconds, including the refresh that follows a change
+            "duration": round((time.monotonic() - started) * 1000, 1),
+        }
 
     if not hass.services.has_service(DOMAIN, SERVICE_REFRESH):
-        hass.services.async_register(DOMAIN, SERVICE_REFRESH, refresh)
+        hass.services.async_register(DOMAIN, SERVICE_REFRESH, refresh, supports_response=SupportsResponse.OPTIONAL)
     else:
         _LOGGER.debug("Service %s already registered", SERVICE_REFRESH)
 
     if not hass.services.has_service(DOMAIN, SERVICE_ADD_DOMAIN):
-        hass.services.async_register(DOMAIN, SERVICE_ADD_DOMAIN, handle_add_domain)
+        hass.services.async_register(
+            DOMAIN, SERVICE_ADD_DOMAIN, handle_add_domain, supports_response=SupportsResponse.OPTIONAL
+        )
     else:
         _LOGGER.debug("Service %s already registered", SERVICE_ADD_DOMAIN)
 
     if not hass.services.has_service(DOMAIN, SERVICE_DELETE_DOMAIN):
-        hass.services.async_register(DOMAIN, SERVICE_DELETE_DOMAIN, handle_delete_domain)
+        hass.services.async_register(
+            DOMAIN, SERVICE_DELETE_DOMAIN, handle_delete_domain, supports_response=SupportsResponse.OPTIONAL
+        )
     else:
         _LOGGER.debug("Service %s already registered", SERVICE_DELETE_DOMAIN)
 
+    for service in (SERVICE_ADD_DOMAINS, SERVICE_DELETE_DOMAINS):
+        if not hass.services.has_service(DOMAIN, service):
+            hass.services.async_register(
+                DOMAIN,
+                service,
+                partial(_async_handle_bulk_domains, hass),
+                schema=BULK_DOMAINS_SCHEMA,
+                supports_response=SupportsResponse.OPTIONAL,
+            )
+        else:
+            _LOGGER.debug("Service %s already registered", service)
+
+    if not hass.services.has_service(DOMAIN, SERVICE_PING_HEALTHCHECK):
+        # Pings are sent with the token of the healthcheck, they do not need a config entry
+        pinger = hass.data[DOMAIN][DATA_PINGER] = HealthcheckPinger(hass)
+        await pinger.async_load()
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_PING_HEALTHCHECK,
+            partial(_async_handle_ping_healthcheck, hass),
+            schema=PING_HEALTHCHECK_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+    else:
+        _LOGGER.debug("Service %s already registered", SERVICE_PING_HEALTHCHECK)
+
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, config_entry: config_entries.ConfigEntry) -> bool:
+    """Migrate old config entries to new format."""
+    _LOGGER.debug("Migrating config entry %s", config_entry.entry_id)
+    if config_entry.version == 1:
+        new_options = {**config_entry.options}
+        if CONF_API_ECONOMY not in new_options:
+            new_options[CONF_API_ECONOMY] = True
+            hass.config_entries.async_update_entry(config_entry, options=new_options)
+            _LOGGER.info("Migrated config entry %s to set CONF_API_ECONOMY=True", config_entry.entry_id)
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
+    """Configure based on config entry."""
+    _LOGGER.debug("Configuring IPv64.net for entry %s with domain %s", entry.entry_id, entry.data.get("domain"))
+    if not entry.data.get("domain"):
+        _LOGGER.error("Invalid config entry: missing domain for entry %s", entry.entry_id)
+        async_create(
+            hass,
+            f"IPv64.net: Invalid config entry for ID {entry.entry_id}. Domain is missing.",
+            title="IPv64.net Configuration Error",
+            notification_id=f"{DOMAIN}_{entry.entry_id}_config_error",
+        )
+        return False
+    async_dismiss(
+        hass,
+        notification_id=f"{DOMAIN}_{entry.entry_id}_config_error",
+    )
+
+    if not await async_migrate_entry(hass, entry):
+        return False
+
+    coordinator = IPv64DataUpdateCoordinator(hass, entry)
+    await coordinator.async_load_outbox()
+    # Warm start from the persisted data and refresh in the background instead of blocking setup
+    warm_start = await coordinator.async_load_cache()
+    try:
+        if not warm_start:
+            await coordinator.async_config_entry_first_refresh()
+    except (ValueError, ConnectionError) as err:
+        _LOGGER.error("Failed to refresh config entry %s: %s", entry.entry_id, err)
+        async_create(
+            hass,
+            f"IPv64.net: Error while loading configuration for {entry.data.get('domain')}: {err}",
+            title="IPv64.net Initialization Error",
+            notification_id=f"{DOMAIN}_{entry.entry_id}_init_error",
+        )
+        await coordinator.async_close()
+        return False
+    except Exception:
+        await coordinator.async_close()
+        raise
+    async_dismiss(
+        hass,
+        notification_id=f"{DOMAIN}_{entry.entry_id}_init_error",
+    )
+
+    if (healthcheck_interval := entry.options.get(CONF_HEALTHCHECK_INTERVAL, DEFAULT_HEALTHCHECK_INTERVAL)) > 0:
+        coordinator.healthchecks = IPv64HealthcheckCoordinator(
+            hass, entry, coordinator.session, coordinator.scheduler, timedelta(minutes=healthcheck_interval)
+        )
+
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    # The other entries of the API key drop the sensors this entry owns before it adds them
+    async_dispatcher_send(hass, SIGNAL_DOMAINS_REASSIGNED)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(options_update_listener))
+    if (watcher := async_create_watcher(hass, entry, coordinator.async_request_refresh)) and watcher.async_start():
+        coordinator.ip_watcher = watcher
+        entry.async_on_unload(watcher.async_stop)
+    entry.async_on_unload(coordinator.scheduler.async_register(coordinator))
+    if warm_start:
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN}_{entry.entry_id}_refresh")
+    if coordinator.healthchecks is not None:
+        # The healthcheck sensors are added once the first refresh listed the healthchecks
+        entry.async_create_background_task(
+            hass, coordinator.healthchecks.async_refresh(), f"{DOMAIN}_{entry.entry_id}_healthchecks"
+        )
+
     return True
 
 
@@ -254,8 +435,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: config_entries.ConfigEn
     """Unload a config entry."""
     _LOGGER.debug("Unloading IPv64.net config entry %s", entry.entry_id)
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
-        hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
-        hass.services.async_remove(DOMAIN, SERVICE_ADD_DOMAIN)
-        hass.services.async_remove(DOMAIN, SERVICE_DELETE_DOMAIN)
+        coordinator: IPv64DataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_close()
+        # The other entries of the API key take over the domains and healthchecks of this entry
+        async_dispatcher_send(hass, SIGNAL_DOMAINS_REASSIGNED)
     return unload_ok
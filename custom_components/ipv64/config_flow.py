@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import ipaddress
 import logging
 import re
 from typing import Any
@@ -17,24 +18,61 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
     BooleanSelector,
     BooleanSelectorConfig,
+    EntitySelector,
+    EntitySelectorConfig,
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+    TextSelectorType,
 )
 
 from .const import (
     ALLOWED_DOMAINS,
+    CONF_ADAPTIVE_POLLING,
     CONF_API_ECONOMY,
     CONF_API_KEY,
-    CONF_DAILY_UPDATE_LIMIT,
-    CONF_DYNDNS_UPDATES,
+    CONF_CACHE_MAX_AGE,
+    CONF_CACHE_SAVE_DELAY,
+    CONF_COMPACT_CACHE,
+    CONF_DNS_ECONOMY,
+    CONF_DNS_SERVER,
+    CONF_DUAL_STACK,
+    CONF_FORCE_UPDATE,
+    CONF_HEALTHCHECK_INTERVAL,
+    CONF_IP6_PROVIDERS,
+    CONF_IP_AGREEMENT,
+    CONF_IP_PROVIDERS,
+    CONF_IP_WATCHER,
+    CONF_IP_WATCHER_ENTITY,
+    CONF_METADATA_INTERVAL,
+    CONF_METRICS_SENSORS,
     DATA_SCHEMA,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CACHE_SAVE_DELAY,
+    DEFAULT_HEALTHCHECK_INTERVAL,
+    DEFAULT_IP6_PROVIDERS,
+    DEFAULT_IP_PROVIDERS,
+    DEFAULT_METADATA_INTERVAL,
     DOMAIN,
-    EXCLUDED_KEYS,
     GET_ACCOUNT_INFO_URL,
     GET_DOMAIN_URL,
+    IP6_PROVIDERS,
+    IP_PROVIDERS,
+    IP_WATCHER_ENTITY,
+    IP_WATCHER_NETLINK,
+    IP_WATCHER_NONE,
     TIMEOUT,
 )
+from .limiter import TokenBucket, async_get_rate_limiter
+from .models import AccountInfo
+from .resolver import create_provider
+from .session import ResponseCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,7 +84,7 @@ class TokenError(Exception):
     """Exception for invalid token."""
 
 
-class APIKeyError(Exception):
+class APIKeyError(HomeAssistantError):
     """Exception for invalid API key."""
 
 
@@ -66,8 +104,14 @@ class InvalidDomain(HomeAssistantError):
     """Error to indicate the domain format is invalid."""
 
 
-async def get_domains(session: aiohttp.ClientSession, headers_api: dict[str, str]) -> dict[str, Any]:
+async def get_domains(
+    session: aiohttp.ClientSession,
+    headers_api: dict[str, str],
+    limiter: TokenBucket | None = None,
+) -> dict[str, Any]:
     """Fetches domain information from the IPv64.net API."""
+    if limiter is not None:
+        await limiter.acquire()
     async with session.get(GET_DOMAIN_URL, headers=headers_api, timeout=TIMEOUT) as resp:
         resp.raise_for_status()
         return await resp.json()
@@ -77,42 +121,23 @@ async def get_account_info(
     session: aiohttp.ClientSession,
     headers_api: dict[str, str],
     data: dict[str, Any],
-    result: dict[str, Any] | None = None,
-) -> dict[str, Any]:
-    """Fetches account information from the IPv64.net API."""
-    if result is None:
-        result = {}
+    limiter: TokenBucket | None = None,
+    *,
+    responses: ResponseCache | None = None,
+) -> AccountInfo:
+    """Fetches account information from the IPv64.net API.
+
+    With `responses`, the request is conditional and an unchanged body is not parsed again.
+    """
+    if limiter is not None:
+        await limiter.acquire()
+    if responses is not None:
+        headers_api = {**headers_api, **responses.conditional_headers("account_info")}
     async with session.get(GET_ACCOUNT_INFO_URL, headers=headers_api, timeout=TIMEOUT) as resp:
         resp.raise_for_status()
-        account_result = await resp.json()
-        result.update(
-            {
-                "account_status": account_result["account_status"],
-                "reg_date": account_result["reg_date"],
-                "dyndns_updates": account_result.get(CONF_DYNDNS_UPDATES, 0),
-                "dyndns_subdomains": account_result.get("dyndns_subdomains", 0),
-                "owndomains": account_result.get("owndomains", 0),
-                "healthchecks": account_result.get("healthchecks", 0),
-                "healthchecks_updates": account_result.get("healthchecks_updates", 0),
-                "api_updates": account_result.get("api_updates", 0),
-                "sms_count": account_result.get("sms_count", 0),
-                "account": account_result["account_class"]["class_name"],
-                "dyndns_domain_limit": account_result["account_class"].get("dyndns_domain_limit", 0),
-                CONF_DAILY_UPDATE_LIMIT: account_result["account_class"].get("dyndns_update_limit", 0),
-                "owndomain_limit": account_result["account_class"].get("owndomain_limit", 0),
-                "healthcheck_limit": account_result["account_class"].get("healthcheck_limit", 0),
-                "healthcheck_update_limit": account_result["account_class"].get("healthcheck_update_limit", 0),
-                "dyndns_ttl": account_result["account_class"].get("dyndns_ttl", 0),
-                "api_limit": account_result["account_class"].get("api_limit", 0),
-                "sms_limit": account_result["account_class"].get("sms_limit", 0),
-                "info": account_result.get("info", "unknown"),
-                "status": account_result.get("status", "unknown"),
-            }
-        )
-        for k, v in account_result.items():
-            if k not in EXCLUDED_KEYS:
-                result.setdefault(k, v)
-        return result
+        if responses is not None:
+            return (await responses.async_read_json("account_info", resp, AccountInfo.from_api))[1]
+        return AccountInfo.from_api(await resp.json())
 
 
 async def check_domain_login(hass: core.HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
@@ -120,6 +145,7 @@ async def check_domain_login(hass: core.HomeAssistant, data: dict[str, Any]) ->
     result = {}
     session: aiohttp.ClientSession = async_get_clientsession(hass)
     headers_api = {"Authorization": f"Bearer {data[CONF_API_KEY]}"}
+    limiter = async_get_rate_limiter(hass, data[CONF_API_KEY])
 
     # Validate domain against allowed domains
     input_domain = data[CONF_DOMAIN]
@@ -128,8 +154,8 @@ async def check_domain_login(hass: core.HomeAssistant, data: dict[str, Any]) ->
         raise InvalidDomain(f"Domain {input_domain} is not allowed. Allowed domains: {', '.join(ALLOWED_DOMAINS)}")
 
     try:
-        result.update(await get_account_info(session, headers_api, data))
-        domains = await get_domains(session, headers_api)
+        result.update((await get_account_info(session, headers_api, data, limiter=limiter)).as_dict())
+        domains = await get_domains(session, headers_api, limiter)
         subdomains = domains.get("subdomains", {})
         found = False
         for subdomain, subdomain_data in subdomains.items():
@@ -183,16 +209,14 @@ class IPv64ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Handle the initial user step."""
-        # Only one configuration entry is allowed to prevent conflicting updates
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
         errors: dict[str, str] = {}
         if user_input is not None:
+            # Several accounts and domains can be configured, but each domain only once
+            self._async_abort_entries_match({CONF_DOMAIN: user_input[CONF_DOMAIN]})
             try:
                 _LOGGER.debug("Received user input: %s", user_input)
                 info = await validate_input(self.hass, user_input)
-                unique_id = f"{user_input[CONF_DOMAIN]}_{self.hass.data.get(DOMAIN, {}).get('entry_count', 0)}"
-                await self.async_set_unique_id(unique_id)
+                await self.async_set_unique_id(user_input[CONF_DOMAIN])
                 self._abort_if_unique_id_configured()
 
                 return self.async_create_entry(
@@ -254,14 +278,159 @@ class IPv64OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                         unit_of_measurement="minutes",
                     )
                 ),
+                vol.Required(
+                    CONF_METADATA_INTERVAL,
+                    default=options.get(CONF_METADATA_INTERVAL, DEFAULT_METADATA_INTERVAL),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        mode=NumberSelectorMode.BOX,
+                        min=0,
+                        max=1440,
+                        step=1,
+                        unit_of_measurement="minutes",
+                    )
+                ),
+                vol.Required(
+                    CONF_HEALTHCHECK_INTERVAL,
+                    default=options.get(CONF_HEALTHCHECK_INTERVAL, DEFAULT_HEALTHCHECK_INTERVAL),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        mode=NumberSelectorMode.BOX,
+                        min=0,
+                        max=1440,
+                        step=1,
+                        unit_of_measurement="minutes",
+                    )
+                ),
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, False),
+                ): BooleanSelector(BooleanSelectorConfig()),
+                vol.Required(
+                    CONF_CACHE_MAX_AGE,
+                    default=options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        mode=NumberSelectorMode.BOX,
+                        min=0,
+                        max=1440,
+                        step=1,
+                        unit_of_measurement="minutes",
+                    )
+                ),
+                vol.Required(
+                    CONF_CACHE_SAVE_DELAY,
+                    default=options.get(CONF_CACHE_SAVE_DELAY, DEFAULT_CACHE_SAVE_DELAY),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        mode=NumberSelectorMode.BOX,
+                        min=0,
+                        max=900,
+                        step=1,
+                        unit_of_measurement="seconds",
+                    )
+                ),
+                vol.Required(
+                    CONF_COMPACT_CACHE,
+                    default=options.get(CONF_COMPACT_CACHE, False),
+                ): BooleanSelector(BooleanSelectorConfig()),
+                vol.Required(
+                    CONF_FORCE_UPDATE,
+                    default=options.get(CONF_FORCE_UPDATE, False),
+                ): BooleanSelector(BooleanSelectorConfig()),
+                vol.Required(
+                    CONF_METRICS_SENSORS,
+                    default=options.get(CONF_METRICS_SENSORS, False),
+                ): BooleanSelector(BooleanSelectorConfig()),
+                vol.Required(
+                    CONF_IP_WATCHER,
+                    default=options.get(CONF_IP_WATCHER, IP_WATCHER_NONE),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[IP_WATCHER_NONE, IP_WATCHER_NETLINK, IP_WATCHER_ENTITY],
+                        mode=SelectSelectorMode.DROPDOWN,
+                        translation_key=CONF_IP_WATCHER,
+                    )
+                ),
+                vol.Optional(
+                    CONF_IP_WATCHER_ENTITY,
+                    description={"suggested_value": options.get(CONF_IP_WATCHER_ENTITY)},
+                ): EntitySelector(EntitySelectorConfig(domain="sensor")),
+                vol.Required(
+                    CONF_IP_PROVIDERS,
+                    default=options.get(CONF_IP_PROVIDERS, DEFAULT_IP_PROVIDERS),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[SelectOptionDict(value=spec, label=label) for spec, label in IP_PROVIDERS.items()],
+                        mode=SelectSelectorMode.DROPDOWN,
+                        multiple=True,
+                        custom_value=True,
+                    )
+                ),
+                vol.Required(
+                    CONF_DNS_ECONOMY,
+                    default=options.get(CONF_DNS_ECONOMY, False),
+                ): BooleanSelector(BooleanSelectorConfig()),
+                vol.Optional(
+                    CONF_DNS_SERVER,
+                    description={"suggested_value": options.get(CONF_DNS_SERVER)},
+                ): TextSelector(TextSelectorConfig(type=TextSelectorType.TEXT)),
+                vol.Required(
+                    CONF_DUAL_STACK,
+                    default=options.get(CONF_DUAL_STACK, False),
+                ): BooleanSelector(BooleanSelectorConfig()),
+                vol.Required(
+                    CONF_IP6_PROVIDERS,
+                    default=options.get(CONF_IP6_PROVIDERS, DEFAULT_IP6_PROVIDERS),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[SelectOptionDict(value=spec, label=label) for spec, label in IP6_PROVIDERS.items()],
+                        mode=SelectSelectorMode.DROPDOWN,
+                        multiple=True,
+                        custom_value=True,
+                    )
+                ),
+                vol.Required(
+                    CONF_IP_AGREEMENT,
+                    default=options.get(CONF_IP_AGREEMENT, 1),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        mode=NumberSelectorMode.BOX,
+                        min=1,
+                        max=5,
+                        step=1,
+                    )
+                ),
             }
         )
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(data=user_input)
+            session = async_get_clientsession(self.hass)
+            provider_options = [CONF_IP_PROVIDERS, CONF_IP6_PROVIDERS] if user_input[CONF_DUAL_STACK] else [CONF_IP_PROVIDERS]
+            for option in provider_options:
+                try:
+                    for spec in user_input[option]:
+                        create_provider(spec, session)
+                except ValueError as err:
+                    _LOGGER.error("Invalid IP provider: %s", err)
+                    errors[option] = "invalid_ip_provider"
+                else:
+                    if not user_input[option]:
+                        errors[option] = "invalid_ip_provider"
+                    elif user_input[CONF_IP_AGREEMENT] > len(user_input[option]):
+                        errors[CONF_IP_AGREEMENT] = "ip_agreement_too_high"
+            if dns_server := user_input.get(CONF_DNS_SERVER):
+                try:
+                    ipaddress.ip_address(dns_server)
+                except ValueError:
+                    errors[CONF_DNS_SERVER] = "invalid_dns_server"
+            if not errors:
+                return self.async_create_entry(data=user_input)
 
         return self.async_show_form(
             step_id="init",
-            data_schema=data_schema,
+            data_schema=self.add_suggested_values_to_schema(data_schema, user_input) if user_input else data_schema,
+            errors=errors,
             last_step=True,
             description_placeholders={"description": "Configure the update interval and economy mode for IPv64.net."},
         )
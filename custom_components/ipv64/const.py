@@ -20,14 +20,46 @@ from homeassistant.helpers.selector import (
 
 CONF_API_KEY: Final = "apikey"
 CONF_API_ECONOMY: Final = "api_key_economy"
+CONF_CACHE_MAX_AGE: Final = "cache_max_age"
+CONF_CACHE_SAVE_DELAY: Final = "cache_save_delay"
+CONF_COMPACT_CACHE: Final = "compact_cache"
 CONF_DAILY_UPDATE_LIMIT: Final = "daily_update_limit"
 CONF_DYNDNS_UPDATES: Final = "dyndns_updates"
+CONF_FORCE_UPDATE: Final = "force_update"
+CONF_HEALTHCHECK_INTERVAL: Final = "healthcheck_interval"
+CONF_IP_WATCHER: Final = "ip_watcher"
+CONF_IP_WATCHER_ENTITY: Final = "ip_watcher_entity"
+CONF_IP_PROVIDERS: Final = "ip_providers"
+CONF_IP_AGREEMENT: Final = "ip_agreement"
+CONF_DUAL_STACK: Final = "dual_stack"
+CONF_IP6_PROVIDERS: Final = "ip6_providers"
+CONF_IP6_ADDRESS: Final = "ip6_address"
+CONF_DNS_ECONOMY: Final = "dns_economy"
+CONF_DNS_SERVER: Final = "dns_server"
+CONF_ADAPTIVE_POLLING: Final = "adaptive_polling"
+CONF_METADATA_INTERVAL: Final = "metadata_interval"
+CONF_METRICS_SENSORS: Final = "metrics_sensors"
 CONF_REMAINING_UPDATES: Final = "remaining_updates"
 CONF_WILDCARD: Final = "wildcard"  # Reserved for future wildcard domain support
 
 DOMAIN: Final = "ipv64"
 SHORT_NAME: Final = "IPv64"
 DEFAULT_INTERVAL: Final = 23
+DEFAULT_CACHE_MAX_AGE: Final = 120
+DEFAULT_CACHE_SAVE_DELAY: Final = 60
+DEFAULT_METADATA_INTERVAL: Final = 60
+DEFAULT_HEALTHCHECK_INTERVAL: Final = 0
+
+# Refresh tiers: the public IP is checked on every poll, account and domain data on their own interval
+TIER_IP: Final = "ip"
+TIER_METADATA: Final = "metadata"
+
+# Local sources reporting IP changes, the poll interval is raised to a safety net while one is active
+IP_WATCHER_NONE: Final = "none"
+IP_WATCHER_NETLINK: Final = "netlink"
+IP_WATCHER_ENTITY: Final = "entity"
+IP_WATCHER_DEBOUNCE: Final = 5
+IP_WATCHER_POLL_INTERVAL: Final = 120
 
 DATA_SCHEMA: Final = {
     vol.Required(CONF_DOMAIN): TextSelector(TextSelectorConfig(type=TextSelectorType.TEXT, multiline=False)),
@@ -45,34 +77,103 @@ DATA_SCHEMA: Final = {
 }
 
 DATA_HASS_CONFIG: Final = "hass_config"
+DATA_RATE_LIMITERS: Final = "rate_limiters"
+DATA_SCHEDULERS: Final = "schedulers"
+DATA_PINGER: Final = "pinger"
+# Sent when an entry is loaded or unloaded, the entries of its API key pass on the domains and healthchecks they own
+SIGNAL_DOMAINS_REASSIGNED: Final = f"{DOMAIN}_domains_reassigned"
 TRACKER_UPDATE_STR: Final = f"{DOMAIN}_tracker_update"
 
 TIMEOUT: Final = 10
 RETRY_ATTEMPTS: Final = 3
 RETRY_DELAY: Final = 2
+RETRY_MAX_DELAY: Final = 30
+RETRY_DEADLINE: Final = 45
+# Connection pool of the dedicated session, requests within one refresh reuse the connections
+CONNECTION_LIMIT: Final = 10
+CONNECTION_LIMIT_PER_HOST: Final = 3
+KEEPALIVE_TIMEOUT: Final = 60
+DNS_CACHE_TTL: Final = 300
+# The API allows a maximum of 3 requests per 10 seconds
+API_RATE_LIMIT: Final = 3
+API_RATE_PERIOD: Final = 10
+# Entries sharing an API key are polled together, one after another, and share account requests
+POLL_STAGGER: Final = 5
+POLL_COALESCE_WINDOW: Final = 120
+SHARED_DATA_MAX_AGE: Final = 60
+# Adaptive polling: fast after an IP change or failure, slower the longer the IP is stable (minutes, hours)
+ADAPTIVE_MIN_INTERVAL: Final = 5
+ADAPTIVE_MAX_INTERVAL: Final = 240
+ADAPTIVE_FAST_PERIOD: Final = 30
+ADAPTIVE_STABLE_PERIOD: Final = 2
+# Updates kept for manual refreshes when spreading the remaining budget until the daily reset
+ADAPTIVE_BUDGET_RESERVE: Final = 4
+# Weight of the latest poll in the average number of updates per poll
+ADAPTIVE_RATE_WEIGHT: Final = 0.2
+DAILY_RESET_TIMEZONE: Final = "Europe/Berlin"
+# Backoff of queued updates that failed to be delivered (seconds)
+OUTBOX_RETRY_DELAY: Final = 60
+OUTBOX_RETRY_MAX_DELAY: Final = 3600
+# States of a healthcheck by the healthstatus reported by IPv64.net and samples kept per healthcheck
+HEALTHCHECK_STATES: Final[dict[int, str]] = {1: "paused", 2: "up", 3: "warning", 4: "alarm"}
+HEALTHCHECK_HISTORY_SIZE: Final = 50
+# Healthcheck pings: concurrent pings, window in which a repeated ping is not sent again, deadline of a ping
+# and age after which a queued ping is dropped (seconds)
+PING_CONCURRENCY: Final = 5
+PING_COALESCE_WINDOW: Final = 10
+PING_DEADLINE: Final = 15
+PING_MAX_AGE: Final = 3600
+PING_ACTIONS: Final[list[str]] = ["start", "success", "fail"]
+# Request metrics: endpoints of the outbound requests and upper bounds of the latency histogram buckets (milliseconds)
+METRICS_ENDPOINTS: Final = ("account_info", "domains", "check_ip", "update", "add_domain", "delete_domain", "healthchecks")
+METRICS_LATENCY_BUCKETS: Final = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
 UPDATE_URL: Final = "https://ipv64.net/nic/update"
 # UPDATE_URL: Final = "http://192.168.0.220:1080/update.php"  # Local test
 # API_URL: Final = "http://192.168.0.220:1080/api.php"  # Local test
 API_URL: Final = "https://ipv64.net/api.php"  # Production
 
 CHECKIP_URL: Final = "https://checkip.amazonaws.com/"
+# Public IP providers, DNS providers are written as dns://server[:port]/name?type=A|AAAA|TXT&class=IN|CH
+OPENDNS_PROVIDER: Final = "dns://208.67.222.222/myip.opendns.com?type=A"
+IPIFY_PROVIDER: Final = "https://api.ipify.org/"
+DEFAULT_IP_PROVIDERS: Final[list[str]] = [CHECKIP_URL]
+# Offered in the options flow, any other provider can be entered as well
+IP_PROVIDERS: Final[dict[str, str]] = {
+    CHECKIP_URL: "Amazon checkip (HTTPS)",
+    OPENDNS_PROVIDER: "OpenDNS myip.opendns.com (DNS)",
+    IPIFY_PROVIDER: "ipify (HTTPS)",
+}
+# Queried over IPv6, so they report the address of the host instead of the IPv4 of the router
+OPENDNS6_PROVIDER: Final = "dns://[2620:119:35::35]/myip.opendns.com?type=AAAA"
+IPIFY6_PROVIDER: Final = "https://api6.ipify.org/"
+DEFAULT_IP6_PROVIDERS: Final[list[str]] = [OPENDNS6_PROVIDER, IPIFY6_PROVIDER]
+IP6_PROVIDERS: Final[dict[str, str]] = {
+    OPENDNS6_PROVIDER: "OpenDNS myip.opendns.com (DNS)",
+    IPIFY6_PROVIDER: "ipify (HTTPS)",
+}
+IP_HEDGE_DELAY: Final = 1.0
+IP_PROVIDER_TIMEOUT: Final = 5
+DNS_BOOTSTRAP_SERVERS: Final[list[str]] = ["1.1.1.1", "9.9.9.9"]
+DNS_QUERY_TIMEOUT: Final = 3
+DNS_CACHE_MAX_TTL: Final = 3600
 
 GET_DOMAIN_URL: Final = f"{API_URL}?get_domains"
 GET_ACCOUNT_INFO_URL: Final = f"{API_URL}?get_account_info"
 GET_HEALTHCHECKS: Final = f"{API_URL}?get_healthchecks"
 GET_HEALTHCHECK_STATISTICS: Final = f"{API_URL}?get_healthcheck_statistics"
 GET_INTEGRATIONS: Final = f"{API_URL}?get_integrations"
+HEALTHCHECK_PING_URL: Final = "https://ipv64.net/health.php"
+
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_TOKENS: Final = "tokens"
+ATTR_ACTION: Final = "action"
 
 SERVICE_REFRESH: Final = "refresh"
 SERVICE_ADD_DOMAIN: Final = "add_domain"
 SERVICE_DELETE_DOMAIN: Final = "delete_domain"
-
-EXCLUDED_KEYS: Final[list[str]] = [
-    "email",
-    "account_class",
-    "get_account_info",
-    "api_key",
-]
+SERVICE_ADD_DOMAINS: Final = "add_domains"
+SERVICE_DELETE_DOMAINS: Final = "delete_domains"
+SERVICE_PING_HEALTHCHECK: Final = "ping_healthcheck"
 
 ALLOWED_DOMAINS: Final[list[str]] = [
     "ipv64.net",
@@ -3,246 +3,289 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Coroutine
+from dataclasses import replace
 from datetime import datetime, timedelta
+import hashlib
 import logging
+import time
 from typing import Any
 
 import aiohttp
 
 from homeassistant.components.persistent_notification import async_create, async_dismiss
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_DOMAIN, CONF_IP_ADDRESS, CONF_SCAN_INTERVAL, CONF_TOKEN, CONF_TTL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_DOMAIN, CONF_IP_ADDRESS, CONF_SCAN_INTERVAL, CONF_TOKEN, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes_sorted
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .config_flow import APIKeyError, get_account_info
 from .const import (
+    ADAPTIVE_RATE_WEIGHT,
     ALLOWED_DOMAINS,
     API_URL,
-    CHECKIP_URL,
+    CONF_ADAPTIVE_POLLING,
     CONF_API_ECONOMY,
     CONF_API_KEY,
-    CONF_DAILY_UPDATE_LIMIT,
-    CONF_DYNDNS_UPDATES,
+    CONF_CACHE_MAX_AGE,
+    CONF_CACHE_SAVE_DELAY,
+    CONF_COMPACT_CACHE,
+    CONF_DNS_ECONOMY,
+    CONF_DNS_SERVER,
+    CONF_DUAL_STACK,
+    CONF_IP6_ADDRESS,
+    CONF_IP6_PROVIDERS,
+    CONF_IP_AGREEMENT,
+    CONF_IP_PROVIDERS,
+    CONF_METADATA_INTERVAL,
     CONF_REMAINING_UPDATES,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CACHE_SAVE_DELAY,
+    DEFAULT_IP6_PROVIDERS,
+    DEFAULT_IP_PROVIDERS,
+    DEFAULT_METADATA_INTERVAL,
     DOMAIN,
     GET_DOMAIN_URL,
-    RETRY_ATTEMPTS,
-    RETRY_DELAY,
+    IP_WATCHER_POLL_INTERVAL,
+    TIER_IP,
+    TIER_METADATA,
     TIMEOUT,
     UPDATE_URL,
 )
+from .dnsclient import DNS_TYPES, DNSCache
+from .healthchecks import IPv64HealthcheckCoordinator
+from .limiter import TokenBucket
+from .metrics import RequestMetrics
+from .models import AccountInfo, DomainList, DomainMetadata, DomainRecord
+from .outbox import UpdateOutbox
+from .resolver import IPProvider, IPResolveError, PublicIPResolver, create_provider
+from .retry import RETRYABLE_STATUSES, async_retry
+from .scheduler import AccountScheduler, async_get_scheduler, next_daily_reset, plan_poll_interval
+from .session import ConnectionStats, create_session
+from .watcher import IPWatcher
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fields changing with every refresh, a write is not worth it for them alone
+VOLATILE_CACHE_KEYS = frozenset({"cache_time", "stage_timings", "poll_plan"})
 
-async def get_domain(session: aiohttp.ClientSession, headers: dict[str, str], data: dict[str, Any]) -> None:
-    """Fetch domain information from the IPv64.net API."""
-    config_domain = data.get(CONF_DOMAIN, "")
-    # Validate domain against allowed domains
-    if not any(config_domain.endswith(allowed_domain) for allowed_domain in ALLOWED_DOMAINS):
-        _LOGGER.error("Domain %s is not one of the allowed domains: %s", config_domain, ALLOWED_DOMAINS)
-        data["subdomains"] = []
-        data["error"] = f"Domain {config_domain} not allowed"
-        return
 
-    for attempt in range(RETRY_ATTEMPTS):
-        try:
-            async with session.get(GET_DOMAIN_URL, headers=headers, timeout=TIMEOUT) as resp:
-                resp.raise_for_status()
-                result = await resp.json()
-                subdomains = result.get("subdomains", {})
-                if not subdomains:
-                    _LOGGER.warning("No subdomains found for account")
-                    data["subdomains"] = []
-                    data["error"] = "No subdomains available"
-                    return
-
-                sub_domains_list = []
-                domain_found = False
-                for subdomain, values in subdomains.items():
-                    _LOGGER.debug("Checking subdomain %s against config domain %s", subdomain, config_domain)
-                    records = values.get("records", [])
-                    for record in records:
-                        domain_name = subdomain if not record.get("praefix", "") else f"{record['praefix']}.{subdomain}"
-                        if domain_name == config_domain:
-                            domain_found = True
-                            data[CONF_IP_ADDRESS] = record["content"]  # Set IP address for config domain
-                        sub_domains_list.append(
-                            {
-                                CONF_DOMAIN: domain_name,
-                                CONF_IP_ADDRESS: record["content"],
-                                CONF_TYPE: record["type"],
-                                CONF_TTL: str(record["ttl"]),
-                                "failover_policy": str(record["failover_policy"]),
-                                "deactivated": bool(record["deactivated"]),
-                                "last_update": record["last_update"],
-                            }
-                        )
-                    data.update(
-                        {
-                            f"{subdomain}_metadata": {
-                                "updates": values.get("updates"),
-                                "wildcard": values.get("wildcard"),
-                                "domain_update_hash": values.get("domain_update_hash"),
-                                "ipv6prefix": values.get("ipv6prefix"),
-                                "dualstack": values.get("dualstack"),
-                                "deactivated": values.get("deactivated"),
-                            }
-                        }
-                    )
-                if not domain_found:
-                    _LOGGER.error("Configured domain %s not found in subdomains", config_domain)
-                    data["subdomains"] = []
-                    data["error"] = f"Domain {config_domain} not found"
-                    return
-                data["subdomains"] = sub_domains_list
-                return
-        except aiohttp.ClientResponseError as error:
-            if attempt == RETRY_ATTEMPTS - 1:
-                _LOGGER.error(
-                    "Failed to fetch domains after %d attempts: %s | Status: %d",
-                    RETRY_ATTEMPTS,
-                    error.message,
-                    error.status,
-                )
-                data["subdomains"] = []
-                data["error"] = "Failed to fetch domains"
-                return
-            _LOGGER.warning(
-                "Failed to fetch domains, retrying (%d/%d): %s",
-                attempt + 1,
-                RETRY_ATTEMPTS,
-                error.message,
-            )
-            await asyncio.sleep(RETRY_DELAY)
-        except (TimeoutError, aiohttp.ClientError) as err:
-            if attempt == RETRY_ATTEMPTS - 1:
-                _LOGGER.error("Failed to fetch domains after %d attempts: %s", RETRY_ATTEMPTS, err)
-                data["subdomains"] = []
-                data["error"] = str(err)
-                return
-            _LOGGER.warning(
-                "Failed to fetch domains, retrying (%d/%d): %s",
-                attempt + 1,
-                RETRY_ATTEMPTS,
-                err,
-            )
-            await asyncio.sleep(RETRY_DELAY)
+async def _async_timed[T](stage: str, coro: Coroutine[Any, Any, T], timings: dict[str, float]) -> T:
+    """Await a refresh stage and record its duration in milliseconds."""
+    start = time.monotonic()
+    try:
+        return await coro
+    finally:
+        timings[stage] = round((time.monotonic() - start) * 1000, 1)
+
+
+async def _async_value[T](value: T) -> T:
+    """Return a value already known as a refresh stage."""
+    return value
+
+
+async def fetch_domain_list(
+    session: aiohttp.ClientSession,
+    headers: dict[str, str],
+    limiter: TokenBucket | None = None,
+    scheduler: AccountScheduler | None = None,
+) -> tuple[str | None, DomainList]:
+    """Fetch and parse the domain list from the IPv64.net API.
+
+    With a scheduler, the list is parsed once for all entries of the API key and returned
+    with the fingerprint of the response, an unchanged response is not parsed again.
+    """
+    responses = scheduler.responses if scheduler is not None else None
+
+    async def _fetch() -> tuple[str | None, DomainList]:
+        if limiter is not None:
+            await limiter.acquire()
+        request_headers = {**headers, **responses.conditional_headers("domains")} if responses is not None else headers
+        async with session.get(GET_DOMAIN_URL, headers=request_headers, timeout=TIMEOUT) as resp:
+            resp.raise_for_status()
+            if responses is not None:
+                return await responses.async_read_json("domains", resp, DomainList.from_api)
+            return None, DomainList.from_api(await resp.json())
 
+    if scheduler is not None:
+        return await scheduler.async_fetch_shared("domains", lambda: async_retry(_fetch, "fetch domains"))
+    return await async_retry(_fetch, "fetch domains")
 
-async def add_domain(hass: HomeAssistant, coordinator: DataUpdateCoordinator, domain: str, api_key: str) -> None:
+
+async def add_domain(
+    hass: HomeAssistant, coordinator: IPv64DataUpdateCoordinator, domain: str, api_key: str, *, refresh: bool = True
+) -> None:
     """Add a new domain via the IPv64.net API."""
     if not any(domain.endswith(allowed_domain) for allowed_domain in ALLOWED_DOMAINS):
         _LOGGER.error("Domain %s is not one of the allowed domains: %s", domain, ALLOWED_DOMAINS)
         raise ValueError(f"Domain {domain} not allowed")
 
-    session = async_get_clientsession(hass)
+    session = coordinator.session
     headers = {"Authorization": f"Bearer {api_key}"}
     data = {"add_domain": domain}
 
-    for attempt in range(RETRY_ATTEMPTS):
-        try:
-            async with session.post(API_URL, headers=headers, data=data, timeout=TIMEOUT) as resp:
-                resp.raise_for_status()
-                result = await resp.json()
-                _LOGGER.debug("Received result: %s", result)  # log API response
-                if result.get("info") != "success":
-                    _LOGGER.error("Failed to add domain %s: %s", domain, result.get("add_domain"))
-                    raise UpdateFailed(f"Failed to add domain: {result.get('add_domain')}")
-                _LOGGER.info("Successfully added domain %s", domain)
-                await coordinator.async_request_refresh()
-                return
-        except aiohttp.ClientResponseError as error:
-            if attempt == RETRY_ATTEMPTS - 1:
-                _LOGGER.error(
-                    "Failed to add domain %s after %d attempts: %s | Status: %d",
-                    domain,
-                    RETRY_ATTEMPTS,
-                    error.message,
-                    error.status,
-                )
-                if error.status == 401:
-                    raise APIKeyError("Invalid API key") from error
-                if error.status == 429:
-                    raise UpdateFailed("Rate limit exceeded: Maximum 3 requests per 10 seconds") from error
-                raise UpdateFailed(f"Failed to add domain: {error.message}") from error
-            _LOGGER.warning(
-                "Failed to add domain, retrying (%d/%d): %s",
-                attempt + 1,
-                RETRY_ATTEMPTS,
-                error.message,
-            )
-            await asyncio.sleep(RETRY_DELAY)
-        except (TimeoutError, aiohttp.ClientError) as err:
-            if attempt == RETRY_ATTEMPTS - 1:
-                _LOGGER.error("Failed to add domain %s after %d attempts: %s", domain, RETRY_ATTEMPTS, err)
-                raise UpdateFailed(f"Network error: {err}") from err
-            _LOGGER.warning(
-                "Failed to add domain, retrying (%d/%d): %s",
-                attempt + 1,
-                RETRY_ATTEMPTS,
-                err,
-            )
-            await asyncio.sleep(RETRY_DELAY)
+    async def _add() -> dict[str, Any]:
+        await coordinator.limiter.acquire()
+        async with session.post(API_URL, headers=headers, data=data, timeout=TIMEOUT) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    try:
+        result = await async_retry(_add, f"add domain {domain}")
+    except aiohttp.ClientResponseError as error:
+        _LOGGER.error("Failed to add domain %s: %s | Status: %d", domain, error.message, error.status)
+        if error.status == 401:
+            raise APIKeyError("Invalid API key") from error
+        if error.status == 429:
+            raise UpdateFailed("Rate limit exceeded: Maximum 3 requests per 10 seconds") from error
+        raise UpdateFailed(f"Failed to add domain: {error.message}") from error
+    except (TimeoutError, aiohttp.ClientError) as err:
+        _LOGGER.error("Failed to add domain %s: %s", domain, err)
+        raise UpdateFailed(f"Network error: {err}") from err
 
+    _LOGGER.debug("Received result: %s", result)  # log API response
+    if result.get("info") != "success":
+        _LOGGER.error("Failed to add domain %s: %s", domain, result.get("add_domain"))
+        raise UpdateFailed(f"Failed to add domain: {result.get('add_domain')}")
+    _LOGGER.info("Successfully added domain %s", domain)
+    coordinator.scheduler.async_invalidate()
+    if refresh:
+        await coordinator.async_request_refresh()
 
-async def delete_domain(hass: HomeAssistant, coordinator: DataUpdateCoordinator, domain: str, api_key: str) -> None:
+
+async def delete_domain(
+    hass: HomeAssistant, coordinator: IPv64DataUpdateCoordinator, domain: str, api_key: str, *, refresh: bool = True
+) -> None:
     """Delete a domain via the IPv64.net API."""
     if not any(domain.endswith(allowed_domain) for allowed_domain in ALLOWED_DOMAINS):
         _LOGGER.error("Domain %s is not one of the allowed domains: %s", domain, ALLOWED_DOMAINS)
         raise ValueError(f"Domain {domain} not allowed")
 
-    session = async_get_clientsession(hass)
+    session = coordinator.session
     headers = {"Authorization": f"Bearer {api_key}"}
     data = {"del_domain": domain}
 
-    for attempt in range(RETRY_ATTEMPTS):
+    async def _delete() -> dict[str, Any]:
+        await coordinator.limiter.acquire()
+        async with session.delete(API_URL, headers=headers, data=data, timeout=TIMEOUT) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    try:
+        result = await async_retry(_delete, f"delete domain {domain}")
+    except aiohttp.ClientResponseError as error:
+        _LOGGER.error("Failed to delete domain %s: %s | Status: %d", domain, error.message, error.status)
+        if error.status == 401:
+            raise APIKeyError("Invalid API key") from error
+        if error.status == 429:
+            raise UpdateFailed("Rate limit exceeded: Maximum 3 requests per 10 seconds") from error
+        raise UpdateFailed(f"Failed to delete domain: {error.message}") from error
+    except (TimeoutError, aiohttp.ClientError) as err:
+        _LOGGER.error("Failed to delete domain %s: %s", domain, err)
+        raise UpdateFailed(f"Network error: {err}") from err
+
+    _LOGGER.debug("Received result: %s", result)  # log API response
+    if result.get("info") != "success":
+        _LOGGER.error("Failed to delete domain %s: %s", domain, result.get("info"))
+        raise UpdateFailed(f"Failed to delete domain: {result.get('info')}")
+    _LOGGER.info("Successfully deleted domain %s", domain)
+    coordinator.scheduler.async_invalidate()
+    if refresh:
+        await coordinator.async_request_refresh()
+
+
+async def bulk_domains(
+    hass: HomeAssistant,
+    coordinator: IPv64DataUpdateCoordinator,
+    domains: list[str],
+    api_key: str,
+    *,
+    delete: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """Add or delete several domains via the IPv64.net API.
+
+    All domains are validated before the first request. The requests run one after
+    another, paced by the rate limiter of the API key, followed by a single refresh.
+    Returns the result for each domain.
+    """
+    domains = list(dict.fromkeys(domain.strip().lower() for domain in domains if domain.strip()))
+    if not domains:
+        raise ValueError("No domains specified")
+    if invalid := [domain for domain in domains if not any(domain.endswith(allowed) for allowed in ALLOWED_DOMAINS)]:
+        _LOGGER.error("Domains %s are not one of the allowed domains: %s", invalid, ALLOWED_DOMAINS)
+        raise ValueError(f"Domains not allowed: {', '.join(invalid)}")
+
+    request = delete_domain if delete else add_domain
+    results: dict[str, dict[str, Any]] = {}
+    api_key_rejected = False
+    for domain in domains:
+        if api_key_rejected:
+            results[domain] = {"success": False, "error": "Skipped after invalid API key"}
+            continue
         try:
-            async with session.delete(API_URL, headers=headers, data=data, timeout=TIMEOUT) as resp:
-                resp.raise_for_status()
-                result = await resp.json()
-                _LOGGER.debug("Received result: %s", result)  # log API response
-                if result.get("info") != "success":
-                    _LOGGER.error("Failed to delete domain %s: %s", domain, result.get("info"))
-                    raise UpdateFailed(f"Failed to delete domain: {result.get('info')}")
-                _LOGGER.info("Successfully deleted domain %s", domain)
-                await coordinator.async_request_refresh()
-                return
-        except aiohttp.ClientResponseError as error:
-            if attempt == RETRY_ATTEMPTS - 1:
-                _LOGGER.error(
-                    "Failed to delete domain %s after %d attempts: %s | Status: %d",
-                    domain,
-                    RETRY_ATTEMPTS,
-                    error.message,
-                    error.status,
-                )
-                if error.status == 401:
-                    raise APIKeyError("Invalid API key") from error
-                if error.status == 429:
-                    raise UpdateFailed("Rate limit exceeded: Maximum 3 requests per 10 seconds") from error
-                raise UpdateFailed(f"Failed to delete domain: {error.message}") from error
-            _LOGGER.warning(
-                "Failed to delete domain, retrying (%d/%d): %s",
-                attempt + 1,
-                RETRY_ATTEMPTS,
-                error.message,
-            )
-            await asyncio.sleep(RETRY_DELAY)
-        except (TimeoutError, aiohttp.ClientError) as err:
-            if attempt == RETRY_ATTEMPTS - 1:
-                _LOGGER.error("Failed to delete domain %s after %d attempts: %s", domain, RETRY_ATTEMPTS, err)
-                raise UpdateFailed(f"Network error: {err}") from err
-            _LOGGER.warning(
-                "Failed to delete domain, retrying (%d/%d): %s",
-                attempt + 1,
-                RETRY_ATTEMPTS,
-                err,
-            )
-            await asyncio.sleep(RETRY_DELAY)
+            await request(hass, coordinator, domain, api_key, refresh=False)
+        except APIKeyError as err:
+            api_key_rejected = True
+            results[domain] = {"success": False, "error": str(err)}
+        except UpdateFailed as err:
+            results[domain] = {"success": False, "error": str(err)}
+        else:
+            results[domain] = {"success": True, "error": None}
+
+    if any(result["success"] for result in results.values()):
+        await coordinator.async_request_refresh()
+    return results
+
+
+class RefreshTier:
+    """Cached result and staleness of one refresh tier.
+
+    The IP tier checks the public IP on every poll, the metadata tier fetches the account
+    info and the domain list on its own, slower interval. A manual refresh runs both.
+    """
+
+    def __init__(self, name: str, interval: timedelta | None) -> None:
+        """Initialize the tier, without an interval it is refreshed on every poll."""
+        self.name = name
+        self.interval = interval
+        self.result: dict[str, Any] = {}
+        self.refreshes = 0
+        self.last_refresh: float | None = None
+        self.updated_at: datetime | None = None
+
+    @property
+    def due(self) -> bool:
+        """Return True if the tier has to be refreshed by the next poll."""
+        return (
+            self.interval is None
+            or self.last_refresh is None
+            or time.monotonic() - self.last_refresh >= self.interval.total_seconds()
+        )
+
+    def mark_refreshed(self, result: dict[str, Any]) -> None:
+        """Store the result of a refresh."""
+        self.result = result
+        self.refreshes += 1
+        self.last_refresh = time.monotonic()
+        self.updated_at = dt_util.utcnow()
+
+    def invalidate(self) -> None:
+        """Refresh the tier with the next poll."""
+        self.last_refresh = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tier state."""
+        return {
+            "interval": self.interval.total_seconds() / 60 if self.interval else None,
+            "refreshes": self.refreshes,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "age": round(time.monotonic() - self.last_refresh) if self.last_refresh is not None else None,
+            "result": self.result,
+        }
 
 
 class IPv64DataUpdateCoordinator(DataUpdateCoordinator):
@@ -254,86 +297,721 @@ class IPv64DataUpdateCoordinator(DataUpdateCoordinator):
         self.config_entry = entry
         self.data = {CONF_DOMAIN: entry.data.get(CONF_DOMAIN, "")}
         self._cache = Store(hass, version=1, key=f"{DOMAIN}_{entry.entry_id}_data")
+        self.outbox = UpdateOutbox(hass, f"{DOMAIN}_{entry.entry_id}_outbox")
+        self._unsub_replay: CALLBACK_TYPE | None = None
+        self._save_delay = entry.options.get(CONF_CACHE_SAVE_DELAY, DEFAULT_CACHE_SAVE_DELAY)
+        self._compact_cache = entry.options.get(CONF_COMPACT_CACHE, False)
+        # Digest and time of the last scheduled write, unchanged data is only written again to renew its age
+        self._saved_digest: str | None = None
+        self._saved_at = 0.0
+        self._save_pending = False
+        self.cache_writes = 0
+        self.skipped_saves = 0
+        self.scheduler = async_get_scheduler(hass, entry.data.get(CONF_API_KEY, ""))
+        self.limiter = self.scheduler.limiter
+        self.connection_stats = ConnectionStats()
+        self.metrics = RequestMetrics()
+        self.session = create_session(self.connection_stats, self.metrics.trace_config())
+        self._unsub_close: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop
+        )
+        # Account info and domain list of the last refresh, shared with the other entries of the API key
+        self.account: AccountInfo | None = None
+        self.domain_list = DomainList.empty()
+        # Change detection between refreshes, used by the entities to skip unchanged state writes
+        self._snapshot: dict[str, Any] = {}
+        # True if the last refresh fetched a complete domain list, deleted domains are only removed then
+        self.domains_complete = False
+        self.changed_domains: set[str] = set()
+        self.changed_keys: set[str] = set()
+        self.skipped_writes = 0
+        # Fingerprints of the account info and domain list last applied, unchanged responses are not processed again
+        self.fingerprints: dict[str, str] = {}
+        self.skipped_parses = 0
+        # Refresh cycle in flight and the forced one queued behind it, callers join them instead of starting their own
+        self._refresh_task: asyncio.Task[dict[str, Any]] | None = None
+        self._follow_up_task: asyncio.Task[dict[str, Any]] | None = None
+        self._follow_up_options: dict[str, bool] = {}
+        self.joined_refreshes = 0
+        self.queued_refreshes = 0
         interval = entry.options.get(CONF_SCAN_INTERVAL, 23)
         if interval == 0:
             _LOGGER.info("IPv64 data updater disabled (interval=0)")
+        # Polling is driven by the scheduler shared by all entries of the API key
+        self._poll_interval = timedelta(minutes=interval) if interval > 0 else None
+        self.ip_watcher: IPWatcher | None = None
+        # Fetches the healthchecks of the account on its own interval, if enabled
+        self.healthchecks: IPv64HealthcheckCoordinator | None = None
+        self.dual_stack = entry.options.get(CONF_DUAL_STACK, False)
+        self.ip_resolver = self._create_ip_resolver(CONF_IP_PROVIDERS, DEFAULT_IP_PROVIDERS, 4 if self.dual_stack else None)
+        self.ip6_resolver = self._create_ip_resolver(CONF_IP6_PROVIDERS, DEFAULT_IP6_PROVIDERS, 6) if self.dual_stack else None
+        self.dns_cache = DNSCache(entry.options.get(CONF_DNS_SERVER)) if entry.options.get(CONF_DNS_ECONOMY) else None
+        metadata_interval = entry.options.get(CONF_METADATA_INTERVAL, DEFAULT_METADATA_INTERVAL)
+        self.tiers = {
+            TIER_IP: RefreshTier(TIER_IP, self._poll_interval),
+            TIER_METADATA: RefreshTier(TIER_METADATA, timedelta(minutes=metadata_interval) if metadata_interval > 0 else None),
+        }
+        # Tiers fetched by the last refresh, entities only write their state if one of their tiers is in here
+        self.refreshed_tiers: set[str] = set()
+        self.adaptive_polling = entry.options.get(CONF_ADAPTIVE_POLLING, False)
+        # Average number of updates sent per poll, every poll sends one outside of economy mode
+        self.update_rate = 0.0 if entry.options.get(CONF_API_ECONOMY, True) else 1.0
+        self._last_ip_change: float | None = None
+        self._stable_since = time.monotonic()
+        self.last_refresh = time.monotonic()
         super().__init__(
             hass=hass,
             logger=_LOGGER,
             name=f"{DOMAIN}_{entry.entry_id}",
-            update_interval=timedelta(minutes=interval) if interval > 0 else None,
+            update_interval=None,
         )
 
-    async def async_update(self, call: ServiceCall) -> None:
-        """Update IPv64 data from a service call."""
+    def _create_ip_resolver(self, option: str, defaults: list[str], version: int | None) -> PublicIPResolver:
+        """Create a public IP resolver from the providers configured in `option`."""
+        providers: list[IPProvider] = []
+        metrics = self.metrics.endpoints["check_ip"]
+        for spec in self.config_entry.options.get(option) or defaults:
+            try:
+                providers.append(create_provider(spec, self.session, metrics))
+            except ValueError as err:
+                _LOGGER.warning("Ignoring IP provider for %s: %s", self.config_entry.data.get(CONF_DOMAIN), err)
+        if not providers:
+            providers = [create_provider(spec, self.session, metrics) for spec in defaults]
+        return PublicIPResolver(providers, int(self.config_entry.options.get(CONF_IP_AGREEMENT, 1)), version)
+
+    @property
+    def metadata_due(self) -> bool:
+        """Return True if the account and domain data have to be fetched from the API."""
+        return self.tiers[TIER_METADATA].due or self.account is None
+
+    def invalidate_metadata(self) -> None:
+        """Fetch the account and domain data with the next refresh, e.g. after adding a domain."""
+        self.tiers[TIER_METADATA].invalidate()
+
+    @property
+    def poll_interval(self) -> timedelta | None:
+        """Return the poll interval, only a safety net while an IP watcher reports changes."""
+        interval = self._poll_interval
+        if interval is not None and self.adaptive_polling:
+            interval = timedelta(minutes=self._plan_poll(interval, failed=not self.last_update_success)["interval"])
+        if interval is not None and self.ip_watcher is not None:
+            return max(interval, timedelta(minutes=IP_WATCHER_POLL_INTERVAL))
+        return interval
+
+    def _plan_poll(self, base: timedelta, failed: bool) -> dict[str, Any]:
+        """Plan the next poll interval from the update budget and the recent IP changes."""
+        account = self.account
+        now = time.monotonic()
+        return plan_poll_interval(
+            base,
+            dt_util.utcnow(),
+            remaining_updates=account.remaining_updates if account is not None and account.daily_update_limit > 0 else None,
+            cost_per_poll=self.update_rate,
+            since_change=now - self._last_ip_change if self._last_ip_change is not None else None,
+            stable_for=now - self._stable_since,
+            failed=failed,
+        )
+
+    def _record_poll(self, updated: bool, ip_changed: bool) -> None:
+        """Record the outcome of a poll for the adaptive poll interval."""
+        self.update_rate += ADAPTIVE_RATE_WEIGHT * (float(updated) - self.update_rate)
+        if ip_changed:
+            self._last_ip_change = self._stable_since = time.monotonic()
+        if self.adaptive_polling and self._poll_interval is not None:
+            self.data["poll_plan"] = self._plan_poll(self._poll_interval, failed=False)
+
+    async def _async_close_on_stop(self, event: Event) -> None:
+        """Close the HTTP session when Home Assistant stops."""
+        self._unsub_close = None
+        await self.session.close()
+
+    async def async_close(self) -> None:
+        """Close the HTTP session of this entry."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        if self._unsub_replay is not None:
+            self._unsub_replay()
+            self._unsub_replay = None
+        if self._save_pending:
+            # Write the pending data now, a delayed write is only flushed when Home Assistant stops
+            await self._cache.async_save(self._cache_data())
+        await self.session.close()
+
+    async def async_load_cache(self) -> bool:
+        """Load the persisted data if it is recent enough to be shown while refreshing."""
+        max_age = self.config_entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE)
+        if max_age <= 0:
+            _LOGGER.debug("Cache warm start disabled for entry %s", self.config_entry.entry_id)
+            return False
+
+        cached = await self._cache.async_load()
+        # Caches written before the typed domain list have no "domains" and are refreshed instead
+        if not isinstance(cached, dict) or not cached.get("cache_time") or "domains" not in cached:
+            _LOGGER.debug("No usable cache found for entry %s", self.config_entry.entry_id)
+            return False
+        if cached.get(CONF_DOMAIN) != self.config_entry.data.get(CONF_DOMAIN):
+            _LOGGER.debug("Cached data belongs to domain %s, ignoring it", cached.get(CONF_DOMAIN))
+            return False
+
+        try:
+            # Caches written before the time was stored in UTC hold the local time without an offset
+            cache_time = dt_util.as_utc(dt_util.parse_datetime(cached["cache_time"], raise_on_error=True))
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning("Invalid cache timestamp for entry %s: %s", self.config_entry.entry_id, err)
+            return False
+        cache_age = dt_util.utcnow() - cache_time
+        if cache_age > timedelta(minutes=max_age):
+            _LOGGER.debug("Cache for entry %s is too old (%s), ignoring it", self.config_entry.entry_id, cache_age)
+            return False
+
+        try:
+            account = AccountInfo.from_dict(cached["account"]) if cached.get("account") is not None else None
+            domain_list = DomainList.from_dict(cached["domains"])
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Invalid cache for entry %s: %s", self.config_entry.entry_id, err)
+            return False
+
+        _LOGGER.debug("Using cached data from %s for entry %s", cached["cache_time"], self.config_entry.entry_id)
+        cached = {key: value for key, value in cached.items() if key not in ("account", "domains")}
+        self.account = account
+        self._set_domain_list(domain_list)
+        self._detect_changes(cached)
+        self.refreshed_tiers = set(self.tiers)
+        self.async_set_updated_data(cached)
+        return True
+
+    def _set_domain_list(self, domain_list: DomainList) -> None:
+        """Replace the domain list and record which domains changed."""
+        previous = self.domain_list
+        self.changed_domains = {
+            name
+            for name in previous.records.keys() | domain_list.records.keys()
+            if previous.records.get(name) != domain_list.records.get(name)
+            or previous.metadata_for(name) != domain_list.metadata_for(name)
+        }
+        self.domain_list = domain_list
+
+    def _apply_domain_list(self, domain_list: DomainList) -> str | None:
+        """Take over a fetched domain list and the addresses of the configured domain.
+
+        Returns the error if the configured domain is not in the list.
+        """
+        config_domain = self.config_entry.data.get(CONF_DOMAIN, "")
+        error = None
+        if not domain_list.records:
+            _LOGGER.warning("No subdomains found for account")
+            error = "No subdomains available"
+        elif (record := domain_list.records.get(config_domain)) is None:
+            _LOGGER.error("Configured domain %s not found in subdomains", config_domain)
+            error = f"Domain {config_domain} not found"
+            domain_list = DomainList.empty()
+        else:
+            if record.ipv4 is not None:
+                self.data[CONF_IP_ADDRESS] = record.ipv4
+            if record.ipv6 is not None:
+                self.data[CONF_IP6_ADDRESS] = record.ipv6
+        self._set_domain_list(domain_list)
+        return error
+
+    def _detect_changes(self, data: dict[str, Any]) -> None:
+        """Record which account fields and top-level fields changed since the previous refresh."""
+        snapshot = {**(self.account.as_dict() if self.account is not None else {}), **data}
+        self.changed_keys = {
+            key for key in self._snapshot.keys() | snapshot.keys() if self._snapshot.get(key) != snapshot.get(key)
+        }
+        self._snapshot = snapshot
+
+    @property
+    def domains(self) -> set[str]:
+        """Return the names of all domains from the last refresh."""
+        return set(self.domain_list.records)
+
+    @property
+    def owned_domains(self) -> set[str]:
+        """Return the domains this entry creates sensors for.
+
+        Entries sharing an API key get the same domain list. A domain belongs to the loaded
+        entry configured for it or for its closest parent domain, all others to the oldest
+        loaded entry. Entries that failed to set up or are unloaded own nothing, so their
+        domains are not left without a sensor.
+        """
+        coordinators = self._loaded_coordinators()
+        if len(coordinators) <= 1:
+            return self.domains
+        configured = {coordinator.config_entry.data.get(CONF_DOMAIN): coordinator for coordinator in coordinators}
+        owned = set()
+        for name in self.domain_list.records:
+            parents = (name.split(".", level)[-1] for level in range(1, name.count(".")))
+            owner = next((configured[domain] for domain in (name, *parents) if domain in configured), coordinators[0])
+            if owner is self:
+                owned.add(name)
+        return owned
+
+    @property
+    def owns_healthchecks(self) -> bool:
+        """Return True if this entry creates the healthcheck sensors.
+
+        Entries sharing an API key list the same healthchecks. Their sensors belong to the
+        oldest loaded entry that fetches them, so every healthcheck has one sensor.
+        """
+        owner = next(
+            (coordinator for coordinator in self._loaded_coordinators() if coordinator.healthchecks is not None), None
+        )
+        return owner is self
+
+    def _loaded_coordinators(self) -> list[IPv64DataUpdateCoordinator]:
+        """Return the coordinators of the loaded entries of the API key, the oldest entry first."""
+        api_key = self.config_entry.data.get(CONF_API_KEY)
+        loaded = self.hass.data.get(DOMAIN, {})
+        return [
+            coordinator
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.data.get(CONF_API_KEY) == api_key
+            and isinstance(coordinator := loaded.get(entry.entry_id), IPv64DataUpdateCoordinator)
+        ]
+
+    def get_domain_record(self, domain: str) -> DomainRecord | None:
+        """Return the record of a domain from the last refresh."""
+        return self.domain_list.records.get(domain)
+
+    def get_domain_metadata(self, domain: str) -> DomainMetadata | None:
+        """Return the metadata of the subdomain a domain belongs to."""
+        return self.domain_list.metadata_for(domain)
+
+    async def async_update(self, call: ServiceCall) -> dict[str, Any]:
+        """Update IPv64 data from a service call, returns the result of the refresh."""
         _LOGGER.debug("Manual IP address update triggered via service call for entry: %s", self.config_entry.entry_id)
         economy = call.data.get(CONF_API_ECONOMY, False)
         if not isinstance(economy, bool):
             _LOGGER.warning("Invalid economy parameter: %s, defaulting to False", economy)
             economy = False
-        await self._async_update_data(is_economy=economy, force_refresh=True)
+        result, started = await self._async_refresh_single_flight(force=True, economy=economy)
+        # A cycle is published by the caller that started it, scheduled refreshes publish their own
+        if started:
+            self.async_set_updated_data(self.data)
+        return {**result, "joined": not started}
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Update data from IPv64.net, joining the refresh in flight."""
+        await self._async_refresh_single_flight()
+        return self.data
+
+    async def _async_refresh_single_flight(self, *, force: bool = False, economy: bool = False) -> tuple[dict[str, Any], bool]:
+        """Run a refresh cycle unless one is in flight, returns its result and whether this call started it.
+
+        A caller arriving during a cycle joins it. A forced refresh needs a cycle that starts
+        after the request, so it queues one to follow the cycle in flight, which all forced
+        refreshes arriving meanwhile join.
+        """
+        if self._refresh_task is None:
+            self._refresh_task = self._async_start_cycle(None, force=force, economy=economy)
+            return await asyncio.shield(self._refresh_task), True
+        if not force:
+            self.joined_refreshes += 1
+            _LOGGER.debug("Joining the refresh in flight for %s", self.config_entry.entry_id)
+            return await asyncio.shield(self._refresh_task), False
+        if self._follow_up_task is not None:
+            self.joined_refreshes += 1
+            # Economy mode is only kept if every caller asked for it
+            self._follow_up_options["economy"] = self._follow_up_options["economy"] and economy
+            return await asyncio.shield(self._follow_up_task), False
+        self.queued_refreshes += 1
+        _LOGGER.debug("Queueing a refresh after the one in flight for %s", self.config_entry.entry_id)
+        self._follow_up_options = {"economy": economy}
+        self._follow_up_task = self._async_start_cycle(self._refresh_task, force=True, options=self._follow_up_options)
+        return await asyncio.shield(self._follow_up_task), True
+
+    def _async_start_cycle(
+        self,
+        previous: asyncio.Task[dict[str, Any]] | None,
+        *,
+        force: bool,
+        economy: bool = False,
+        options: dict[str, bool] | None = None,
+    ) -> asyncio.Task[dict[str, Any]]:
+        """Start a refresh cycle, after `previous` if given, queued cycles read their options when they start."""
 
-    async def _async_update_data(self, is_economy: bool = False, force_refresh: bool = False) -> dict[str, Any]:
-        """Update data from IPv64.net, utilizing cache if available."""
+        async def _cycle() -> dict[str, Any]:
+            try:
+                if previous is not None:
+                    await asyncio.wait([previous])
+                return await self._async_refresh_cycle(
+                    is_economy=options["economy"] if options is not None else economy, force_refresh=force
+                )
+            finally:
+                if self._refresh_task is asyncio.current_task():
+                    # The queued cycle takes over, callers arriving until it starts join it
+                    self._refresh_task = self._follow_up_task
+                    self._follow_up_task = None
+
+        # Not started eagerly, the task has to be in flight before the cycle can finish
+        return self.config_entry.async_create_task(
+            self.hass, _cycle(), f"{DOMAIN}_{self.config_entry.entry_id}_refresh", eager_start=False
+        )
+
+    async def _async_refresh_cycle(self, is_economy: bool = False, force_refresh: bool = False) -> dict[str, Any]:
+        """Update data from IPv64.net, utilizing cache if available, returns what the refresh did."""
         _LOGGER.debug("Updating data from IPv64.net (economy=%s, force_refresh=%s)", is_economy, force_refresh)
 
         if not isinstance(self.data, dict):
             _LOGGER.debug("self.data was invalid, reinitializing")
             self.data = {CONF_DOMAIN: self.config_entry.data.get(CONF_DOMAIN, "")}
 
-        session = async_get_clientsession(self.hass)
+        economy = self.config_entry.options.get(CONF_API_ECONOMY, True) or is_economy
+        old_ip, old_ip6 = self.data.get(CONF_IP_ADDRESS), self.data.get(CONF_IP6_ADDRESS)
+        timings: dict[str, float] = {}
+        started = self.last_refresh = time.monotonic()
+        # Between metadata refreshes only the IP tier runs, without any request to the API
+        if not force_refresh and not self.metadata_due:
+            await self._async_refresh_ip_tier(economy, timings)
+        else:
+            await self._async_refresh_all_tiers(economy, timings)
+
+        # Per-stage durations in milliseconds
+        timings["total"] = round((time.monotonic() - started) * 1000, 1)
+        self.data["stage_timings"] = timings
+        _LOGGER.debug("Refresh stage timings for %s: %s", self.config_entry.data.get(CONF_DOMAIN), timings)
+        self._detect_changes(self.data)
+        # A snapshot, the data itself keeps changing with the following refreshes
+        update_sent = "update" in timings
+        return {
+            CONF_DOMAIN: self.config_entry.data.get(CONF_DOMAIN, ""),
+            "old_ip": old_ip,
+            "new_ip": self.data.get(CONF_IP_ADDRESS),
+            "old_ip6": old_ip6,
+            "new_ip6": self.data.get(CONF_IP6_ADDRESS),
+            "ip_changed": (old_ip, old_ip6) != (self.data.get(CONF_IP_ADDRESS), self.data.get(CONF_IP6_ADDRESS)),
+            "update_sent": update_sent,
+            "update_result": self.data.get("update_result") if update_sent else None,
+            CONF_REMAINING_UPDATES: self.data.get(CONF_REMAINING_UPDATES),
+            "stage_timings": dict(timings),
+        }
+
+    async def _async_refresh_ip_tier(self, economy: bool, timings: dict[str, float]) -> None:
+        """Check the public IP against the DNS records or the last domain listing and update it if needed."""
+        current_ip = current_ip6 = None
+        records: list[list[str]] | None = None
+        if economy or self.dual_stack:
+            current_ip, current_ip6, records = await self._async_check_ips(timings, self.dns_cache if economy else None)
+        self.changed_domains = set()
+
+        if not economy:
+            ip_is_changed = True
+        elif records is not None:
+            # DNS economy: compare with the records as published, which also covers changes made elsewhere
+            changed_ip = current_ip is not None and current_ip not in records[0]
+            changed_ip6 = current_ip6 is not None and current_ip6 not in records[1]
+            ip_is_changed = changed_ip or changed_ip6
+            if changed_ip:
+                self.data[CONF_IP_ADDRESS] = current_ip
+            if changed_ip6:
+                self.data[CONF_IP6_ADDRESS] = current_ip6
+        else:
+            ip_is_changed = self._check_ips_changed(current_ip, current_ip6)
+
+        # The published records already show the current addresses, a queued update is not needed anymore
+        updated = await self._async_deliver_update(
+            self.session, current_ip, current_ip6, timings, needed=ip_is_changed, confirmed=economy and records is not None
+        )
+        if updated:
+            self._async_apply_update(current_ip, current_ip6)
+            self._async_update_budget()
+
+        self._record_poll(updated=updated, ip_changed=economy and ip_is_changed)
+        self.tiers[TIER_IP].mark_refreshed(
+            {
+                "ip": current_ip,
+                "ip6": current_ip6,
+                "updated": updated,
+                "source": "dns" if records is not None else "cache",
+            }
+        )
+        self.refreshed_tiers = {TIER_IP}
+        if updated:
+            self._async_schedule_save()
+
+    async def _async_refresh_all_tiers(self, economy: bool, timings: dict[str, float]) -> None:
+        """Fetch the account info and the domain list and check the public IP."""
+        session = self.session
         headers_api = {"Authorization": f"Bearer {self.config_entry.data.get(CONF_API_KEY, '')}"}
 
-        try:
-            for attempt in range(RETRY_ATTEMPTS):
-                try:
-                    account_info = await get_account_info(session, headers_api, self.config_entry.data)
-                    if not isinstance(account_info, dict):
-                        _LOGGER.error("Received invalid account_info: %s", account_info)
-                        raise UpdateFailed("Received invalid account info")
-                    _LOGGER.debug("Received account info: %s", account_info)
-                    self.data.update(account_info)
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_api_error",
-                    )
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_error",
-                    )
-                    break
-                except APIKeyError as err:
-                    if attempt == RETRY_ATTEMPTS - 1:
-                        _LOGGER.error("Invalid API key after %d attempts: %s", RETRY_ATTEMPTS, err)
-                        self.data.update({CONF_DYNDNS_UPDATES: "unavailable", CONF_DAILY_UPDATE_LIMIT: "unavailable"})
-                        async_create(
-                            self.hass,
-                            f"IPv64.net: Invalid API key for {self.config_entry.data.get(CONF_DOMAIN)} after {RETRY_ATTEMPTS} attempts.",
-                            title="IPv64.net API Error",
-                            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_api_error",
-                        )
-                        raise UpdateFailed(f"Invalid API key: {err}") from err
-                    _LOGGER.warning("Invalid API key, retrying (%d/%d)", attempt + 1, RETRY_ATTEMPTS)
-                    await asyncio.sleep(RETRY_DELAY)
-                except (TimeoutError, aiohttp.ClientError) as err:
-                    if attempt == RETRY_ATTEMPTS - 1:
-                        _LOGGER.error("Failed to fetch account info after %d attempts: %s", RETRY_ATTEMPTS, err)
-                        async_create(
-                            self.hass,
-                            f"IPv64.net: Network error while fetching account information for {self.config_entry.data.get(CONF_DOMAIN)}: {err}",
-                            title="IPv64.net Network Error",
-                            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_error",
-                        )
-                        raise UpdateFailed(f"Failed to fetch account info: {err}") from err
-                    _LOGGER.warning("Failed to fetch account info, retrying (%d/%d): %s", attempt + 1, RETRY_ATTEMPTS, err)
-                    await asyncio.sleep(RETRY_DELAY)
-            async_dismiss(
-                self.hass,
-                notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_unexpected_error",
+        async def _check_ips() -> tuple[str | None, str | None, None]:
+            # The public addresses are needed to compare them in economy mode and to send both families when dual-stack
+            if economy or self.dual_stack:
+                return await self._async_check_ips(timings, None)
+            return None, None, None
+
+        # Account info, domain listing and public IP check are independent, so run them concurrently
+        account_info, domains, detected = await asyncio.gather(
+            _async_timed("account_info", self._async_fetch_account_info(session, headers_api), timings),
+            _async_timed("domains", self._async_fetch_domain_list(session, headers_api), timings),
+            _check_ips(),
+            return_exceptions=True,
+        )
+        current_ip, current_ip6, _ = detected if isinstance(detected, tuple) else (None, None, None)
+
+        previous_ip = self._snapshot.get(CONF_IP_ADDRESS)
+        unchanged = 0
+        if isinstance(account_info, BaseException):
+            self.fingerprints.pop("account_info", None)
+            # The previous account info is only kept after transient errors, an invalid API key dropped it
+            invalid_key = (
+                isinstance(account_info.__cause__, aiohttp.ClientResponseError) and account_info.__cause__.status == 401
             )
+            if self.account is None or invalid_key or not isinstance(account_info, UpdateFailed):
+                raise account_info
+            _LOGGER.warning("Keeping previous account info for %s: %s", self.config_entry.data.get(CONF_DOMAIN), account_info)
+        elif (fingerprint := account_info[0]) is not None and fingerprint == self.fingerprints.get("account_info"):
+            unchanged += 1
+        else:
+            self.account = account_info[1]
+            if fingerprint is not None:
+                self.fingerprints["account_info"] = fingerprint
+        domains_parsed = False
+        if isinstance(domains, BaseException):
+            if not isinstance(domains, UpdateFailed):
+                raise domains
+            # Parse the next listing even if it matches the last one, the error has to be cleared
+            self.fingerprints.pop("domains", None)
+            if self.domain_list.records:
+                _LOGGER.warning("Keeping previous domain list for %s", self.config_entry.data.get(CONF_DOMAIN))
+            self.domains_complete = False
+            self.changed_domains = set()
+            self.data["error"] = str(domains)
+        elif (fingerprint := domains[0]) is not None and fingerprint == self.fingerprints.get("domains"):
+            # Unchanged domain list, the records and the domain status stay as they are
+            unchanged += 1
+            self.changed_domains = set()
+        else:
+            if fingerprint is not None:
+                self.fingerprints["domains"] = fingerprint
+            error = self._apply_domain_list(domains[1])
+            self.domains_complete = domains_parsed = error is None
+            if error is None:
+                self.data.pop("error", None)
+            else:
+                self.data["error"] = error
+        self.skipped_parses += unchanged
+
+        ip_is_changed = self._check_ips_changed(current_ip, current_ip6) if economy else True
+        # A fresh domain listing showing the current addresses makes a queued update unnecessary
+        updated = await self._async_deliver_update(
+            session, current_ip, current_ip6, timings, needed=ip_is_changed, confirmed=economy and domains_parsed
+        )
+        if updated and self.dns_cache is not None:
+            self.dns_cache.invalidate(self.config_entry.data.get(CONF_DOMAIN, ""))
+        self._async_update_budget()
+
+        self._record_poll(
+            updated=updated,
+            ip_changed=(economy and ip_is_changed) or previous_ip not in (None, self.data.get(CONF_IP_ADDRESS)),
+        )
+        self.tiers[TIER_IP].mark_refreshed({"ip": current_ip, "ip6": current_ip6, "updated": updated, "source": "api"})
+        # An incomplete domain listing is retried with the next poll
+        if self.domains_complete:
+            self.tiers[TIER_METADATA].mark_refreshed({"domains": len(self.domain_list.records)})
+        # Entities showing account or domain data have nothing to write if neither changed
+        self.refreshed_tiers = {TIER_IP} if unchanged == 2 else set(self.tiers)
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Write the data to the cache after the save delay, unless it did not change.
+
+        Writes within the delay are combined into one. Unchanged data is written again
+        once half of the maximum cache age passed, so it stays usable for a warm start.
+        """
+        payload = self._cache_payload()
+        digest = hashlib.sha256(
+            json_bytes_sorted({key: value for key, value in payload.items() if key not in VOLATILE_CACHE_KEYS})
+        ).hexdigest()
+        max_age = self.config_entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE)
+        if digest == self._saved_digest and (max_age <= 0 or time.monotonic() - self._saved_at < max_age * 30):
+            self.skipped_saves += 1
+            return
+        self._saved_digest = digest
+        self._saved_at = time.monotonic()
+        self.data["cache_time"] = dt_util.utcnow().isoformat()
+        self._save_pending = True
+        self._cache.async_delay_save(self._cache_data, self._save_delay)
+
+    @callback
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the data to write to the cache."""
+        self._save_pending = False
+        self.cache_writes += 1
+        return self._cache_payload()
 
-        except UpdateFailed:
+    def _cache_payload(self) -> dict[str, Any]:
+        """Return the data with the account info and the domain list as stored."""
+        return {
+            **self.data,
+            "account": self.account.as_dict() if self.account is not None else None,
+            "domains": self.domain_list.as_dict(compact=self._compact_cache),
+        }
+
+    async def _async_deliver_update(
+        self,
+        session: aiohttp.ClientSession,
+        ip: str | None,
+        ip6: str | None,
+        timings: dict[str, float],
+        *,
+        needed: bool,
+        confirmed: bool,
+    ) -> bool:
+        """Send a needed or still queued update through the outbox, returns True if it was delivered.
+
+        The update is queued before it is sent and only removed once IPv64.net accepted it.
+        A failed update is retried with backoff by the following refreshes. If the records
+        `confirmed` to be up to date without a `needed` update, a queued update is dropped.
+        """
+        config_domain = self.config_entry.data.get(CONF_DOMAIN, "")
+        queued = self.outbox.get(config_domain)
+        if not needed:
+            if queued is None:
+                _LOGGER.debug("IP unchanged for %s, no update needed", config_domain)
+                return False
+            if confirmed:
+                await self.outbox.async_discard(config_domain, "the DNS records are up to date")
+                return False
+        if queued is not None:
+            # Keep the queued address of a family that could not be detected this time
+            ip = ip if ip is not None else queued.ip
+            ip6 = ip6 if ip6 is not None else queued.ip6
+        update = await self.outbox.async_enqueue(config_domain, ip, ip6)
+        if not update.due:
+            _LOGGER.debug("Update of %s waits for its next attempt at %s", config_domain, update.next_attempt)
+            return False
+        try:
+            await _async_timed("update", self._async_send_update(session, update.ip, update.ip6), timings)
+        except UpdateFailed as err:
+            cause = err.__cause__
+            # The daily update limit is reset at midnight, an earlier attempt is pointless
+            retry_at = (
+                next_daily_reset(dt_util.utcnow()).timestamp()
+                if isinstance(cause, aiohttp.ClientResponseError) and cause.status == 429
+                else None
+            )
+            await self.outbox.async_failed(config_domain, str(err), retry_at)
+            self._async_schedule_replay()
             raise
+        await self.outbox.async_delivered(config_domain)
+        return True
+
+    @callback
+    def _async_schedule_replay(self) -> None:
+        """Refresh when the next queued update is due, so it is not delayed until the next poll."""
+        if self._unsub_replay is not None:
+            self._unsub_replay()
+            self._unsub_replay = None
+        if (next_attempt := self.outbox.next_attempt) is None:
+            return
+        self._unsub_replay = async_call_later(self.hass, max(0.0, next_attempt - time.time()), self._async_replay)
+
+    async def _async_replay(self, _now: datetime) -> None:
+        self._unsub_replay = None
+        _LOGGER.debug("Replaying the queued update of %s", self.config_entry.data.get(CONF_DOMAIN))
+        await self.async_request_refresh()
+
+    async def async_load_outbox(self) -> None:
+        """Restore the updates queued before the restart and replay them when due."""
+        await self.outbox.async_load()
+        self._async_schedule_replay()
+
+    def _check_ips_changed(self, current_ip: str | None, current_ip6: str | None) -> bool:
+        """Compare each address family with its stored record, a change of either is sent in a single update."""
+        ip_is_changed = self.check_ip_equal(current_ip)
+        # Without a detected IPv6 address a missing AAAA record is no reason to spend an update
+        if current_ip6 is not None:
+            ip_is_changed = self.check_ip_equal(current_ip6, CONF_IP6_ADDRESS) or ip_is_changed
+        return ip_is_changed
+
+    @callback
+    def _async_apply_update(self, ip: str | None, ip6: str | None) -> None:
+        """Show a sent update in the cached record of the configured domain until the next domain listing."""
+        config_domain = self.config_entry.data.get(CONF_DOMAIN, "")
+        if self.dns_cache is not None:
+            self.dns_cache.invalidate(config_domain)
+        if (record := self.domain_list.records.get(config_domain)) is None:
+            return
+        patched = record
+        if ip is not None and record.record_type != "AAAA":
+            patched = replace(patched, ip_address=ip)
+        if ip6 is not None:
+            patched = replace(patched, ip_address=ip6) if record.record_type == "AAAA" else replace(patched, ip6_address=ip6)
+        if patched != record:
+            # The list is shared with the other entries of the API key, so patch a copy
+            self.domain_list = self.domain_list.with_record(patched)
+            self.changed_domains.add(config_domain)
+
+    @callback
+    def _async_update_budget(self) -> None:
+        """Update the remaining updates and warn when the daily limit is nearly used up."""
+        if (account := self.account) is None:
+            return
+        updates_used = account.dyndns_updates
+        updates_limit = account.daily_update_limit
+        if updates_used > 0 and updates_limit > 0:
+            self.data.update({CONF_REMAINING_UPDATES: account.remaining_updates})
+            if updates_used >= updates_limit * 0.9:
+                async_create(
+                    self.hass,
+                    f"IPv64.net: {updates_used} of {updates_limit} daily updates for {self.config_entry.data.get(CONF_DOMAIN)} consumed. Enable economy mode to save updates.",
+                    title="IPv64.net Update Limit Warning",
+                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_update_limit",
+                )
+            else:
+                async_dismiss(
+                    self.hass,
+                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_update_limit",
+                )
+
+    async def _async_fetch_account_info(
+        self, session: aiohttp.ClientSession, headers_api: dict[str, str]
+    ) -> tuple[str | None, AccountInfo]:
+        """Fetch the account information and its fingerprint, raising UpdateFailed when it is not available."""
+        responses = self.scheduler.responses
+
+        async def _fetch() -> tuple[str | None, AccountInfo]:
+            account_info = await get_account_info(
+                session, headers_api, self.config_entry.data, limiter=self.limiter, responses=responses
+            )
+            return responses.fingerprint("account_info"), account_info
+
+        try:
+            fingerprint, account_info = await self.scheduler.async_fetch_shared(
+                "account_info", lambda: async_retry(_fetch, "fetch account info")
+            )
+        except aiohttp.ClientResponseError as err:
+            if err.status == 401:
+                _LOGGER.error("Invalid API key for %s: %s", self.config_entry.data.get(CONF_DOMAIN), err.message)
+                self.account = None
+                async_create(
+                    self.hass,
+                    f"IPv64.net: Invalid API key for {self.config_entry.data.get(CONF_DOMAIN)}.",
+                    title="IPv64.net API Error",
+                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_api_error",
+                )
+                raise UpdateFailed(f"Invalid API key: {err.message}") from err
+            _LOGGER.error("Failed to fetch account info: %s | Status: %d", err.message, err.status)
+            async_create(
+                self.hass,
+                f"IPv64.net: Network error while fetching account information for {self.config_entry.data.get(CONF_DOMAIN)}: {err}",
+                title="IPv64.net Network Error",
+                notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_error",
+            )
+            raise UpdateFailed(f"Failed to fetch account info: {err}") from err
+        except (TimeoutError, aiohttp.ClientError) as err:
+            _LOGGER.error("Failed to fetch account info: %s", err)
+            async_create(
+                self.hass,
+                f"IPv64.net: Network error while fetching account information for {self.config_entry.data.get(CONF_DOMAIN)}: {err}",
+                title="IPv64.net Network Error",
+                notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_error",
+            )
+            raise UpdateFailed(f"Failed to fetch account info: {err}") from err
         except Exception as err:
             _LOGGER.error("Unexpected error fetching account info: %s", err)
             async_create(
@@ -344,193 +1022,208 @@ class IPv64DataUpdateCoordinator(DataUpdateCoordinator):
             )
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
-        await get_domain(session, headers_api, self.data)
+        _LOGGER.debug("Received account info: %s", account_info)
+        async_dismiss(
+            self.hass,
+            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_api_error",
+        )
+        async_dismiss(
+            self.hass,
+            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_error",
+        )
+        async_dismiss(
+            self.hass,
+            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_unexpected_error",
+        )
+        return fingerprint, account_info
 
-        ip_is_changed = False
-        if self.config_entry.options.get(CONF_API_ECONOMY, True) or is_economy:
-            ip_is_changed = await self.check_ip_equal(session)
-        else:
-            ip_is_changed = True
+    async def _async_fetch_domain_list(
+        self, session: aiohttp.ClientSession, headers_api: dict[str, str]
+    ) -> tuple[str | None, DomainList]:
+        """Fetch the domain list and its fingerprint, raising UpdateFailed when it is not available."""
+        config_domain = self.config_entry.data.get(CONF_DOMAIN, "")
+        if not any(config_domain.endswith(allowed_domain) for allowed_domain in ALLOWED_DOMAINS):
+            _LOGGER.error("Domain %s is not one of the allowed domains: %s", config_domain, ALLOWED_DOMAINS)
+            raise UpdateFailed(f"Domain {config_domain} not allowed")
+        try:
+            return await fetch_domain_list(session, headers_api, self.limiter, self.scheduler)
+        except aiohttp.ClientResponseError as error:
+            _LOGGER.error("Failed to fetch domains: %s | Status: %d", error.message, error.status)
+            raise UpdateFailed("Failed to fetch domains") from error
+        except (TimeoutError, aiohttp.ClientError) as err:
+            _LOGGER.error("Failed to fetch domains: %s", err)
+            raise UpdateFailed(str(err)) from err
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.error("Received invalid domain list: %s", err)
+            raise UpdateFailed(f"Invalid domain list: {err}") from err
 
-        if ip_is_changed:
-            headers_token = {"Authorization": f"Bearer {self.config_entry.data.get(CONF_TOKEN, '')}"}
-            for attempt in range(RETRY_ATTEMPTS):
-                try:
-                    async with session.get(
-                        f"{UPDATE_URL}?domain={self.config_entry.data.get(CONF_DOMAIN, '')}",
-                        headers=headers_token,
-                        timeout=TIMEOUT,
-                    ) as resp:
-                        resp.raise_for_status()
-                        update_result = await resp.json()
-                        self.data.update({"update_result": update_result.get("status", "unknown")})
-                        _LOGGER.info("IP update successful for %s: %s", self.config_entry.data.get(CONF_DOMAIN), update_result)
-                        break
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_limit_error",
-                    )
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_auth_error",
-                    )
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_update_error",
-                    )
-                except aiohttp.ClientResponseError as error:
-                    self.data.update({"update_result": "fail"})
-                    if attempt == RETRY_ATTEMPTS - 1:
-                        if error.status == 429:
-                            _LOGGER.error(
-                                "Update limit reached for %s: %s of %s used",
-                                self.config_entry.data.get(CONF_DOMAIN),
-                                self.data.get(CONF_DYNDNS_UPDATES, "unknown"),
-                                self.data.get(CONF_DAILY_UPDATE_LIMIT, "unknown"),
-                            )
-                            async_create(
-                                self.hass,
-                                f"IPv64.net: Update limit reached for {self.config_entry.data.get(CONF_DOMAIN)}. Remaining updates: {self.data.get(CONF_REMAINING_UPDATES, 'unknown')}.",
-                                title="IPv64.net Update Limit",
-                                notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_limit_error",
-                            )
-                        elif error.status == 401:
-                            _LOGGER.error("Invalid update token for %s", self.config_entry.data.get(CONF_DOMAIN))
-                            async_create(
-                                self.hass,
-                                f"IPv64.net: Invalid update token for {self.config_entry.data.get(CONF_DOMAIN)}.",
-                                title="IPv64.net Authentication Error",
-                                notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_auth_error",
-                            )
-                        else:
-                            _LOGGER.error(
-                                "Update failed for %s after %d attempts: %s | Status: %d",
-                                self.config_entry.data.get(CONF_DOMAIN),
-                                RETRY_ATTEMPTS,
-                                error.message,
-                                error.status,
-                            )
-                        raise UpdateFailed(f"Update failed after retries: {error}") from error
-                    _LOGGER.warning("Update failed, retrying (%d/%d): %s", attempt + 1, RETRY_ATTEMPTS, error.message)
-                    await asyncio.sleep(RETRY_DELAY)
-                except (TimeoutError, aiohttp.ClientError) as error:
-                    self.data.update({"update_result": "fail"})
-                    if attempt == RETRY_ATTEMPTS - 1:
-                        _LOGGER.error(
-                            "Failed to update IP for %s after %d attempts: %s",
-                            self.config_entry.data.get(CONF_DOMAIN),
-                            RETRY_ATTEMPTS,
-                            error,
-                        )
-                        async_create(
-                            self.hass,
-                            f"IPv64.net: Network error while updating IP for {self.config_entry.data.get(CONF_DOMAIN)}: {error}",
-                            title="IPv64.net Network Error",
-                            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_update_error",
-                        )
-                        raise UpdateFailed(f"Update failed: {error}") from error
-                    _LOGGER.warning("Update failed, retrying (%d/%d): %s", attempt + 1, RETRY_ATTEMPTS, error)
-                    await asyncio.sleep(RETRY_DELAY)
-        else:
-            _LOGGER.debug("IP unchanged for %s, no update needed", self.config_entry.data.get(CONF_DOMAIN))
+    async def _async_send_update(self, session: aiohttp.ClientSession, ip: str | None = None, ip6: str | None = None) -> None:
+        """Send the DynDNS update for the configured domain.
 
-        updates_used = self.data.get(CONF_DYNDNS_UPDATES, 0)
-        updates_limit = self.data.get(CONF_DAILY_UPDATE_LIMIT, 64)
-        if updates_used > 0 and updates_limit > 0:
-            remaining_updates = updates_limit - int(updates_used)
-            self.data.update({CONF_REMAINING_UPDATES: remaining_updates})
-            if updates_used >= updates_limit * 0.9:
+        Detected addresses are sent explicitly, otherwise IPv64.net uses the address the
+        request came from, which only updates the record of one address family.
+        """
+        config_domain = self.config_entry.data.get(CONF_DOMAIN, "")
+        headers_token = {"Authorization": f"Bearer {self.config_entry.data.get(CONF_TOKEN, '')}"}
+        params = {"domain": config_domain}
+        if ip is not None:
+            params["ip"] = ip
+        if ip6 is not None:
+            params["ip6"] = ip6
+
+        async def _update() -> dict[str, Any]:
+            async with session.get(UPDATE_URL, params=params, headers=headers_token, timeout=TIMEOUT) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+        try:
+            # A 429 from nic/update means the daily update limit is used up, so repeating it is pointless
+            update_result = await async_retry(
+                _update,
+                f"update IP for {config_domain}",
+                retryable_statuses=RETRYABLE_STATUSES - {429},
+            )
+        except aiohttp.ClientResponseError as error:
+            self.data.update({"update_result": "fail"})
+            if error.status == 429:
+                _LOGGER.error(
+                    "Update limit reached for %s: %s of %s used",
+                    config_domain,
+                    self.account.dyndns_updates if self.account is not None else "unknown",
+                    self.account.daily_update_limit if self.account is not None else "unknown",
+                )
                 async_create(
                     self.hass,
-                    f"IPv64.net: {updates_used} of {updates_limit} daily updates for {self.config_entry.data.get(CONF_DOMAIN)} consumed. Enable economy mode to save updates.",
-                    title="IPv64.net Update Limit Warning",
-                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_update_limit",
+                    f"IPv64.net: Update limit reached for {config_domain}. Remaining updates: {self.data.get(CONF_REMAINING_UPDATES, 'unknown')}.",
+                    title="IPv64.net Update Limit",
+                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_limit_error",
                 )
-            else:
-                async_dismiss(
+            elif error.status == 401:
+                _LOGGER.error("Invalid update token for %s", config_domain)
+                async_create(
                     self.hass,
-                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_update_limit",
+                    f"IPv64.net: Invalid update token for {config_domain}.",
+                    title="IPv64.net Authentication Error",
+                    notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_auth_error",
                 )
+            else:
+                _LOGGER.error("Update failed for %s: %s | Status: %d", config_domain, error.message, error.status)
+            raise UpdateFailed(f"Update failed: {error}") from error
+        except (TimeoutError, aiohttp.ClientError) as error:
+            self.data.update({"update_result": "fail"})
+            _LOGGER.error("Failed to update IP for %s: %s", config_domain, error)
+            async_create(
+                self.hass,
+                f"IPv64.net: Network error while updating IP for {config_domain}: {error}",
+                title="IPv64.net Network Error",
+                notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_update_error",
+            )
+            raise UpdateFailed(f"Update failed: {error}") from error
 
-        self.data["cache_time"] = datetime.now().isoformat()
-        await self._cache.async_save(self.data)
+        self.data.update({"update_result": update_result.get("status", "unknown")})
+        # Count the update until the next account info arrives
+        if self.account is not None:
+            self.account = replace(self.account, dyndns_updates=self.account.dyndns_updates + 1)
+        _LOGGER.info("IP update successful for %s: %s", config_domain, update_result)
+        async_dismiss(
+            self.hass,
+            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_limit_error",
+        )
+        async_dismiss(
+            self.hass,
+            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_auth_error",
+        )
+        async_dismiss(
+            self.hass,
+            notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_network_update_error",
+        )
 
-        return self.data
+    async def _async_check_ips(
+        self, timings: dict[str, float], dns_cache: DNSCache | None
+    ) -> tuple[str | None, str | None, list[list[str]] | None]:
+        """Detect the public IPv4 and IPv6 address, concurrently with the DNS lookup of the configured domain.
+
+        Returns the detected addresses and, with a DNS cache, the A and AAAA records of the
+        domain. The records are None if they could not be resolved.
+        """
+        config_domain = self.config_entry.data.get(CONF_DOMAIN, "")
+        check_ip6 = (
+            _async_timed("check_ip6", self._async_fetch_current_ip(self.ip6_resolver), timings)
+            if self.ip6_resolver is not None
+            else _async_value(None)
+        )
+        qtypes = [DNS_TYPES["A"], DNS_TYPES["AAAA"]] if self.ip6_resolver is not None else [DNS_TYPES["A"]]
+
+        async def _resolve(cache: DNSCache) -> list[list[str]]:
+            return await asyncio.gather(*(cache.async_resolve(config_domain, qtype) for qtype in qtypes))
+
+        lookup = _async_timed("dns_check", _resolve(dns_cache), timings) if dns_cache is not None else _async_value(None)
+
+        current_ip, current_ip6, records = await asyncio.gather(
+            _async_timed("check_ip", self._async_fetch_current_ip(self.ip_resolver), timings),
+            check_ip6,
+            lookup,
+            return_exceptions=True,
+        )
+        if isinstance(records, BaseException):
+            _LOGGER.warning("DNS lookup of %s failed, comparing with the last domain listing: %s", config_domain, records)
+            records = None
+        _LOGGER.debug("Public IP of %s: %s/%s, DNS records: %s", config_domain, current_ip, current_ip6, records)
+        return (
+            current_ip if isinstance(current_ip, str) else None,
+            current_ip6 if isinstance(current_ip6, str) else None,
+            records,
+        )
 
-    async def check_ip_equal(self, session: aiohttp.ClientSession) -> bool:
-        """Check if the IP has changed."""
+    async def _async_fetch_current_ip(self, resolver: PublicIPResolver) -> str | None:
+        """Fetch the current public IP address, returning None if it cannot be determined."""
+        config_domain = self.config_entry.data.get(CONF_DOMAIN)
+        notification_id = f"{DOMAIN}_{self.config_entry.entry_id}_{'ip6' if resolver.version == 6 else 'ip'}_check_error"
+        try:
+            current_ip = await resolver.async_resolve()
+        except IPResolveError as error:
+            _LOGGER.error("Failed to check IP for %s: %s", config_domain, error)
+            async_create(
+                self.hass,
+                f"IPv64.net: Error while checking IP address for {config_domain}: {error}",
+                title="IPv64.net IP Check Error",
+                notification_id=notification_id,
+            )
+            return None
+
+        _LOGGER.debug("Current IP for %s: %s", config_domain, current_ip)
+        async_dismiss(
+            self.hass,
+            notification_id=notification_id,
+        )
+        return current_ip
+
+    def check_ip_equal(self, current_ip: str | None, key: str = CONF_IP_ADDRESS) -> bool:
+        """Check if the IP stored under `key` (IPv4 or IPv6) has changed."""
         _LOGGER.debug("Checking IP in economy mode for %s", self.config_entry.data.get(CONF_DOMAIN))
         config_domain = self.config_entry.data.get(CONF_DOMAIN)
-        stored_ip = self.data.get(CONF_IP_ADDRESS, "unknown")
+        stored_ip = self.data.get(key, "unknown")
         if stored_ip == "unknown":
             _LOGGER.warning("No stored IP found for domain %s, fetching from subdomains", config_domain)
-            for subdomain in self.data.get("subdomains", []):
-                if subdomain.get("domain") == config_domain:
-                    stored_ip = subdomain.get("ip_address", "unknown")
-                    self.data[CONF_IP_ADDRESS] = stored_ip  # Update self.data
-                    break
+            if record := self.get_domain_record(config_domain):
+                stored_ip = (record.ipv6 if key == CONF_IP6_ADDRESS else record.ipv4) or "unknown"
+                self.data[key] = stored_ip  # Update self.data
             if stored_ip == "unknown":
                 _LOGGER.error("No IP address found for domain %s in subdomains", config_domain)
                 return True  # Trigger update if no stored IP
 
-        for attempt in range(RETRY_ATTEMPTS):
-            try:
-                async with session.get(CHECKIP_URL, timeout=TIMEOUT) as request:
-                    request.raise_for_status()
-                    current_ip = (await request.text()).strip()
-                    _LOGGER.debug("Current IP for %s: %s", config_domain, current_ip)
-                    _LOGGER.debug("Stored IP for %s: %s", config_domain, stored_ip)
-                    ip_changed = current_ip != stored_ip
-                    _LOGGER.debug(
-                        "IP comparison for %s: stored=%s, current=%s, changed=%s",
-                        config_domain,
-                        stored_ip,
-                        current_ip,
-                        ip_changed,
-                    )
-                    if ip_changed:
-                        self.data[CONF_IP_ADDRESS] = current_ip  # Update stored IP
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_ip_check_error",
-                    )
-                    async_dismiss(
-                        self.hass,
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_ip_check_network_error",
-                    )
-                    return ip_changed
-            except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError) as error:
-                if attempt == RETRY_ATTEMPTS - 1:
-                    _LOGGER.error(
-                        "Failed to check IP for %s after %d attempts: %s",
-                        config_domain,
-                        RETRY_ATTEMPTS,
-                        error,
-                    )
-                    async_create(
-                        self.hass,
-                        f"IPv64.net: Error while checking IP address for {config_domain}: {error}",
-                        title="IPv64.net IP Check Error",
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_ip_check_error",
-                    )
-                    return False
-                _LOGGER.warning("IP check failed, retrying (%d/%d): %s", attempt + 1, RETRY_ATTEMPTS, error)
-                await asyncio.sleep(RETRY_DELAY)
-            except (TimeoutError, aiohttp.ClientError) as error:
-                if attempt == RETRY_ATTEMPTS - 1:
-                    _LOGGER.error(
-                        "Failed to check IP for %s after %d attempts: %s",
-                        config_domain,
-                        RETRY_ATTEMPTS,
-                        error,
-                    )
-                    async_create(
-                        self.hass,
-                        f"IPv64.net: Network error while checking IP address for {config_domain}: {error}",
-                        title="IPv64.net IP Check Error",
-                        notification_id=f"{DOMAIN}_{self.config_entry.entry_id}_ip_check_network_error",
-                    )
-                    return False
-                _LOGGER.warning("IP check failed, retrying (%d/%d): %s", attempt + 1, RETRY_ATTEMPTS, error)
-                await asyncio.sleep(RETRY_DELAY)
-        return False
+        if current_ip is None:
+            return False
+
+        _LOGGER.debug("Stored IP for %s: %s", config_domain, stored_ip)
+        ip_changed = current_ip != stored_ip
+        _LOGGER.debug(
+            "IP comparison for %s: stored=%s, current=%s, changed=%s",
+            config_domain,
+            stored_ip,
+            current_ip,
+            ip_changed,
+        )
+        if ip_changed:
+            self.data[key] = current_ip  # Update stored IP
+        return ip_changed
@@ -9,7 +9,8 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_API_KEY, CONF_TOKEN, DOMAIN
+from .const import CONF_API_KEY, CONF_TOKEN, DATA_PINGER, DOMAIN
+from .coordinator import IPv64DataUpdateCoordinator
 
 TO_REDACT = {
     CONF_API_KEY,
@@ -20,35 +21,57 @@ TO_REDACT = {
     "domain",
     "title",
     "ip_address",
+    "ip6_address",
+    "ip",
+    "ip6",
     "unique_id",
 }
 _LOGGER = logging.getLogger(__name__)
 
 
-def _redact_metadata(data: dict[str, Any]) -> dict[str, Any]:
-    """Recursively redact metadata sections."""
-    result: dict[str, Any] = {}
-    for key, value in data.items():
-        new_key = "**REDACTED**_metadata" if key.endswith("_metadata") and key != f"{data.get('domain')}_metadata" else key
-        new_key = "**REDACTED_REG_DOMAIN**_metadata" if key == f"{data.get('domain')}_metadata" else new_key
-        if isinstance(value, dict):
-            result[new_key] = _redact_metadata(value)
-        elif isinstance(value, list):
-            result[new_key] = [_redact_metadata(item) if isinstance(item, dict) else item for item in value]
-        else:
-            result[new_key] = value
-    return result
+def _redact_domains(coordinator: IPv64DataUpdateCoordinator) -> dict[str, Any]:
+    """Return the domain records and metadata with the domain names replaced."""
+    config_domain = coordinator.data.get("domain")
+    domain_list = coordinator.domain_list
+    names = {
+        name: "**REDACTED_REG_DOMAIN**" if name == config_domain else f"**REDACTED_{index}**"
+        for index, name in enumerate(domain_list.metadata)
+    }
+    return {
+        "records": [async_redact_data(record.attributes(), TO_REDACT) for record in domain_list.records.values()],
+        "metadata": {
+            names[name]: async_redact_data(metadata.as_dict(), TO_REDACT) for name, metadata in domain_list.metadata.items()
+        },
+    }
 
 
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator: IPv64DataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     _LOGGER.debug(coordinator.data["domain"])
-    data = _redact_metadata(coordinator.data)
 
     return {
         "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
-        "data": async_redact_data(data, TO_REDACT),
+        "data": async_redact_data(coordinator.data, TO_REDACT),
+        "account": coordinator.account.as_dict() if coordinator.account is not None else None,
+        "domains": _redact_domains(coordinator),
+        "rate_limiter": coordinator.limiter.as_dict(),
+        "scheduler": coordinator.scheduler.as_dict(),
+        "ip_watcher": coordinator.ip_watcher.as_dict() if coordinator.ip_watcher else None,
+        "ip_resolver": coordinator.ip_resolver.as_dict(),
+        "ip6_resolver": coordinator.ip6_resolver.as_dict() if coordinator.ip6_resolver else None,
+        "dns_economy": coordinator.dns_cache.as_dict() if coordinator.dns_cache else None,
+        "tiers": {name: async_redact_data(tier.as_dict(), TO_REDACT) for name, tier in coordinator.tiers.items()},
+        "connections": coordinator.connection_stats.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "skipped_writes": coordinator.skipped_writes,
+        "responses": coordinator.scheduler.responses.as_dict(),
+        "outbox": async_redact_data(coordinator.outbox.as_dict(), TO_REDACT),
+        "skipped_parses": coordinator.skipped_parses,
+        "joined_refreshes": coordinator.joined_refreshes,
+        "queued_refreshes": coordinator.queued_refreshes,
+        "cache_writes": coordinator.cache_writes,
+        "skipped_saves": coordinator.skipped_saves,
+        "healthchecks": coordinator.healthchecks.as_dict() if coordinator.healthchecks else None,
+        "pinger": pinger.as_dict() if (pinger := hass.data[DOMAIN].get(DATA_PINGER)) else None,
     }
-
-
@@ -0,0 +1,198 @@
+"""Minimal async DNS client over UDP with a TTL-aware cache."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import random
+import struct
+import time
+from typing import Any
+
+from .const import ALLOWED_DOMAINS, DNS_BOOTSTRAP_SERVERS, DNS_CACHE_MAX_TTL, DNS_QUERY_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+DNS_TYPES = {"A": 1, "NS": 2, "CNAME": 5, "TXT": 16, "AAAA": 28}
+DNS_CLASSES = {"IN": 1, "CH": 3}
+DNS_PORT = 53
+RCODE_NXDOMAIN = 3
+FLAG_TRUNCATED = 0x0200
+
+# (type, value, ttl) of an answer record
+type DNSRecord = tuple[int, str, int]
+
+
+class DNSError(Exception):
+    """Error to indicate a DNS query failed."""
+
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    """Receive a single DNS response."""
+
+    def __init__(self, response: asyncio.Future[bytes]) -> None:
+        self._response = response
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        if not self._response.done():
+            self._response.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self._response.done():
+            self._response.set_exception(exc)
+
+
+def build_dns_query(query_id: int, name: str, qtype: int, qclass: int = 1) -> bytes:
+    """Build a DNS query message for a single question."""
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    labels = b"".join(bytes([len(label)]) + label for label in name.rstrip(".").encode("ascii").split(b"."))
+    return header + labels + b"\0" + struct.pack("!HH", qtype, qclass)
+
+
+def _read_name(message: bytes, offset: int) -> tuple[str, int]:
+    """Return the (possibly compressed) name at `offset` and the offset after it."""
+    labels: list[str] = []
+    end = None
+    for _ in range(128):  # Bounds the number of compression pointers followed
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = struct.unpack_from("!H", message, offset)[0] & 0x3FFF
+            continue
+        offset += 1
+        if length == 0:
+            return ".".join(labels), offset if end is None else end
+        labels.append(message[offset : offset + length].decode("ascii", "replace"))
+        offset += length
+    raise DNSError("DNS name compression loop")
+
+
+def parse_dns_response(message: bytes, query_id: int) -> list[DNSRecord]:
+    """Return the answer records of a response, an empty list if the name does not exist."""
+    try:
+        response_id, flags, questions, answers, _, _ = struct.unpack_from("!HHHHHH", message)
+        if response_id != query_id:
+            raise DNSError("DNS response does not match the query")
+        if flags & FLAG_TRUNCATED:
+            raise DNSError("DNS response truncated")
+        rcode = flags & 0x000F
+        if rcode == RCODE_NXDOMAIN:
+            return []
+        if rcode:
+            raise DNSError(f"DNS query failed with rcode {rcode}")
+        offset = 12
+        for _ in range(questions):
+            offset = _read_name(message, offset)[1] + 4
+        records: list[DNSRecord] = []
+        for _ in range(answers):
+            offset = _read_name(message, offset)[1]
+            rtype, _rclass, ttl, length = struct.unpack_from("!HHIH", message, offset)
+            offset += 10
+            rdata = message[offset : offset + length]
+            if rtype == DNS_TYPES["A"] and length == 4:
+                records.append((rtype, str(ipaddress.IPv4Address(rdata)), ttl))
+            elif rtype == DNS_TYPES["AAAA"] and length == 16:
+                records.append((rtype, str(ipaddress.IPv6Address(rdata)), ttl))
+            elif rtype == DNS_TYPES["TXT"] and length:
+                records.append((rtype, rdata[1 : 1 + rdata[0]].decode("ascii", "replace"), ttl))
+            elif rtype in (DNS_TYPES["NS"], DNS_TYPES["CNAME"]):
+                records.append((rtype, _read_name(message, offset)[0], ttl))
+            offset += length
+    except (IndexError, struct.error) as err:
+        raise DNSError("Malformed DNS response") from err
+    return records
+
+
+async def async_query(server: str, port: int, name: str, qtype: int, qclass: int = 1) -> list[DNSRecord]:
+    """Send a single query to `server` and return the answer records."""
+    loop = asyncio.get_running_loop()
+    query_id = random.getrandbits(16)
+    response: asyncio.Future[bytes] = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(lambda: _DNSProtocol(response), remote_addr=(server, port))
+    try:
+        transport.sendto(build_dns_query(query_id, name, qtype, qclass))
+        return parse_dns_response(await response, query_id)
+    finally:
+        transport.close()
+
+
+def zone_of(hostname: str) -> str | None:
+    """Return the IPv64.net zone a hostname belongs to."""
+    return next(
+        (zone for zone in ALLOWED_DOMAINS if hostname == zone or hostname.endswith(f".{zone}")),
+        None,
+    )
+
+
+class DNSCache:
+    """Resolve host records with a cache honouring the record TTLs.
+
+    Without a server, the records are asked from the authoritative name servers of the
+    IPv64.net zone, which see an update immediately. Their addresses are looked up once
+    through DNS_BOOTSTRAP_SERVERS and cached for their TTL as well.
+    """
+
+    def __init__(self, server: str | None = None) -> None:
+        """Initialize the cache, `server` is a recursive resolver to ask instead."""
+        self.server = server or None
+        self._cache: dict[tuple[str, str, int], tuple[float, list[str]]] = {}
+        self.queries = 0
+        self.hits = 0
+        self.failures = 0
+
+    async def _async_query(self, servers: list[str], name: str, qtype: int) -> list[str]:
+        """Ask the servers one after another until one answers, using and filling the cache."""
+        key = (",".join(servers), name.lower(), qtype)
+        if (cached := self._cache.get(key)) is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+        errors = []
+        for server in servers:
+            self.queries += 1
+            try:
+                async with asyncio.timeout(DNS_QUERY_TIMEOUT):
+                    records = await async_query(server, DNS_PORT, name, qtype)
+            except (TimeoutError, OSError, DNSError) as err:
+                self.failures += 1
+                errors.append(f"{server}: {err or type(err).__name__}")
+                continue
+            values = [value for rtype, value, _ in records if rtype == qtype]
+            ttl = min((ttl for rtype, _, ttl in records if rtype == qtype), default=0)
+            if ttl := min(ttl, DNS_CACHE_MAX_TTL):
+                self._cache[key] = (time.monotonic() + ttl, values)
+            return values
+        raise DNSError(f"No DNS server answered {name}: {'; '.join(errors)}")
+
+    async def _async_servers(self, hostname: str) -> list[str]:
+        """Return the servers to ask for `hostname`."""
+        if self.server is not None:
+            return [self.server]
+        if (zone := zone_of(hostname)) is None:
+            return list(DNS_BOOTSTRAP_SERVERS)
+        addresses: list[str] = []
+        for name_server in await self._async_query(DNS_BOOTSTRAP_SERVERS, zone, DNS_TYPES["NS"]):
+            addresses.extend(await self._async_query(DNS_BOOTSTRAP_SERVERS, name_server, DNS_TYPES["A"]))
+        if not addresses:
+            raise DNSError(f"No name servers found for {zone}")
+        return addresses
+
+    async def async_resolve(self, hostname: str, qtype: int) -> list[str]:
+        """Return the addresses of `hostname` for the record type `qtype`."""
+        return await self._async_query(await self._async_servers(hostname), hostname, qtype)
+
+    def invalidate(self, hostname: str) -> None:
+        """Drop the cached records of a hostname, e.g. after updating it."""
+        for key in [key for key in self._cache if key[1] == hostname.lower()]:
+            del self._cache[key]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache statistics."""
+        return {
+            "server": self.server or "authoritative",
+            "queries": self.queries,
+            "cache_hits": self.hits,
+            "failures": self.failures,
+            "cached": len(self._cache),
+        }
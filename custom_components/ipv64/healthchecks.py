@@ -0,0 +1,115 @@
+"""Coordinator for the healthchecks of an IPv64.net account."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import replace
+from datetime import timedelta
+import logging
+from typing import Any
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_API_KEY, DOMAIN, GET_HEALTHCHECK_STATISTICS, GET_HEALTHCHECKS, HEALTHCHECK_HISTORY_SIZE, TIMEOUT
+from .limiter import TokenBucket
+from .models import Healthcheck, HealthcheckSample
+from .retry import async_retry
+from .scheduler import AccountScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IPv64HealthcheckCoordinator(DataUpdateCoordinator[dict[str, Healthcheck]]):
+    """Fetch the healthchecks of the account and their statistics on their own interval.
+
+    Both requests are sent one after another as one batch, paced by the rate limiter of
+    the API key and shared with the other entries of the key, and never run as part of a
+    DynDNS refresh. The states seen by the refreshes are kept per healthcheck in a ring
+    buffer of HEALTHCHECK_HISTORY_SIZE samples.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session: aiohttp.ClientSession,
+        scheduler: AccountScheduler,
+        interval: timedelta,
+    ) -> None:
+        """Initialize the healthcheck coordinator."""
+        self._session = session
+        self._scheduler = scheduler
+        self._limiter: TokenBucket = scheduler.limiter
+        self._headers = {"Authorization": f"Bearer {entry.data.get(CONF_API_KEY, '')}"}
+        self.history: dict[str, deque[HealthcheckSample]] = {}
+        self.statistics_failures = 0
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_{entry.entry_id}_healthchecks",
+            update_interval=interval,
+        )
+
+    async def _async_get_json(self, url: str, description: str) -> dict[str, Any]:
+        async def _get() -> dict[str, Any]:
+            await self._limiter.acquire()
+            async with self._session.get(url, headers=self._headers, timeout=TIMEOUT) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+        return await async_retry(_get, description)
+
+    async def _async_fetch_batch(self) -> dict[str, Healthcheck]:
+        """Fetch the healthchecks, then their statistics, which are left out if they fail."""
+        checks = Healthcheck.list_from_api(await self._async_get_json(GET_HEALTHCHECKS, "fetch healthchecks"))
+        if not checks:
+            return checks
+        try:
+            statistics = Healthcheck.statistics_from_api(
+                await self._async_get_json(GET_HEALTHCHECK_STATISTICS, "fetch healthcheck statistics")
+            )
+        except (TimeoutError, aiohttp.ClientError) as err:
+            self.statistics_failures += 1
+            _LOGGER.warning("Failed to fetch the healthcheck statistics: %s", err)
+            return checks
+        return {token: replace(check, statistics=statistics.get(token, {})) for token, check in checks.items()}
+
+    async def _async_update_data(self) -> dict[str, Healthcheck]:
+        """Fetch the healthchecks and record their states in the history."""
+        try:
+            checks = await self._scheduler.async_fetch_shared("healthchecks", self._async_fetch_batch)
+        except (TimeoutError, aiohttp.ClientError) as err:
+            raise UpdateFailed(f"Failed to fetch healthchecks: {err}") from err
+        except (KeyError, TypeError, ValueError) as err:
+            raise UpdateFailed(f"Received invalid healthchecks: {err}") from err
+
+        now = dt_util.utcnow().isoformat()
+        for token in self.history.keys() - checks.keys():
+            del self.history[token]
+        for token, check in checks.items():
+            history = self.history.setdefault(token, deque(maxlen=HEALTHCHECK_HISTORY_SIZE))
+            # Only state changes and new pings are recorded, so the buffer covers more than the last refreshes
+            if not history or (history[-1].status, history[-1].last_ping) != (check.status, check.last_ping):
+                history.append(HealthcheckSample(now, check.status, check.last_ping))
+        return checks
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the healthchecks and their history by name."""
+        return {
+            "interval": self.update_interval.total_seconds() if self.update_interval else None,
+            "last_update_success": self.last_update_success,
+            "statistics_failures": self.statistics_failures,
+            "healthchecks": {
+                check.name: {
+                    "status": check.status,
+                    "history": [sample.as_dict() for sample in self.history.get(token, ())],
+                }
+                for token, check in (self.data or {}).items()
+            },
+        }
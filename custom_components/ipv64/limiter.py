@@ -0,0 +1,78 @@
+"""Client-side rate limiting for the IPv64.net API."""
+
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import API_RATE_LIMIT, API_RATE_PERIOD, DATA_RATE_LIMITERS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Wait for the token of the next request, read by the request metrics
+rate_limit_wait: ContextVar[float] = ContextVar("ipv64_rate_limit_wait", default=0.0)
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` requests per `period` seconds."""
+
+    def __init__(self, rate: int = API_RATE_LIMIT, period: float = API_RATE_PERIOD) -> None:
+        """Initialize a full token bucket."""
+        self._capacity = float(rate)
+        self._fill_rate = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._fill_rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token and return the time waited in seconds."""
+        # The lock keeps waiters in FIFO order so a burst is spread out evenly
+        async with self._lock:
+            self._refill()
+            wait = 0.0
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self._fill_rate
+                _LOGGER.debug("Rate limit reached, waiting %.2f seconds for the next API request", wait)
+                await asyncio.sleep(wait)
+                self._refill()
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            self._tokens -= 1
+            self.requests += 1
+            rate_limit_wait.set(wait)
+            return wait
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter statistics."""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "total_wait": round(self.total_wait, 3),
+            "max_wait": round(self.max_wait, 3),
+            "average_wait": round(self.total_wait / self.throttled, 3) if self.throttled else 0.0,
+        }
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, api_key: str) -> TokenBucket:
+    """Return the rate limiter shared by all requests made with an API key."""
+    limiters: dict[str, TokenBucket] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_RATE_LIMITERS, {})
+    if api_key not in limiters:
+        limiters[api_key] = TokenBucket()
+    return limiters[api_key]
@@ -0,0 +1,170 @@
+"""Latency and outcome metrics of the outbound requests of an entry."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from .const import METRICS_ENDPOINTS, METRICS_LATENCY_BUCKETS
+from .limiter import rate_limit_wait
+from .retry import retry_attempt
+
+
+def endpoint_of(method: str, url: URL) -> str | None:
+    """Return the IPv64.net endpoint a request goes to.
+
+    Requests to other hosts check the public IP, the IP providers record them together
+    with their DNS lookups, so they are not traced.
+    """
+    if url.path.endswith("/nic/update"):
+        return "update"
+    if not url.path.endswith("/api.php"):
+        return None
+    if method == aiohttp.hdrs.METH_POST:
+        return "add_domain"
+    if method == aiohttp.hdrs.METH_DELETE:
+        return "delete_domain"
+    if "get_account_info" in url.query:
+        return "account_info"
+    if "get_domains" in url.query:
+        return "domains"
+    if "get_healthchecks" in url.query or "get_healthcheck_statistics" in url.query:
+        return "healthchecks"
+    return None
+
+
+class LatencyHistogram:
+    """Latencies counted in the fixed buckets of METRICS_LATENCY_BUCKETS, the last bucket is unbounded."""
+
+    def __init__(self) -> None:
+        """Initialize the empty histogram."""
+        self.counts = [0] * (len(METRICS_LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency: float) -> None:
+        """Count a latency in milliseconds."""
+        self.counts[bisect_left(METRICS_LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile, the maximum for the last bucket."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(METRICS_LATENCY_BUCKETS, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max), 1)
+        return round(self.max, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram."""
+        return {
+            "count": self.count,
+            "average": round(self.total / self.count, 1) if self.count else None,
+            "p95": self.percentile(95),
+            "max": round(self.max, 1),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(METRICS_LATENCY_BUCKETS, self.counts, strict=False)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class EndpointMetrics:
+    """Requests to an endpoint, their latency, retries, HTTP statuses and rate limit waits."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        # Bounded by the HTTP status codes
+        self.statuses: dict[int, int] = {}
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of the endpoint."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency": self.latency.as_dict(),
+            "rate_limit": {
+                "throttled": self.throttled,
+                "total_wait": round(self.total_wait, 3),
+                "max_wait": round(self.max_wait, 3),
+            },
+        }
+
+
+class RequestMetrics:
+    """Record every request of an entry by endpoint.
+
+    The requests to IPv64.net are traced by the session, so nothing is missed. The
+    public IP checks are recorded by the IP providers, which also query over DNS.
+    Retries are recognized by the attempt async_retry is at and waits for the rate
+    limiter by the wait of the token bucket, both set in the context of the request.
+    Memory does not grow with the number of requests, the endpoints are fixed and
+    their latencies kept in histograms.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics of every endpoint."""
+        self.endpoints = {endpoint: EndpointMetrics() for endpoint in METRICS_ENDPOINTS}
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config feeding the metrics."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+
+    async def _on_request_start(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestStartParams
+    ) -> None:
+        context.metrics = metrics = self.endpoints.get(endpoint_of(params.method, params.url) or "")
+        if metrics is None:
+            return
+        context.started = session.loop.time()
+        metrics.requests += 1
+        if retry_attempt.get() > 1:
+            metrics.retries += 1
+        if wait := rate_limit_wait.get():
+            # Consumed by the request it was waited for
+            rate_limit_wait.set(0.0)
+            metrics.throttled += 1
+            metrics.total_wait += wait
+            metrics.max_wait = max(metrics.max_wait, wait)
+
+    async def _on_request_end(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestEndParams
+    ) -> None:
+        if (metrics := context.metrics) is None:
+            return
+        metrics.latency.add((session.loop.time() - context.started) * 1000)
+        metrics.statuses[params.response.status] = metrics.statuses.get(params.response.status, 0) + 1
+
+    async def _on_request_exception(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams
+    ) -> None:
+        if context.metrics is not None:
+            context.metrics.errors += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics by endpoint."""
+        return {endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()}
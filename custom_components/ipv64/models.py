@@ -0,0 +1,306 @@
+"""Typed account and domain data of IPv64.net."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Self
+
+from homeassistant.const import CONF_DOMAIN, CONF_IP_ADDRESS, CONF_TTL, CONF_TYPE
+
+from .const import CONF_IP6_ADDRESS, HEALTHCHECK_STATES
+
+
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(field.name for field in fields(cls))
+
+
+@dataclass(frozen=True, slots=True)
+class AccountInfo:
+    """Account status, counters and limits."""
+
+    account_status: str
+    reg_date: str
+    account: str
+    dyndns_updates: int = 0
+    dyndns_subdomains: int = 0
+    owndomains: int = 0
+    healthchecks: int = 0
+    healthchecks_updates: int = 0
+    api_updates: int = 0
+    sms_count: int = 0
+    dyndns_domain_limit: int = 0
+    daily_update_limit: int = 0
+    owndomain_limit: int = 0
+    healthcheck_limit: int = 0
+    healthcheck_update_limit: int = 0
+    dyndns_ttl: int = 0
+    api_limit: int = 0
+    sms_limit: int = 0
+    info: str = "unknown"
+    status: str = "unknown"
+
+    @classmethod
+    def from_api(cls, payload: Mapping[str, Any]) -> Self:
+        """Parse the response of get_account_info, raises KeyError if a required field is missing."""
+        account_class = payload["account_class"]
+        return cls(
+            account_status=payload["account_status"],
+            reg_date=payload["reg_date"],
+            account=account_class["class_name"],
+            dyndns_updates=payload.get("dyndns_updates", 0),
+            dyndns_subdomains=payload.get("dyndns_subdomains", 0),
+            owndomains=payload.get("owndomains", 0),
+            healthchecks=payload.get("healthchecks", 0),
+            healthchecks_updates=payload.get("healthchecks_updates", 0),
+            api_updates=payload.get("api_updates", 0),
+            sms_count=payload.get("sms_count", 0),
+            dyndns_domain_limit=account_class.get("dyndns_domain_limit", 0),
+            daily_update_limit=account_class.get("dyndns_update_limit", 0),
+            owndomain_limit=account_class.get("owndomain_limit", 0),
+            healthcheck_limit=account_class.get("healthcheck_limit", 0),
+            healthcheck_update_limit=account_class.get("healthcheck_update_limit", 0),
+            dyndns_ttl=account_class.get("dyndns_ttl", 0),
+            api_limit=account_class.get("api_limit", 0),
+            sms_limit=account_class.get("sms_limit", 0),
+            info=payload.get("info", "unknown"),
+            status=payload.get("status", "unknown"),
+        )
+
+    @property
+    def remaining_updates(self) -> int:
+        """Return the updates left today."""
+        return self.daily_update_limit - self.dyndns_updates
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields by name, as stored and shown in the attributes."""
+        return {name: getattr(self, name) for name in _field_names(AccountInfo)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Restore stored account info."""
+        return cls(**{name: data[name] for name in _field_names(cls) if name in data})
+
+
+@dataclass(frozen=True, slots=True)
+class DomainRecord:
+    """DNS record of a domain, the A record of dual-stack domains carries the AAAA address as well."""
+
+    name: str
+    ip_address: str
+    record_type: str
+    ttl: int
+    failover_policy: int
+    deactivated: bool
+    last_update: str | None
+    ip6_address: str | None = None
+
+    @classmethod
+    def from_api(cls, subdomain: str, record: Mapping[str, Any]) -> Self:
+        """Parse a record of a subdomain in the response of get_domains."""
+        prefix = record.get("praefix", "")
+        return cls(
+            name=f"{prefix}.{subdomain}" if prefix else subdomain,
+            ip_address=record["content"],
+            record_type=record["type"],
+            ttl=int(record["ttl"]),
+            failover_policy=int(record.get("failover_policy") or 0),
+            deactivated=bool(record.get("deactivated")),
+            last_update=record.get("last_update"),
+        )
+
+    @property
+    def ipv4(self) -> str | None:
+        """Return the IPv4 address of the domain."""
+        return self.ip_address if self.record_type != "AAAA" else None
+
+    @property
+    def ipv6(self) -> str | None:
+        """Return the IPv6 address of the domain."""
+        return self.ip_address if self.record_type == "AAAA" else self.ip6_address
+
+    def merge(self, other: DomainRecord) -> DomainRecord:
+        """Combine the A and the AAAA record of a dual-stack domain, other records keep the first."""
+        if self.record_type == "A" and other.record_type == "AAAA":
+            return replace(self, ip6_address=other.ip_address)
+        if self.record_type == "AAAA" and other.record_type == "A":
+            return replace(other, ip6_address=self.ip_address)
+        return self
+
+    def attributes(self) -> dict[str, Any]:
+        """Return the state attributes of the domain sensor."""
+        attributes = {
+            CONF_DOMAIN: self.name,
+            CONF_IP_ADDRESS: self.ip_address,
+            CONF_TYPE: self.record_type,
+            CONF_TTL: self.ttl,
+            "failover_policy": self.failover_policy,
+            "deactivated": self.deactivated,
+            "last_update": self.last_update,
+        }
+        if self.ip6_address is not None:
+            attributes[CONF_IP6_ADDRESS] = self.ip6_address
+        return attributes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields by name, as stored."""
+        return {name: getattr(self, name) for name in _field_names(DomainRecord)}
+
+
+@dataclass(frozen=True, slots=True)
+class DomainMetadata:
+    """Settings and counters of a subdomain, shared by its prefixed records."""
+
+    updates: int | None = None
+    wildcard: int | None = None
+    domain_update_hash: str | None = None
+    ipv6prefix: str | None = None
+    dualstack: str | None = None
+    deactivated: int | None = None
+
+    @classmethod
+    def from_api(cls, values: Mapping[str, Any]) -> Self:
+        """Parse a subdomain in the response of get_domains."""
+        return cls(**{name: values.get(name) for name in _field_names(cls)})
+
+    def as_dict(self, *, compact: bool = False) -> dict[str, Any]:
+        """Return the fields by name, compact leaves out the fields that are not set."""
+        data = {name: getattr(self, name) for name in _field_names(DomainMetadata)}
+        return {name: value for name, value in data.items() if value is not None} if compact else data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Restore stored metadata."""
+        return cls(**{name: data.get(name) for name in _field_names(cls)})
+
+
+@dataclass(frozen=True, slots=True)
+class DomainList:
+    """Records indexed by domain name and metadata indexed by subdomain.
+
+    Instances are shared by the coordinators of an API key and their entities, so the
+    mappings must not be modified. Changes create a new list.
+    """
+
+    records: Mapping[str, DomainRecord]
+    metadata: Mapping[str, DomainMetadata]
+
+    @classmethod
+    def empty(cls) -> Self:
+        """Return a list without domains."""
+        return cls({}, {})
+
+    @classmethod
+    def from_api(cls, payload: Mapping[str, Any]) -> Self:
+        """Parse the response of get_domains."""
+        records: dict[str, DomainRecord] = {}
+        metadata: dict[str, DomainMetadata] = {}
+        for subdomain, values in (payload.get("subdomains") or {}).items():
+            metadata[subdomain] = DomainMetadata.from_api(values)
+            for raw in values.get("records", []):
+                record = DomainRecord.from_api(subdomain, raw)
+                existing = records.get(record.name)
+                records[record.name] = record if existing is None else existing.merge(record)
+        return cls(records, metadata)
+
+    def metadata_for(self, name: str) -> DomainMetadata | None:
+        """Return the metadata of a domain, prefixed records (www.example.ipv64.net) share it with their subdomain."""
+        if (metadata := self.metadata.get(name)) is not None:
+            return metadata
+        return self.metadata.get(name.split(".", 1)[-1])
+
+    def with_record(self, record: DomainRecord) -> DomainList:
+        """Return the list with `record` added or replaced."""
+        return DomainList({**self.records, record.name: record}, self.metadata)
+
+    def as_dict(self, *, compact: bool = False) -> dict[str, Any]:
+        """Return the list as stored, compact lists the record fields once and leaves out unset metadata."""
+        metadata = {name: value.as_dict(compact=compact) for name, value in self.metadata.items()}
+        if compact:
+            names = _field_names(DomainRecord)
+            rows = [[getattr(record, name) for name in names] for record in self.records.values()]
+            return {"fields": list(names), "rows": rows, "metadata": metadata}
+        return {"records": [record.as_dict() for record in self.records.values()], "metadata": metadata}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Restore a stored list in either format."""
+        if "rows" in data:
+            raw_records = [dict(zip(data["fields"], row, strict=True)) for row in data["rows"]]
+        else:
+            raw_records = data["records"]
+        records = {raw["name"]: DomainRecord(**raw) for raw in raw_records}
+        return cls(records, {name: DomainMetadata.from_dict(value) for name, value in data["metadata"].items()})
+
+
+@dataclass(frozen=True, slots=True)
+class Healthcheck:
+    """A healthcheck of the account and its statistics, if they were fetched."""
+
+    token: str
+    name: str
+    status: str
+    last_ping: str | None
+    add_time: str | None
+    alarm_count: int = 0
+    alarm_unit: int = 0
+    grace_count: int = 0
+    grace_unit: int = 0
+    statistics: Mapping[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(cls, token: str, values: Mapping[str, Any]) -> Self:
+        """Parse a healthcheck in the response of get_healthchecks."""
+        return cls(
+            token=values.get("healthtoken") or token,
+            name=values.get("name") or token,
+            status=HEALTHCHECK_STATES.get(int(values.get("healthstatus") or 0), "unknown"),
+            last_ping=values.get("last_ping"),
+            add_time=values.get("add_time"),
+            alarm_count=int(values.get("alarm_count") or 0),
+            alarm_unit=int(values.get("alarm_unit") or 0),
+            grace_count=int(values.get("grace_count") or 0),
+            grace_unit=int(values.get("grace_unit") or 0),
+        )
+
+    @staticmethod
+    def list_from_api(payload: Mapping[str, Any]) -> dict[str, Healthcheck]:
+        """Parse the response of get_healthchecks, which lists the healthchecks by token below "domain"."""
+        checks = (Healthcheck.from_api(token, values) for token, values in (payload.get("domain") or {}).items())
+        return {check.token: check for check in checks}
+
+    @staticmethod
+    def statistics_from_api(payload: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+        """Parse the response of get_healthcheck_statistics into the plain values by token."""
+        statistics = payload.get("statistics") or payload
+        return {
+            token: {key: value for key, value in values.items() if isinstance(value, int | float | str)}
+            for token, values in statistics.items()
+            if isinstance(values, Mapping)
+        }
+
+    def attributes(self) -> dict[str, Any]:
+        """Return the state attributes of the healthcheck sensor."""
+        return {
+            "name": self.name,
+            "last_ping": self.last_ping,
+            "add_time": self.add_time,
+            "alarm_count": self.alarm_count,
+            "alarm_unit": self.alarm_unit,
+            "grace_count": self.grace_count,
+            "grace_unit": self.grace_unit,
+            **self.statistics,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class HealthcheckSample:
+    """State of a healthcheck seen by a refresh."""
+
+    time: str
+    status: str
+    last_ping: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields by name."""
+        return {name: getattr(self, name) for name in _field_names(HealthcheckSample)}
@@ -0,0 +1,183 @@
+"""Durable queue of the DynDNS updates that still have to be delivered."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import OUTBOX_RETRY_DELAY, OUTBOX_RETRY_MAX_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PendingUpdate:
+    """An update of the addresses of a domain, `None` lets IPv64.net use the address of the request."""
+
+    def __init__(
+        self,
+        domain: str,
+        ip: str | None,
+        ip6: str | None,
+        *,
+        queued_at: float | None = None,
+        attempts: int = 0,
+        next_attempt: float = 0.0,
+        last_error: str | None = None,
+    ) -> None:
+        """Initialize the update, times are UNIX timestamps so they survive a restart."""
+        self.domain = domain
+        self.ip = ip
+        self.ip6 = ip6
+        self.queued_at = queued_at if queued_at is not None else time.time()
+        self.attempts = attempts
+        self.next_attempt = next_attempt
+        self.last_error = last_error
+
+    @property
+    def due(self) -> bool:
+        """Return True if the update may be sent now."""
+        return self.next_attempt <= time.time()
+
+    def supersedes(self, other: PendingUpdate) -> bool:
+        """Return True if this update sets other addresses than `other`."""
+        return (self.ip, self.ip6) != (other.ip, other.ip6)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the update as stored."""
+        return {
+            "domain": self.domain,
+            "ip": self.ip,
+            "ip6": self.ip6,
+            "queued_at": self.queued_at,
+            "attempts": self.attempts,
+            "next_attempt": self.next_attempt,
+            "last_error": self.last_error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PendingUpdate:
+        """Restore a stored update."""
+        return cls(
+            data["domain"],
+            data.get("ip"),
+            data.get("ip6"),
+            queued_at=data.get("queued_at"),
+            attempts=data.get("attempts", 0),
+            next_attempt=data.get("next_attempt", 0.0),
+            last_error=data.get("last_error"),
+        )
+
+
+class UpdateOutbox:
+    """Keep updates queued until IPv64.net accepted them.
+
+    An update that fails stays queued, also across restarts, and is sent again with
+    exponential backoff. A newer update of the same domain supersedes the queued one,
+    so only the latest addresses are sent and no update is spent on outdated ones.
+    The queue is only written once an update failed, updates delivered at the first
+    attempt cause no write at all.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the outbox."""
+        self._store: Store[dict[str, Any]] = Store(hass, version=1, key=key)
+        self._pending: dict[str, PendingUpdate] = {}
+        # True while the stored queue is not empty and has to follow the changes
+        self._persisted = False
+        self.queued = 0
+        self.superseded = 0
+        self.delivered = 0
+        self.failed = 0
+        self.discarded = 0
+
+    async def async_load(self) -> None:
+        """Load the updates left over from before the restart."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict):
+            return
+        for data in stored.get("pending", []):
+            try:
+                update = PendingUpdate.from_dict(data)
+            except (KeyError, TypeError) as err:
+                _LOGGER.warning("Ignoring invalid queued update %s: %s", data, err)
+                continue
+            self._pending[update.domain] = update
+        self._persisted = bool(self._pending)
+        if self._pending:
+            _LOGGER.info("Restored %d queued update(s): %s", len(self._pending), ", ".join(self._pending))
+
+    async def _async_save(self, *, force: bool = False) -> None:
+        if not (force or self._persisted):
+            return
+        await self._store.async_save({"pending": [update.as_dict() for update in self._pending.values()]})
+        self._persisted = bool(self._pending)
+
+    def get(self, domain: str) -> PendingUpdate | None:
+        """Return the queued update of a domain."""
+        return self._pending.get(domain)
+
+    @property
+    def next_attempt(self) -> float | None:
+        """Return the time the next queued update is due."""
+        return min((update.next_attempt for update in self._pending.values()), default=None)
+
+    async def async_enqueue(self, domain: str, ip: str | None, ip6: str | None) -> PendingUpdate:
+        """Queue an update, returns the queued update of the domain.
+
+        An update with the same addresses keeps the queued one and its backoff, other
+        addresses replace it and may be sent right away.
+        """
+        update = PendingUpdate(domain, ip, ip6)
+        if (queued := self._pending.get(domain)) is not None:
+            if not update.supersedes(queued):
+                return queued
+            self.superseded += 1
+            _LOGGER.debug("Update of %s to %s/%s supersedes the queued one to %s/%s", domain, ip, ip6, queued.ip, queued.ip6)
+        self._pending[domain] = update
+        self.queued += 1
+        await self._async_save()
+        return update
+
+    async def async_delivered(self, domain: str) -> None:
+        """Remove an update accepted by IPv64.net."""
+        if self._pending.pop(domain, None) is not None:
+            self.delivered += 1
+            await self._async_save()
+
+    async def async_failed(self, domain: str, error: str, retry_at: float | None = None) -> PendingUpdate | None:
+        """Schedule the next attempt of a failed update, by default with exponential backoff."""
+        if (update := self._pending.get(domain)) is None:
+            return None
+        self.failed += 1
+        update.attempts += 1
+        update.last_error = error
+        if retry_at is None:
+            # Jitter, so entries failing together do not retry together
+            delay = min(OUTBOX_RETRY_MAX_DELAY, OUTBOX_RETRY_DELAY * 2 ** (update.attempts - 1))
+            retry_at = time.time() + random.uniform(delay / 2, delay)
+        update.next_attempt = retry_at
+        await self._async_save(force=True)
+        return update
+
+    async def async_discard(self, domain: str, reason: str) -> None:
+        """Remove an update that is no longer needed or can never succeed."""
+        if self._pending.pop(domain, None) is not None:
+            self.discarded += 1
+            _LOGGER.debug("Discarding the queued update of %s: %s", domain, reason)
+            await self._async_save()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queued updates and the statistics."""
+        return {
+            "pending": [update.as_dict() for update in self._pending.values()],
+            "queued": self.queued,
+            "superseded": self.superseded,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,295 @@
+"""Sender of healthcheck pings, keeping the pings that could not be delivered queued."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import random
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    HEALTHCHECK_PING_URL,
+    OUTBOX_RETRY_DELAY,
+    OUTBOX_RETRY_MAX_DELAY,
+    PING_COALESCE_WINDOW,
+    PING_CONCURRENCY,
+    PING_DEADLINE,
+    PING_MAX_AGE,
+    TIMEOUT,
+)
+from .retry import async_retry, is_retryable
+from .session import ConnectionStats, create_session
+
+_LOGGER = logging.getLogger(__name__)
+
+PING_SENT = "sent"
+PING_QUEUED = "queued"
+PING_FAILED = "failed"
+
+
+def _short(token: str) -> str:
+    """Return the start of a token, enough to tell healthchecks apart in the log."""
+    return f"{token[:4]}…"
+
+
+class QueuedPing:
+    """A ping that still has to be delivered, times are UNIX timestamps so they survive a restart."""
+
+    def __init__(
+        self,
+        token: str,
+        action: str,
+        *,
+        queued_at: float | None = None,
+        attempts: int = 0,
+        next_attempt: float = 0.0,
+        last_error: str | None = None,
+    ) -> None:
+        """Initialize the ping."""
+        self.token = token
+        self.action = action
+        self.queued_at = queued_at if queued_at is not None else time.time()
+        self.attempts = attempts
+        self.next_attempt = next_attempt
+        self.last_error = last_error
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the ping as stored."""
+        return {
+            "token": self.token,
+            "action": self.action,
+            "queued_at": self.queued_at,
+            "attempts": self.attempts,
+            "next_attempt": self.next_attempt,
+            "last_error": self.last_error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> QueuedPing:
+        """Restore a stored ping."""
+        return cls(
+            data["token"],
+            data["action"],
+            queued_at=data.get("queued_at"),
+            attempts=data.get("attempts", 0),
+            next_attempt=data.get("next_attempt", 0.0),
+            last_error=data.get("last_error"),
+        )
+
+
+class HealthcheckPinger:
+    """Send healthcheck pings concurrently over a pooled session.
+
+    At most PING_CONCURRENCY pings are sent at once. A ping repeating one of the same
+    healthcheck and action started within PING_COALESCE_WINDOW seconds shares its
+    result instead of being sent again. Pings failing with a network or server error
+    are queued, also across restarts, and sent again with backoff. The pings of a
+    healthcheck are delivered in the order they were requested, so a new ping waits
+    behind the queued ones. Queued pings older than PING_MAX_AGE are dropped, a late
+    ping would report a wrong state.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the pinger."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, version=1, key=f"{DOMAIN}_pings")
+        self.connection_stats = ConnectionStats()
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore = asyncio.Semaphore(PING_CONCURRENCY)
+        # Pings started within the coalesce window by healthcheck and action
+        self._recent: dict[tuple[str, str], tuple[float, asyncio.Task[str]]] = {}
+        self._queue: list[QueuedPing] = []
+        # True while the stored queue is not empty and has to follow the changes
+        self._persisted = False
+        self._replaying = False
+        self._unsub_replay: CALLBACK_TYPE | None = None
+        self._unsub_close: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop
+        )
+        self.sent = 0
+        self.coalesced = 0
+        self.queued = 0
+        self.replayed = 0
+        self.failed = 0
+        self.expired = 0
+
+    async def async_load(self) -> None:
+        """Load the pings left over from before the restart and send them when due."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict):
+            return
+        for data in stored.get("pending", []):
+            try:
+                self._queue.append(QueuedPing.from_dict(data))
+            except (KeyError, TypeError) as err:
+                _LOGGER.warning("Ignoring invalid queued ping: %s", err)
+        self._persisted = bool(self._queue)
+        if self._queue:
+            _LOGGER.info("Restored %d queued healthcheck ping(s)", len(self._queue))
+            self._async_schedule_replay()
+
+    async def _async_close_on_stop(self, event: Event) -> None:
+        """Close the HTTP session when Home Assistant stops."""
+        self._unsub_close = None
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Stop replaying and close the HTTP session, the queue is already stored."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        if self._unsub_replay is not None:
+            self._unsub_replay()
+            self._unsub_replay = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _async_save(self) -> None:
+        if not (self._queue or self._persisted):
+            return
+        await self._store.async_save({"pending": [ping.as_dict() for ping in self._queue]})
+        self._persisted = bool(self._queue)
+
+    async def async_ping(self, tokens: list[str], action: str) -> dict[str, str]:
+        """Ping the healthchecks of `tokens`, returns the result by token: sent, queued or failed."""
+        unique = list(dict.fromkeys(tokens))
+        results = await asyncio.gather(*(self._async_ping_coalesced(token, action) for token in unique))
+        return dict(zip(unique, results, strict=True))
+
+    async def _async_ping_coalesced(self, token: str, action: str) -> str:
+        """Ping a healthcheck unless the same ping was started within the coalesce window."""
+        now = time.monotonic()
+        self._recent = {key: recent for key, recent in self._recent.items() if now - recent[0] < PING_COALESCE_WINDOW}
+        if (recent := self._recent.get((token, action))) is not None:
+            self.coalesced += 1
+            _LOGGER.debug("Ping %s of %s coalesced with the one sent %.1f seconds ago", action, _short(token), now - recent[0])
+            return await asyncio.shield(recent[1])
+        task = self.hass.async_create_task(self._async_send(token, action), f"{DOMAIN} ping healthcheck")
+        self._recent[(token, action)] = (now, task)
+        return await asyncio.shield(task)
+
+    async def _async_send(self, token: str, action: str) -> str:
+        """Send a ping, queueing it behind the queued pings of the healthcheck or if it fails."""
+        if any(ping.token == token for ping in self._queue):
+            await self._async_enqueue(QueuedPing(token, action))
+            return PING_QUEUED
+        try:
+            await self._async_deliver(token, action)
+        except (TimeoutError, aiohttp.ClientError) as err:
+            if not is_retryable(err):
+                self.failed += 1
+                _LOGGER.error("Ping %s of healthcheck %s was rejected: %s", action, _short(token), err)
+                return PING_FAILED
+            _LOGGER.warning("Failed to ping healthcheck %s, queueing the ping: %s", _short(token), err)
+            await self._async_enqueue(QueuedPing(token, action, attempts=1, last_error=str(err)))
+            return PING_QUEUED
+        self.sent += 1
+        return PING_SENT
+
+    async def _async_deliver(self, token: str, action: str) -> None:
+        """Send a ping to IPv64.net, raising the error if it failed."""
+        if self._session is None:
+            self._session = create_session(self.connection_stats)
+        session = self._session
+        params = {"token": token}
+        if action != "success":
+            params["action"] = action
+
+        async def _ping() -> None:
+            async with self._semaphore, session.get(HEALTHCHECK_PING_URL, params=params, timeout=TIMEOUT) as resp:
+                resp.raise_for_status()
+
+        await async_retry(_ping, f"ping healthcheck {_short(token)}", deadline=PING_DEADLINE)
+
+    async def _async_enqueue(self, ping: QueuedPing) -> None:
+        if ping.attempts:
+            ping.next_attempt = time.time() + self._backoff(ping.attempts)
+        self._queue.append(ping)
+        self.queued += 1
+        await self._async_save()
+        self._async_schedule_replay()
+
+    @staticmethod
+    def _backoff(attempts: int) -> float:
+        # Jitter, so healthchecks failing together do not retry together
+        delay = min(OUTBOX_RETRY_MAX_DELAY, OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    def _heads(self) -> dict[str, QueuedPing]:
+        """Return the oldest queued ping of each healthcheck, the next one to send."""
+        heads: dict[str, QueuedPing] = {}
+        for ping in self._queue:
+            heads.setdefault(ping.token, ping)
+        return heads
+
+    @callback
+    def _async_schedule_replay(self) -> None:
+        """Replay the queue when its next ping is due."""
+        if self._replaying:
+            # The running replay schedules the next one when it is done
+            return
+        if self._unsub_replay is not None:
+            self._unsub_replay()
+            self._unsub_replay = None
+        if not (heads := self._heads()):
+            return
+        next_attempt = min(ping.next_attempt for ping in heads.values())
+        self._unsub_replay = async_call_later(self.hass, max(0.0, next_attempt - time.time()), self._async_replay)
+
+    async def _async_replay(self, _now: datetime) -> None:
+        """Send the due pings, the healthchecks concurrently and the pings of each in order."""
+        self._unsub_replay = None
+        self._replaying = True
+        try:
+            expired = [ping for ping in self._queue if time.time() - ping.queued_at > PING_MAX_AGE]
+            for ping in expired:
+                self._queue.remove(ping)
+                _LOGGER.warning("Dropping the ping %s of healthcheck %s, it is too old", ping.action, _short(ping.token))
+            self.expired += len(expired)
+            await asyncio.gather(*(self._async_replay_healthcheck(token) for token in self._heads()))
+            await self._async_save()
+        finally:
+            self._replaying = False
+            self._async_schedule_replay()
+
+    async def _async_replay_healthcheck(self, token: str) -> None:
+        """Send the queued pings of a healthcheck until one fails or is not due."""
+        while (ping := self._heads().get(token)) is not None and ping.next_attempt <= time.time():
+            try:
+                await self._async_deliver(ping.token, ping.action)
+            except (TimeoutError, aiohttp.ClientError) as err:
+                if is_retryable(err):
+                    ping.attempts += 1
+                    ping.last_error = str(err)
+                    ping.next_attempt = time.time() + self._backoff(ping.attempts)
+                    _LOGGER.debug("Queued ping of healthcheck %s failed again: %s", _short(token), err)
+                    return
+                self.failed += 1
+                _LOGGER.error("Queued ping %s of healthcheck %s was rejected: %s", ping.action, _short(token), err)
+            else:
+                self.replayed += 1
+            self._queue.remove(ping)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics and the queued pings without their tokens."""
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "queued": self.queued,
+            "replayed": self.replayed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "pending": [{**ping.as_dict(), "token": _short(ping.token)} for ping in self._queue],
+            "connections": self.connection_stats.as_dict(),
+        }
@@ -0,0 +1,249 @@
+"""Public IP resolver racing several providers."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import Counter
+import ipaddress
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from .const import IP_HEDGE_DELAY, IP_PROVIDER_TIMEOUT
+from .dnsclient import DNS_CLASSES, DNS_PORT, DNS_TYPES, DNSError, async_query
+from .metrics import EndpointMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Record types answering with the address of the client
+IP_DNS_TYPES = ("A", "AAAA", "TXT")
+
+
+class IPResolveError(Exception):
+    """Error to indicate the public IP could not be determined."""
+
+
+def _parse_ip(value: str) -> str:
+    """Return the normalized IP address in `value` or raise IPResolveError."""
+    try:
+        return str(ipaddress.ip_address(value.strip().strip('"')))
+    except ValueError as err:
+        raise IPResolveError(f"Invalid IP address {value!r}") from err
+
+
+class ProviderStats:
+    """Latency and success counters of a provider."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.wins = 0
+        self.total_latency = 0.0
+        self.last_latency: float | None = None
+        self.last_error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics, latencies in milliseconds."""
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "average_latency": round(self.total_latency / self.successes * 1000, 1) if self.successes else None,
+            "last_latency": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+class IPProvider(ABC):
+    """Source of the public IP address.
+
+    Every lookup is recorded in the provider statistics and, if given, in the request
+    metrics of the public IP check, whether it went out over HTTP or DNS.
+    """
+
+    def __init__(self, name: str, metrics: EndpointMetrics | None = None) -> None:
+        """Initialize the provider."""
+        self.name = name
+        self.stats = ProviderStats()
+        self.metrics = metrics
+
+    @abstractmethod
+    async def _async_resolve(self) -> str:
+        """Return the public IP address."""
+
+    async def async_resolve(self) -> str:
+        """Return the public IP address and record the latency and outcome."""
+        self.stats.requests += 1
+        if self.metrics is not None:
+            self.metrics.requests += 1
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(IP_PROVIDER_TIMEOUT):
+                address = await self._async_resolve()
+        except asyncio.CancelledError:
+            self.stats.cancelled += 1
+            raise
+        except Exception as err:
+            self.stats.failures += 1
+            self.stats.last_error = str(err) or type(err).__name__
+            if self.metrics is not None:
+                self.metrics.errors += 1
+            raise
+        self.stats.successes += 1
+        self.stats.last_latency = time.monotonic() - started
+        self.stats.total_latency += self.stats.last_latency
+        if self.metrics is not None:
+            self.metrics.latency.add(self.stats.last_latency * 1000)
+        return address
+
+
+class HTTPProvider(IPProvider):
+    """Provider returning the IP address as the body of an HTTP response."""
+
+    def __init__(self, name: str, session: aiohttp.ClientSession, url: str, metrics: EndpointMetrics | None = None) -> None:
+        """Initialize the provider."""
+        super().__init__(name, metrics)
+        self._session = session
+        self._url = url
+
+    async def _async_resolve(self) -> str:
+        async with self._session.get(self._url) as resp:
+            if self.metrics is not None:
+                self.metrics.statuses[resp.status] = self.metrics.statuses.get(resp.status, 0) + 1
+            resp.raise_for_status()
+            return _parse_ip(await resp.text())
+
+
+class DNSProvider(IPProvider):
+    """Provider asking a DNS server that answers with the address of the client over UDP.
+
+    One datagram each way makes this cheaper than an HTTPS request, e.g.
+    myip.opendns.com (A) at resolver1.opendns.com or whoami.cloudflare (TXT, CH) at 1.1.1.1.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        server: str,
+        port: int,
+        query: str,
+        *,
+        qtype: int = 1,
+        qclass: int = 1,
+        metrics: EndpointMetrics | None = None,
+    ) -> None:
+        """Initialize the provider."""
+        super().__init__(name, metrics)
+        self._server = server
+        self._port = port
+        self._query = query
+        self._qtype = qtype
+        self._qclass = qclass
+
+    async def _async_resolve(self) -> str:
+        try:
+            records = await async_query(self._server, self._port, self._query, self._qtype, self._qclass)
+        except DNSError as err:
+            raise IPResolveError(str(err)) from err
+        for rtype, value, _ttl in records:
+            if rtype == self._qtype:
+                return _parse_ip(value)
+        raise IPResolveError("DNS response contains no address")
+
+
+def create_provider(spec: str, session: aiohttp.ClientSession, metrics: EndpointMetrics | None = None) -> IPProvider:
+    """Create a provider from its URL, recording its lookups in `metrics`.
+
+    HTTP(S) URLs return the address as the response body. DNS providers are written as
+    dns://server[:port]/name with optional type (A, AAAA, TXT) and class (IN, CH) parameters.
+    """
+    url = URL(spec.strip())
+    if url.scheme in ("http", "https"):
+        return HTTPProvider(str(url), session, str(url), metrics)
+    if url.scheme == "dns" and url.host and url.path.strip("/"):
+        qtype = url.query.get("type", "A").upper()
+        qclass = url.query.get("class", "IN").upper()
+        if qtype not in IP_DNS_TYPES or qclass not in DNS_CLASSES:
+            raise ValueError(f"Unsupported DNS query in {spec}")
+        return DNSProvider(
+            str(url),
+            url.host,
+            url.port or DNS_PORT,
+            url.path.strip("/"),
+            qtype=DNS_TYPES[qtype],
+            qclass=DNS_CLASSES[qclass],
+            metrics=metrics,
+        )
+    raise ValueError(f"Unsupported IP provider {spec}")
+
+
+class PublicIPResolver:
+    """Resolve the public IP by racing the configured providers.
+
+    The providers are started one after another, each IP_HEDGE_DELAY seconds later or as
+    soon as the previous one failed. The first address confirmed by `agreement` providers
+    wins and the remaining requests are cancelled.
+    """
+
+    def __init__(self, providers: list[IPProvider], agreement: int = 1, version: int | None = None) -> None:
+        """Initialize the resolver, `version` restricts the answers to IPv4 or IPv6."""
+        self.providers = providers
+        self.agreement = max(1, min(agreement, len(providers)))
+        self.version = version
+
+    async def async_resolve(self) -> str:
+        """Return the public IP address or raise IPResolveError."""
+        pending: dict[asyncio.Task[str], IPProvider] = {}
+        votes: Counter[str] = Counter()
+        errors: list[str] = []
+        waiting = list(self.providers)
+        # Start as many providers as have to agree, then hedge with the others
+        start = self.agreement
+        try:
+            while waiting or pending:
+                for provider in waiting[:start]:
+                    pending[asyncio.create_task(provider.async_resolve())] = provider
+                del waiting[:start]
+                start = 1
+                done, _ = await asyncio.wait(
+                    pending, timeout=IP_HEDGE_DELAY if waiting else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider = pending.pop(task)
+                    if (err := task.exception()) is not None:
+                        errors.append(f"{provider.name}: {err}")
+                        continue
+                    address = task.result()
+                    if self.version is not None and ipaddress.ip_address(address).version != self.version:
+                        errors.append(f"{provider.name}: {address} is not an IPv{self.version} address")
+                        continue
+                    votes[address] += 1
+                    if votes[address] >= self.agreement:
+                        provider.stats.wins += 1
+                        _LOGGER.debug("Public IP %s resolved by %s", address, provider.name)
+                        return address
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled requests so their sockets are closed before returning
+            await asyncio.gather(*pending, return_exceptions=True)
+        if votes:
+            raise IPResolveError(f"IP providers disagree on the public IP: {dict(votes)}")
+        raise IPResolveError(f"All IP providers failed: {'; '.join(errors)}")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics of all providers."""
+        return {
+            "version": self.version,
+            "agreement": self.agreement,
+            "providers": {p.name: p.stats.as_dict() for p in self.providers},
+        }
@@ -0,0 +1,92 @@
+"""Retry handling for requests to IPv64.net."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import time
+
+import aiohttp
+
+from .const import RETRY_ATTEMPTS, RETRY_DEADLINE, RETRY_DELAY, RETRY_MAX_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Status codes worth another attempt, every other client error fails at once
+RETRYABLE_STATUSES: frozenset[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+# Attempt of the running request, 0 outside of async_retry, read by the request metrics
+retry_attempt: ContextVar[int] = ContextVar("ipv64_retry_attempt", default=0)
+
+
+def retry_after(error: aiohttp.ClientResponseError) -> float | None:
+    """Return the delay requested by a Retry-After header in seconds."""
+    if error.status not in (429, 503) or not error.headers:
+        return None
+    value = error.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (until - datetime.now(until.tzinfo)).total_seconds())
+
+
+def is_retryable(error: Exception, retryable_statuses: frozenset[int] = RETRYABLE_STATUSES) -> bool:
+    """Return True if a request that failed with `error` may succeed when repeated."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in retryable_statuses
+    return isinstance(error, (TimeoutError, aiohttp.ClientError))
+
+
+async def async_retry[T](
+    request: Callable[[], Awaitable[T]],
+    description: str,
+    *,
+    attempts: int = RETRY_ATTEMPTS,
+    deadline: float = RETRY_DEADLINE,
+    retryable_statuses: frozenset[int] = RETRYABLE_STATUSES,
+) -> T:
+    """Run `request` until it succeeds, using exponential backoff with full jitter.
+
+    The deadline covers all attempts and delays. Non-retryable errors, the last failed
+    attempt and errors after the deadline are raised to the caller.
+    """
+    expires = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        attempt += 1
+        token = retry_attempt.set(attempt)
+        try:
+            async with asyncio.timeout(max(0.0, expires - time.monotonic())):
+                return await request()
+        except Exception as err:
+            if attempt >= attempts or not is_retryable(err, retryable_statuses):
+                raise
+            delay = None
+            if isinstance(err, aiohttp.ClientResponseError):
+                delay = retry_after(err)
+            if delay is None:
+                delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_DELAY * 2 ** (attempt - 1)))
+            if time.monotonic() + delay >= expires:
+                _LOGGER.debug("Not retrying %s, the deadline of %s seconds would be exceeded", description, deadline)
+                raise
+            _LOGGER.warning(
+                "Failed to %s, retrying in %.1f seconds (%d/%d): %s",
+                description,
+                delay,
+                attempt,
+                attempts,
+                err,
+            )
+            await asyncio.sleep(delay)
+        finally:
+            retry_attempt.reset(token)
@@ -0,0 +1,273 @@
+"""Shared polling scheduler for config entries using the same API key."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_BUDGET_RESERVE,
+    ADAPTIVE_FAST_PERIOD,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    ADAPTIVE_STABLE_PERIOD,
+    DAILY_RESET_TIMEZONE,
+    DATA_RATE_LIMITERS,
+    DATA_SCHEDULERS,
+    DOMAIN,
+    POLL_COALESCE_WINDOW,
+    POLL_STAGGER,
+    SHARED_DATA_MAX_AGE,
+)
+from .limiter import TokenBucket, async_get_rate_limiter
+from .session import ResponseCache
+
+if TYPE_CHECKING:
+    from .coordinator import IPv64DataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _SharedFetchCancelledError(Exception):
+    """The caller running a shared request was cancelled, the waiting callers retry it."""
+
+
+def next_daily_reset(now: datetime) -> datetime:
+    """Return the time the daily update counter of IPv64.net is reset next."""
+    local = now.astimezone(dt_util.get_time_zone(DAILY_RESET_TIMEZONE))
+    return (local + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def plan_poll_interval(
+    base: timedelta,
+    now: datetime,
+    *,
+    remaining_updates: int | None,
+    cost_per_poll: float,
+    since_change: float | None,
+    stable_for: float,
+    failed: bool = False,
+) -> dict[str, Any]:
+    """Pick the next poll interval within the remaining daily update budget.
+
+    `cost_per_poll` is the expected number of updates a poll sends, `since_change` the
+    seconds since the last IP change (None if none was seen) and `stable_for` the
+    seconds the IP has not changed. The interval drops to the minimum after a failure
+    or a recent change and doubles for every ADAPTIVE_STABLE_PERIOD hours without one,
+    but never gets so short that the projected updates until the daily reset exceed
+    the remaining budget.
+    """
+    minimum = timedelta(minutes=ADAPTIVE_MIN_INTERVAL)
+    interval, reason = base, "default"
+    if failed:
+        interval, reason = minimum, "failure"
+    elif since_change is not None and since_change < ADAPTIVE_FAST_PERIOD * 60:
+        interval, reason = minimum, "recent_change"
+    elif steps := int(stable_for // (ADAPTIVE_STABLE_PERIOD * 3600)):
+        interval = min(base * 2 ** min(steps, 8), max(base, timedelta(minutes=ADAPTIVE_MAX_INTERVAL)))
+        reason = "stable" if interval > base else reason
+
+    until_reset = next_daily_reset(now) - now
+    if remaining_updates is not None and cost_per_poll > 0:
+        usable = remaining_updates - ADAPTIVE_BUDGET_RESERVE
+        # Without usable updates, wait for the reset
+        budget_interval = until_reset * cost_per_poll / usable if usable > 0 else until_reset
+        if budget_interval > interval:
+            interval, reason = budget_interval, "budget"
+
+    return {
+        "interval": round(interval.total_seconds() / 60, 1),
+        "reason": reason,
+        "minutes_until_reset": round(until_reset.total_seconds() / 60),
+        "projected_updates": round(until_reset / interval * cost_per_poll, 1),
+        "remaining_updates": remaining_updates,
+        "cost_per_poll": round(cost_per_poll, 2),
+    }
+
+
+class AccountScheduler:
+    """Poll all config entries of one API key and share their account requests.
+
+    Entries that are due within the coalesce window are refreshed in the same run,
+    one after another with a short stagger, so the account info and the domain list
+    are fetched once for all of them.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_key: str) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.api_key = api_key
+        self.limiter: TokenBucket = async_get_rate_limiter(hass, api_key)
+        # Conditional requests and fingerprints of the shared account requests
+        self.responses = ResponseCache()
+        self._coordinators: list[IPv64DataUpdateCoordinator] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._poll_task: asyncio.Task[None] | None = None
+        self._shared: dict[str, tuple[float, Any]] = {}
+        self._pending: dict[str, asyncio.Future[Any]] = {}
+        self.shared_fetches = 0
+        self.shared_hits = 0
+
+    @property
+    def coordinators(self) -> list[IPv64DataUpdateCoordinator]:
+        """Return the coordinators polled by this scheduler."""
+        return list(self._coordinators)
+
+    @callback
+    def async_register(self, coordinator: IPv64DataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Poll a coordinator with this scheduler, returns a callback to stop it."""
+        self._coordinators.append(coordinator)
+        self._async_schedule()
+
+        @callback
+        def _unregister() -> None:
+            self._coordinators.remove(coordinator)
+            if self._coordinators:
+                self._async_schedule()
+                return
+            self._async_cancel()
+            self._shared.clear()
+            # The next entry of the API key starts with a new scheduler and rate limiter
+            data = self.hass.data.get(DOMAIN, {})
+            if data.get(DATA_SCHEDULERS, {}).get(self.api_key) is self:
+                del data[DATA_SCHEDULERS][self.api_key]
+            if data.get(DATA_RATE_LIMITERS, {}).get(self.api_key) is self.limiter:
+                del data[DATA_RATE_LIMITERS][self.api_key]
+
+        return _unregister
+
+    async def async_fetch_shared[T](self, name: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `fetch`, shared by all entries of the API key.
+
+        A result younger than SHARED_DATA_MAX_AGE is reused and concurrent callers wait
+        for the same request. Failed requests are not cached. If the caller running the
+        request is cancelled, one of the waiting callers runs it again.
+        """
+        while True:
+            if (shared := self._shared.get(name)) and time.monotonic() - shared[0] < SHARED_DATA_MAX_AGE:
+                self.shared_hits += 1
+                _LOGGER.debug("Using shared %s from %.1f seconds ago", name, time.monotonic() - shared[0])
+                return shared[1]
+            if (pending := self._pending.get(name)) is None:
+                break
+            try:
+                result = await asyncio.shield(pending)
+            except _SharedFetchCancelledError:
+                continue
+            self.shared_hits += 1
+            return result
+
+        future: asyncio.Future[T] = self.hass.loop.create_future()
+        self._pending[name] = future
+        self.shared_fetches += 1
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            # Cancelling the future would cancel the waiting callers as well
+            future.set_exception(_SharedFetchCancelledError())
+            future.exception()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Retrieve the exception so it is not reported as never retrieved
+            future.exception()
+            raise
+        else:
+            self._shared[name] = (time.monotonic(), result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._pending[name]
+
+    @callback
+    def async_invalidate(self) -> None:
+        """Discard the shared results, e.g. after a domain was added or deleted."""
+        self._shared.clear()
+        for coordinator in self._coordinators:
+            coordinator.invalidate_metadata()
+
+    @staticmethod
+    def _next_due(coordinator: IPv64DataUpdateCoordinator) -> float | None:
+        """Return the monotonic time the next poll of a coordinator is due."""
+        if coordinator.poll_interval is None or coordinator.config_entry.pref_disable_polling:
+            return None
+        return coordinator.last_refresh + coordinator.poll_interval.total_seconds()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Schedule the next run for the coordinator due first."""
+        self._async_cancel_timer()
+        if self._poll_task is not None:
+            # The running poll schedules the next run when it is done
+            return
+        due = [next_due for coordinator in self._coordinators if (next_due := self._next_due(coordinator)) is not None]
+        if not due:
+            return
+        delay = max(0.0, min(due) - time.monotonic())
+        self._unsub_timer = async_call_later(self.hass, delay, self._async_start_poll)
+
+    @callback
+    def _async_start_poll(self, _now: Any) -> None:
+        """Start polling the coordinators that are due."""
+        self._unsub_timer = None
+        self._poll_task = self.hass.async_create_background_task(self._async_poll(), f"{DOMAIN} scheduled refresh")
+
+    async def _async_poll(self) -> None:
+        """Refresh the coordinators that are due within the coalesce window."""
+        try:
+            deadline = time.monotonic() + POLL_COALESCE_WINDOW
+            due = [
+                coordinator
+                for coordinator in self._coordinators
+                if (next_due := self._next_due(coordinator)) is not None and next_due <= deadline
+            ]
+            for index, coordinator in enumerate(due):
+                if index:
+                    await asyncio.sleep(POLL_STAGGER)
+                if coordinator not in self._coordinators:
+                    continue
+                _LOGGER.debug("Scheduled refresh of %s", coordinator.config_entry.entry_id)
+                await coordinator.async_refresh()
+        finally:
+            self._poll_task = None
+            if self._coordinators:
+                self._async_schedule()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_cancel(self) -> None:
+        """Stop the timer and a running poll."""
+        self._async_cancel_timer()
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler statistics."""
+        return {
+            "entries": len(self._coordinators),
+            "shared_fetches": self.shared_fetches,
+            "shared_hits": self.shared_hits,
+        }
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant, api_key: str) -> AccountScheduler:
+    """Return the scheduler shared by all config entries of an API key."""
+    schedulers: dict[str, AccountScheduler] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SCHEDULERS, {})
+    if api_key not in schedulers:
+        schedulers[api_key] = AccountScheduler(hass, api_key)
+    return schedulers[api_key]
@@ -5,17 +5,33 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import RestoreSensor, SensorEntity
+from homeassistant.components.sensor import RestoreSensor, SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_DOMAIN, CONF_IP_ADDRESS
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DOMAIN, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry, DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_DAILY_UPDATE_LIMIT, CONF_DYNDNS_UPDATES, CONF_REMAINING_UPDATES, DOMAIN, SHORT_NAME
+from .const import (
+    CONF_DAILY_UPDATE_LIMIT,
+    CONF_DYNDNS_UPDATES,
+    CONF_FORCE_UPDATE,
+    CONF_METRICS_SENSORS,
+    CONF_REMAINING_UPDATES,
+    DOMAIN,
+    HEALTHCHECK_STATES,
+    METRICS_ENDPOINTS,
+    SHORT_NAME,
+    SIGNAL_DOMAINS_REASSIGNED,
+    TIER_IP,
+    TIER_METADATA,
+)
 from .coordinator import IPv64DataUpdateCoordinator
+from .healthchecks import IPv64HealthcheckCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,12 +40,19 @@ class IPv64BaseEntity(CoordinatorEntity[IPv64DataUpdateCoordinator], RestoreSens
     """Base entity class for IPv64."""
 
     _attr_available = False
-    _attr_force_update = True  # Ensure updates are always sent to Home Assistant
+    # Coordinator fields and domain record the state is built from, used to skip unchanged writes
+    _change_keys: frozenset[str] = frozenset()
+    _change_domain: str | None = None
+    # Refresh tiers the state is built from, the state is not written after a refresh of other tiers
+    _tiers: frozenset[str] = frozenset({TIER_METADATA})
     device_entry: DeviceEntry
 
     def __init__(self, coordinator: IPv64DataUpdateCoordinator, domain: str) -> None:
         """Initialize the IPv64 base entity."""
         super().__init__(coordinator)
+        # Forced updates write the state on every refresh, even if nothing changed
+        self._attr_force_update = coordinator.config_entry.options.get(CONF_FORCE_UPDATE, False)
+        self._written_available = True
         self._attr_attribution = "Data provided by IPv64.net | Free DynDNS2 & Healthcheck Service"
         self._attr_device_info = DeviceInfo(
             entry_type=DeviceEntryType.SERVICE,
@@ -47,6 +70,23 @@ class IPv64BaseEntity(CoordinatorEntity[IPv64DataUpdateCoordinator], RestoreSens
         # Removed TRACKER_UPDATE_STR dispatcher as it's unused
         self._attr_available = True  # Set available after initialization
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the data backing this entity changed."""
+        coordinator = self.coordinator
+        changed = not self._change_keys.isdisjoint(coordinator.changed_keys) or (
+            self._change_domain is not None and self._change_domain in coordinator.changed_domains
+        )
+        if (
+            self.force_update
+            or self.available != self._written_available
+            or (changed and not self._tiers.isdisjoint(coordinator.refreshed_tiers))
+        ):
+            self._written_available = self.available
+            super()._handle_coordinator_update()
+            return
+        coordinator.skipped_writes += 1
+
     async def async_will_remove_from_hass(self) -> None:
         """Clean up before removing the entity."""
         await super().async_will_remove_from_hass()
@@ -56,6 +96,32 @@ class IPv64BaseEntity(CoordinatorEntity[IPv64DataUpdateCoordinator], RestoreSens
 class IPv64DynDNSStatusSensor(IPv64BaseEntity, SensorEntity):
     """Sensor for IPv64 DynDNS status."""
 
+    _change_keys = frozenset(
+        {
+            CONF_DOMAIN,
+            "account_status",
+            "reg_date",
+            CONF_DYNDNS_UPDATES,
+            "dyndns_subdomains",
+            "owndomains",
+            "healthchecks",
+            "healthchecks_updates",
+            "api_updates",
+            "sms_count",
+            "account",
+            "dyndns_domain_limit",
+            CONF_DAILY_UPDATE_LIMIT,
+            "owndomain_limit",
+            "healthcheck_limit",
+            "healthcheck_update_limit",
+            "dyndns_ttl",
+            "api_limit",
+            "sms_limit",
+            "info",
+            "status",
+        }
+    )
+
     def __init__(self, coordinator: IPv64DataUpdateCoordinator) -> None:
         """Initialize the IPv64 DynDNS sensor."""
         super().__init__(coordinator, coordinator.data[CONF_DOMAIN])
@@ -65,11 +131,8 @@ class IPv64DynDNSStatusSensor(IPv64BaseEntity, SensorEntity):
     @property
     def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        return (
-            self.coordinator.data.get("status", "unknown").split(" ", 1)[1]
-            if self.coordinator.data.get("status")
-            else "unknown"
-        )
+        account = self.coordinator.account
+        return account.status.split(" ", 1)[1] if account is not None and account.status else "unknown"
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -77,66 +140,43 @@ class IPv64DynDNSStatusSensor(IPv64BaseEntity, SensorEntity):
         data = super().extra_state_attributes or {}
         if not self.coordinator.data:
             return data
-        return {
-            **data,
-            CONF_DOMAIN: self.coordinator.data[CONF_DOMAIN],
-            "account_status": self.coordinator.data["account_status"],
-            "reg_date": self.coordinator.data["reg_date"],
-            "dyndns_updates": self.coordinator.data.get(CONF_DYNDNS_UPDATES, 0),
-            "dyndns_subdomains": self.coordinator.data.get("dyndns_subdomains", 0),
-            "owndomains": self.coordinator.data.get("owndomains", 0),
-            "healthchecks": self.coordinator.data.get("healthchecks", 0),
-            "healthchecks_updates": self.coordinator.data.get("healthchecks_updates", 0),
-            "api_updates": self.coordinator.data.get("api_updates", 0),
-            "sms_count": self.coordinator.data.get("sms_count", 0),
-            "account": self.coordinator.data.get("account", "unknown"),
-            "dyndns_domain_limit": self.coordinator.data.get("dyndns_domain_limit", 0),
-            CONF_DAILY_UPDATE_LIMIT: self.coordinator.data.get(CONF_DAILY_UPDATE_LIMIT, 0),
-            "owndomain_limit": self.coordinator.data.get("owndomain_limit", 0),
-            "healthcheck_limit": self.coordinator.data.get("healthcheck_limit", 0),
-            "healthcheck_update_limit": self.coordinator.data.get("healthcheck_update_limit", 0),
-            "dyndns_ttl": self.coordinator.data.get("dyndns_ttl", 0),
-            "api_limit": self.coordinator.data.get("api_limit", 0),
-            "sms_limit": self.coordinator.data.get("sms_limit", 0),
-            "info": self.coordinator.data.get("info", "unknown"),
-            "status": self.coordinator.data.get("status", "unknown"),
-        }
+        data = {**data, CONF_DOMAIN: self.coordinator.data[CONF_DOMAIN]}
+        if (account := self.coordinator.account) is not None:
+            data.update(account.as_dict())
+        return data
 
 
 class IPv64LastUpdateSensor(IPv64BaseEntity, SensorEntity):
     """Sensor for the last update time of IPv64."""
 
     _attr_icon = "mdi:clock"
+    _tiers = frozenset({TIER_IP, TIER_METADATA})
 
     def __init__(self, coordinator: IPv64DataUpdateCoordinator) -> None:
         """Initialize the IPv64 last update sensor."""
         super().__init__(coordinator, coordinator.data[CONF_DOMAIN])
         self._attr_name = f"{SHORT_NAME} {coordinator.data[CONF_DOMAIN]} Last Update"
         self._attr_unique_id = f"{DOMAIN}_{coordinator.data[CONF_DOMAIN]}_last_update"
+        self._change_domain = coordinator.data[CONF_DOMAIN]
 
     @property
     def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        last_update = "unknown"
-        for subdomain in self.coordinator.data.get("subdomains", []):
-            if subdomain.get(CONF_DOMAIN) == self.coordinator.data[CONF_DOMAIN]:
-                last_update = subdomain.get("last_update", "unknown")
-        return last_update
+        if (record := self.coordinator.get_domain_record(self.coordinator.data[CONF_DOMAIN])) and record.last_update:
+            return record.last_update
+        return "unknown"
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the extra state attributes of the sensor."""
         data = super().extra_state_attributes or {}
-        for subdomain in self.coordinator.data.get("subdomains", []):
-            if subdomain.get(CONF_DOMAIN) == self.coordinator.data[CONF_DOMAIN]:
-                last_update = subdomain.get("last_update", "unknown")
-                if last_update != "unknown":
-                    return {**data, "last_update": last_update}
+        if (record := self.coordinator.get_domain_record(self.coordinator.data[CONF_DOMAIN])) and record.last_update:
+            return {**data, "last_update": record.last_update}
         return {**data}
 
 
 class IPv64SettingSensor(IPv64BaseEntity, SensorEntity):
-    """Sensor for IPv64 settings and counters."""
+    """Sensor for IPv64 account settings and counters."""
 
     def __init__(
         self,
@@ -151,18 +191,24 @@ class IPv64SettingSensor(IPv64BaseEntity, SensorEntity):
         self._attr_unique_id = f"{DOMAIN}_{coordinator.data[CONF_DOMAIN]}_{key}"
         self._key = key
         self._attr_key = attr_key
+        # The update counter is also raised by the updates of the IP tier
+        self._tiers = frozenset({TIER_IP, TIER_METADATA})
+        self._change_keys = frozenset({key, attr_key} - {None})
 
     @property
     def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        return self.coordinator.data.get(self._key, "unknown")
+        if (account := self.coordinator.account) is None:
+            return "unknown"
+        return getattr(account, self._key)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the extra state attributes of the sensor."""
         data = super().extra_state_attributes or {}
-        if self._attr_key and self.coordinator.data.get(self._attr_key):
-            return {**data, self._attr_key: self.coordinator.data[self._attr_key]}
+        account = self.coordinator.account
+        if self._attr_key and account is not None and getattr(account, self._attr_key):
+            return {**data, self._attr_key: getattr(account, self._attr_key)}
         return data
 
 
@@ -170,20 +216,21 @@ class IPv64DomainSensor(IPv64BaseEntity, SensorEntity):
     """Sensor for IPv64 domain IP address."""
 
     _attr_icon = "mdi:ip"
+    _tiers = frozenset({TIER_IP, TIER_METADATA})
 
     def __init__(self, coordinator: IPv64DataUpdateCoordinator, domain: str) -> None:
         """Initialize the IPv64 domain sensor."""
         super().__init__(coordinator, domain)
-        self._domain = domain
+        self.domain = domain
+        self._change_domain = domain
         self._attr_name = f"{SHORT_NAME} {domain} IP"
         self._attr_unique_id = f"{DOMAIN}_{domain}_ip"
 
     @property
     def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        for subdomain in self.coordinator.data.get("subdomains", []):
-            if subdomain.get(CONF_DOMAIN) == self._domain:
-                return subdomain.get(CONF_IP_ADDRESS, "unknown")
+        if record := self.coordinator.get_domain_record(self.domain):
+            return record.ip_address
         return "unknown"
 
     @property
@@ -192,14 +239,12 @@ class IPv64DomainSensor(IPv64BaseEntity, SensorEntity):
         data = super().extra_state_attributes or {}
         if not self.coordinator.data:
             return data
-        for subdomain in self.coordinator.data.get("subdomains", []):
-            if subdomain.get(CONF_DOMAIN) == self._domain:
-                subdomain_data = {k: v for k, v in subdomain.items() if k != "subdomains"}
-                main_domain = self._domain.split(".", 1)[1] if "." in self._domain else self._domain
-                metadata = self.coordinator.data.get(f"{main_domain}_metadata", {})
-                if metadata.get("wildcard"):
-                    subdomain_data["wildcard"] = metadata["wildcard"]
-                return {**data, **subdomain_data}
+        if record := self.coordinator.get_domain_record(self.domain):
+            subdomain_data = record.attributes()
+            metadata = self.coordinator.get_domain_metadata(self.domain)
+            if metadata is not None and metadata.wildcard:
+                subdomain_data["wildcard"] = metadata.wildcard
+            return {**data, **subdomain_data}
         return data
 
 
@@ -207,6 +252,8 @@ class IPv64RemainingUpdatesSensor(IPv64BaseEntity, SensorEntity):
     """Sensor for remaining IPv64 DynDNS updates."""
 
     _attr_icon = "mdi:counter"
+    _tiers = frozenset({TIER_IP, TIER_METADATA})
+    _change_keys = frozenset({CONF_REMAINING_UPDATES, CONF_DYNDNS_UPDATES, CONF_DAILY_UPDATE_LIMIT, "poll_plan"})
 
     def __init__(self, coordinator: IPv64DataUpdateCoordinator) -> None:
         """Initialize the remaining updates sensor."""
@@ -223,13 +270,133 @@ class IPv64RemainingUpdatesSensor(IPv64BaseEntity, SensorEntity):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the extra state attributes of the sensor."""
         data = super().extra_state_attributes or {}
-        return {
+        account = self.coordinator.account
+        data = {
             **data,
-            CONF_DYNDNS_UPDATES: self.coordinator.data.get(CONF_DYNDNS_UPDATES, "unknown"),
-            CONF_DAILY_UPDATE_LIMIT: self.coordinator.data.get(CONF_DAILY_UPDATE_LIMIT, "unknown"),
+            CONF_DYNDNS_UPDATES: account.dyndns_updates if account is not None else "unknown",
+            CONF_DAILY_UPDATE_LIMIT: account.daily_update_limit if account is not None else "unknown",
+        }
+        if plan := self.coordinator.data.get("poll_plan"):
+            # Chosen by adaptive polling, the interval in minutes
+            data.update(
+                {
+                    "poll_interval": plan["interval"],
+                    "poll_interval_reason": plan["reason"],
+                    "projected_updates": plan["projected_updates"],
+                    "minutes_until_reset": plan["minutes_until_reset"],
+                }
+            )
+        return data
+
+
+class IPv64RequestMetricsSensor(IPv64BaseEntity, SensorEntity):
+    """Diagnostic sensor for the average latency and the outcomes of the requests to an endpoint."""
+
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _unrecorded_attributes = frozenset({"statuses", "buckets"})
+
+    def __init__(self, coordinator: IPv64DataUpdateCoordinator, endpoint: str) -> None:
+        """Initialize the request metrics sensor."""
+        super().__init__(coordinator, coordinator.data[CONF_DOMAIN])
+        self.endpoint = endpoint
+        self._metrics = coordinator.metrics.endpoints[endpoint]
+        self._written_requests: int | None = None
+        self._attr_name = f"{SHORT_NAME} {coordinator.data[CONF_DOMAIN]} {endpoint.replace('_', ' ').title()} Latency"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.data[CONF_DOMAIN]}_{endpoint}_latency"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if requests were sent to the endpoint since the last write."""
+        if self.force_update or self.available != self._written_available or self._metrics.requests != self._written_requests:
+            self._written_available = self.available
+            self._written_requests = self._metrics.requests
+            # The metrics are no coordinator fields, so the change detection of the base entity does not apply
+            super(IPv64BaseEntity, self)._handle_coordinator_update()
+            return
+        self.coordinator.skipped_writes += 1
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the average latency in milliseconds."""
+        latency = self._metrics.latency
+        return round(latency.total / latency.count, 1) if latency.count else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the extra state attributes of the sensor."""
+        metrics = self._metrics.as_dict()
+        latency = metrics.pop("latency")
+        return {
+            **(super().extra_state_attributes or {}),
+            **metrics.pop("rate_limit"),
+            **metrics,
+            "p95": latency["p95"],
+            "max": latency["max"],
+            "buckets": latency["buckets"],
+        }
+
+
+class IPv64HealthcheckSensor(CoordinatorEntity[IPv64HealthcheckCoordinator], SensorEntity):
+    """Sensor for the state of an IPv64 healthcheck."""
+
+    _attr_icon = "mdi:heart-pulse"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [*HEALTHCHECK_STATES.values(), "unknown"]
+    # The history changes with every ping, it is not worth keeping in the database
+    _unrecorded_attributes = frozenset({"history"})
+
+    def __init__(self, coordinator: IPv64HealthcheckCoordinator, token: str) -> None:
+        """Initialize the IPv64 healthcheck sensor."""
+        super().__init__(coordinator)
+        self.token = token
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_name = f"{SHORT_NAME} Healthcheck {coordinator.data[token].name}"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_healthcheck_{token}"
+        self._attr_attribution = "Data provided by IPv64.net | Free DynDNS2 & Healthcheck Service"
+        self._attr_device_info = DeviceInfo(
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, f"{entry_id}_healthchecks")},
+            manufacturer="IPv64.net",
+            model="Healthcheck Service",
+            name=f"{SHORT_NAME} Healthchecks",
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True if the healthcheck was in the last listing."""
+        return super().available and self.token in (self.coordinator.data or {})
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the native value of the sensor."""
+        return self.coordinator.data[self.token].status if self.available else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the extra state attributes of the sensor."""
+        if not self.available:
+            return {}
+        history = self.coordinator.history.get(self.token, ())
+        return {
+            **self.coordinator.data[self.token].attributes(),
+            "history": [sample.as_dict() for sample in history],
         }
 
 
+@callback
+def _async_remove_sensor(hass: HomeAssistant, sensor: SensorEntity) -> None:
+    """Remove a sensor and its entity registry entry."""
+    entity_registry = er.async_get(hass)
+    if sensor.entity_id and entity_registry.async_get(sensor.entity_id):
+        entity_registry.async_remove(sensor.entity_id)
+    else:
+        hass.async_create_task(sensor.async_remove())
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -238,16 +405,41 @@ async def async_setup_entry(
     """Set up the IPv64 sensors from the config entry."""
     coordinator: IPv64DataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     entities: list[SensorEntity] = []
-
-    if not coordinator.data.get("subdomains"):
+    domain_sensors: dict[str, IPv64DomainSensor] = {}
+
+    @callback
+    def _async_sync_domain_sensors() -> None:
+        """Add sensors for new or reassigned domains and remove the sensors of deleted or reassigned domains."""
+        if config_entry.entry_id not in hass.data[DOMAIN]:
+            # Unloading, the sensors are removed with the platform
+            return
+        domains = coordinator.owned_domains
+        new_sensors = [IPv64DomainSensor(coordinator, domain) for domain in domains if domain not in domain_sensors]
+        for sensor in new_sensors:
+            domain_sensors[sensor.domain] = sensor
+        if new_sensors and not any(isinstance(entity, IPv64LastUpdateSensor) for entity in entities):
+            entities.append(IPv64LastUpdateSensor(coordinator))
+            new_sensors.append(entities[-1])
+        if new_sensors:
+            _LOGGER.debug("Adding %d sensors for %s", len(new_sensors), config_entry.entry_id)
+            async_add_entities(new_sensors)
+
+        # An incomplete or failed domain listing is no reason to delete sensors
+        if not coordinator.domains_complete:
+            return
+        device_registry = dr.async_get(hass)
+        for domain in domain_sensors.keys() - domains:
+            _LOGGER.debug("Removing sensor for deleted domain %s", domain)
+            _async_remove_sensor(hass, domain_sensors.pop(domain))
+            if domain != coordinator.data[CONF_DOMAIN] and (
+                device := device_registry.async_get_device(identifiers={(DOMAIN, domain)})
+            ):
+                device_registry.async_update_device(device.id, remove_config_entry_id=config_entry.entry_id)
+
+    if not coordinator.domains:
         _LOGGER.warning("No subdomains available for %s, skipping domain sensors", config_entry.entry_id)
-    else:
-        entities.extend(
-            [IPv64DomainSensor(coordinator, subdomain[CONF_DOMAIN]) for subdomain in coordinator.data["subdomains"]]
-        )
-        entities.append(IPv64LastUpdateSensor(coordinator))
 
-    if coordinator.data.get(CONF_DYNDNS_UPDATES) is not None:
+    if coordinator.account is not None:
         entities.append(IPv64SettingSensor(coordinator, "DynDNS Counter Today", CONF_DYNDNS_UPDATES, "daily_update_limit"))
 
     if coordinator.data.get(CONF_REMAINING_UPDATES) is not None:
@@ -256,4 +448,43 @@ async def async_setup_entry(
     if coordinator.data.get(CONF_DOMAIN):
         entities.append(IPv64DynDNSStatusSensor(coordinator))
 
+    if config_entry.options.get(CONF_METRICS_SENSORS, False):
+        entities.extend(
+            IPv64RequestMetricsSensor(coordinator, endpoint)
+            for endpoint in METRICS_ENDPOINTS
+            if endpoint != "healthchecks" or coordinator.healthchecks is not None
+        )
+
     async_add_entities(entities)
+    _async_sync_domain_sensors()
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_sync_domain_sensors))
+    config_entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_DOMAINS_REASSIGNED, _async_sync_domain_sensors))
+
+    if (healthchecks := coordinator.healthchecks) is None:
+        return
+    healthcheck_sensors: dict[str, IPv64HealthcheckSensor] = {}
+
+    @callback
+    def _async_sync_healthcheck_sensors() -> None:
+        """Add sensors for new healthchecks and remove the sensors of deleted or reassigned healthchecks."""
+        if config_entry.entry_id not in hass.data[DOMAIN]:
+            # Unloading, the sensors are removed with the platform
+            return
+        if not coordinator.owns_healthchecks:
+            tokens: set[str] = set()
+        elif not healthchecks.last_update_success or healthchecks.data is None:
+            # A failed refresh makes the sensors unavailable but keeps them
+            return
+        else:
+            tokens = set(healthchecks.data)
+        if new_sensors := [IPv64HealthcheckSensor(healthchecks, token) for token in tokens - healthcheck_sensors.keys()]:
+            healthcheck_sensors.update((sensor.token, sensor) for sensor in new_sensors)
+            _LOGGER.debug("Adding %d healthcheck sensors for %s", len(new_sensors), config_entry.entry_id)
+            async_add_entities(new_sensors)
+        for token in healthcheck_sensors.keys() - tokens:
+            _LOGGER.debug("Removing sensor for deleted healthcheck %s", healthcheck_sensors[token].name)
+            _async_remove_sensor(hass, healthcheck_sensors.pop(token))
+
+    _async_sync_healthcheck_sensors()
+    config_entry.async_on_unload(healthchecks.async_add_listener(_async_sync_healthcheck_sensors))
+    config_entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_DOMAINS_REASSIGNED, _async_sync_healthcheck_sensors))
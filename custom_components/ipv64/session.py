@@ -0,0 +1,145 @@
+"""Dedicated HTTP session for IPv64.net requests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import hashlib
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util.json import json_loads
+from homeassistant.util.ssl import get_default_context
+
+from .const import CONNECTION_LIMIT, CONNECTION_LIMIT_PER_HOST, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT
+
+
+class ConnectionStats:
+    """Count requests and how often they reused a pooled connection."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.created = 0
+        self.reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config feeding the counters."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return trace_config
+
+    async def _on_request_start(self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any) -> None:
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any) -> None:
+        self.created += 1
+
+    async def _on_connection_reuseconn(self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any) -> None:
+        self.reused += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the connection statistics."""
+        connections = self.created + self.reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.created,
+            "connections_reused": self.reused,
+            "reuse_ratio": round(self.reused / connections, 3) if connections else 0.0,
+        }
+
+
+class CachedResponse:
+    """Fingerprint, validators and parsed body of the last response to a request."""
+
+    def __init__(self, fingerprint: str, payload: Any, etag: str | None, last_modified: str | None) -> None:
+        """Initialize the cached response."""
+        self.fingerprint = fingerprint
+        self.payload = payload
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """Recognize API responses that did not change since the last request.
+
+    The ETag and Last-Modified validators of a response are sent with the next request,
+    so the server can answer 304 Not Modified. Otherwise a hash of the body shows whether
+    it changed, in which case decoding and parsing it is skipped. Either way the caller
+    gets the fingerprint of the body and can skip processing it as well.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._responses: dict[str, CachedResponse] = {}
+        self.requests = 0
+        self.not_modified = 0
+        self.unchanged = 0
+
+    def conditional_headers(self, name: str) -> dict[str, str]:
+        """Return the headers making the request `name` conditional on a change."""
+        if (cached := self._responses.get(name)) is None:
+            return {}
+        headers = {}
+        if cached.etag:
+            headers[aiohttp.hdrs.IF_NONE_MATCH] = cached.etag
+        if cached.last_modified:
+            headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+        return headers
+
+    async def async_read_json[T](self, name: str, resp: aiohttp.ClientResponse, parse: Callable[[Any], T]) -> tuple[str, T]:
+        """Return the fingerprint and the JSON body of a successful response parsed by `parse`."""
+        self.requests += 1
+        cached = self._responses.get(name)
+        if resp.status == HTTPStatus.NOT_MODIFIED and cached is not None:
+            self.not_modified += 1
+            return cached.fingerprint, cached.payload
+        body = await resp.read()
+        fingerprint = hashlib.sha256(body).hexdigest()
+        if cached is not None and cached.fingerprint == fingerprint:
+            self.unchanged += 1
+            payload = cached.payload
+        else:
+            payload = parse(json_loads(body))
+        self._responses[name] = CachedResponse(
+            fingerprint, payload, resp.headers.get(aiohttp.hdrs.ETAG), resp.headers.get(aiohttp.hdrs.LAST_MODIFIED)
+        )
+        return fingerprint, payload
+
+    def fingerprint(self, name: str) -> str | None:
+        """Return the fingerprint of the last response to the request `name`."""
+        cached = self._responses.get(name)
+        return cached.fingerprint if cached is not None else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache statistics."""
+        hits = self.not_modified + self.unchanged
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "hit_ratio": round(hits / self.requests, 3) if self.requests else 0.0,
+            "validators": {name: bool(cached.etag or cached.last_modified) for name, cached in self._responses.items()},
+        }
+
+
+def create_session(stats: ConnectionStats, *trace_configs: aiohttp.TraceConfig) -> aiohttp.ClientSession:
+    """Create a session with its own keep-alive connection pool, `trace_configs` trace its requests as well."""
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=get_default_context(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={aiohttp.hdrs.USER_AGENT: SERVER_SOFTWARE},
+        version=aiohttp.HttpVersion11,
+        trace_configs=[stats.trace_config(), *trace_configs],
+    )
@@ -0,0 +1,224 @@
+"""Local watchers that report IP address changes without polling."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+import ipaddress
+import logging
+import socket
+import struct
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import CONF_IP_WATCHER, CONF_IP_WATCHER_ENTITY, IP_WATCHER_DEBOUNCE, IP_WATCHER_ENTITY, IP_WATCHER_NETLINK
+
+_LOGGER = logging.getLogger(__name__)
+
+# rtnetlink constants from linux/rtnetlink.h and linux/if_addr.h
+NETLINK_ROUTE = 0
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_FLAGS = 8
+IFA_F_TEMPORARY = 0x01
+IFA_F_TENTATIVE = 0x40
+NLMSG_HEADER = struct.Struct("=LHHLL")
+IFADDRMSG = struct.Struct("=BBBBI")
+RTATTR = struct.Struct("=HH")
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def parse_address_messages(buffer: bytes) -> list[tuple[int, int, ipaddress.IPv4Address | ipaddress.IPv6Address, int]]:
+    """Parse rtnetlink address messages into (type, interface index, address, flags) tuples."""
+    changes = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(buffer):
+        length, msg_type, _flags, _seq, _pid = NLMSG_HEADER.unpack_from(buffer, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        if msg_type in (RTM_NEWADDR, RTM_DELADDR):
+            body = offset + NLMSG_HEADER.size
+            family, _prefixlen, flags, _scope, index = IFADDRMSG.unpack_from(buffer, body)
+            addresses: dict[int, bytes] = {}
+            attr = body + IFADDRMSG.size
+            while attr + RTATTR.size <= offset + length:
+                attr_length, attr_type = RTATTR.unpack_from(buffer, attr)
+                if attr_length < RTATTR.size:
+                    break
+                value = buffer[attr + RTATTR.size : attr + attr_length]
+                if attr_type in (IFA_ADDRESS, IFA_LOCAL):
+                    addresses[attr_type] = value
+                elif attr_type == IFA_FLAGS and len(value) >= 4:
+                    flags = struct.unpack_from("=I", value)[0]
+                attr += _align(attr_length)
+            # IFA_LOCAL is the address of the interface, IFA_ADDRESS the peer on point-to-point links
+            if raw := addresses.get(IFA_LOCAL, addresses.get(IFA_ADDRESS)):
+                if family == socket.AF_INET and len(raw) == 4:
+                    changes.append((msg_type, index, ipaddress.IPv4Address(raw), flags))
+                elif family == socket.AF_INET6 and len(raw) == 16:
+                    changes.append((msg_type, index, ipaddress.IPv6Address(raw), flags))
+        offset += _align(length)
+    return changes
+
+
+class IPWatcher(ABC):
+    """Source of local IP address changes.
+
+    Changes are debounced, so a burst of events (address removed, added, duplicate
+    address detection finished) triggers a single callback.
+    """
+
+    name: str
+
+    def __init__(self, hass: HomeAssistant, on_change: Callable[[], Awaitable[Any]]) -> None:
+        """Initialize the watcher."""
+        self.hass = hass
+        self.events = 0
+        self.triggers = 0
+        self._on_change = on_change
+        self._debouncer = Debouncer(hass, _LOGGER, cooldown=IP_WATCHER_DEBOUNCE, immediate=False, function=self._async_trigger)
+
+    async def _async_trigger(self) -> None:
+        self.triggers += 1
+        await self._on_change()
+
+    @callback
+    def async_address_changed(self, reason: str) -> None:
+        """Report an address change."""
+        self.events += 1
+        _LOGGER.debug("IP watcher %s detected an address change: %s", self.name, reason)
+        self.hass.async_create_task(self._debouncer.async_call(), eager_start=True)
+
+    @abstractmethod
+    def async_start(self) -> bool:
+        """Start watching, returns False if the source is not available."""
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop watching."""
+        self._debouncer.async_cancel()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the watcher statistics."""
+        return {"source": self.name, "events": self.events, "triggers": self.triggers}
+
+
+class NetlinkWatcher(IPWatcher):
+    """Watch the global addresses of the local interfaces through Linux rtnetlink.
+
+    Private IPv4 addresses change with the LAN, not with the public IP, so only
+    globally routable addresses (IPv6 and public IPv4 on WAN-facing interfaces) count.
+    """
+
+    name = IP_WATCHER_NETLINK
+
+    def __init__(self, hass: HomeAssistant, on_change: Callable[[], Awaitable[Any]]) -> None:
+        """Initialize the watcher."""
+        super().__init__(hass, on_change)
+        self._socket: socket.socket | None = None
+
+    def async_start(self) -> bool:
+        """Subscribe to the IPv4 and IPv6 address notifications."""
+        if not hasattr(socket, "AF_NETLINK"):
+            _LOGGER.warning("IP watcher netlink is only available on Linux, falling back to polling")
+            return False
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+            sock.setblocking(False)
+            sock.bind((0, RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        except OSError as err:
+            _LOGGER.warning("Unable to subscribe to address changes, falling back to polling: %s", err)
+            return False
+        self._socket = sock
+        self.hass.loop.add_reader(sock.fileno(), self._read)
+        _LOGGER.debug("IP watcher netlink started")
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Close the netlink socket."""
+        super().async_stop()
+        if self._socket is not None:
+            self.hass.loop.remove_reader(self._socket.fileno())
+            self._socket.close()
+            self._socket = None
+
+    @callback
+    def _read(self) -> None:
+        """Read the pending netlink messages."""
+        while self._socket is not None:
+            try:
+                buffer = self._socket.recv(65536)
+            except BlockingIOError:
+                return
+            except OSError as err:
+                # ENOBUFS: messages were dropped, so the addresses may have changed
+                _LOGGER.debug("Netlink receive failed: %s", err)
+                self.async_address_changed(str(err))
+                return
+            for msg_type, index, address, flags in parse_address_messages(buffer):
+                if not address.is_global or flags & (IFA_F_TEMPORARY | IFA_F_TENTATIVE):
+                    continue
+                action = "added" if msg_type == RTM_NEWADDR else "removed"
+                self.async_address_changed(f"{address} {action} on interface {index}")
+
+
+class EntityWatcher(IPWatcher):
+    """Follow an entity holding the external IP, e.g. the sensor of a router integration."""
+
+    name = IP_WATCHER_ENTITY
+
+    def __init__(self, hass: HomeAssistant, on_change: Callable[[], Awaitable[Any]], entity_id: str) -> None:
+        """Initialize the watcher."""
+        super().__init__(hass, on_change)
+        self._entity_id = entity_id
+        self._unsub: CALLBACK_TYPE | None = None
+
+    def async_start(self) -> bool:
+        """Track the state of the entity."""
+        self._unsub = async_track_state_change_event(self.hass, self._entity_id, self._async_state_changed)
+        _LOGGER.debug("IP watcher following %s", self._entity_id)
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking the entity."""
+        super().async_stop()
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        if old_state is not None and old_state.state == new_state.state:
+            return
+        self.async_address_changed(f"{self._entity_id} changed to {new_state.state}")
+
+
+@callback
+def async_create_watcher(hass: HomeAssistant, entry: ConfigEntry, on_change: Callable[[], Awaitable[Any]]) -> IPWatcher | None:
+    """Create the IP watcher selected in the options of an entry."""
+    source = entry.options.get(CONF_IP_WATCHER)
+    if source == IP_WATCHER_NETLINK:
+        return NetlinkWatcher(hass, on_change)
+    if source == IP_WATCHER_ENTITY:
+        if entity_id := entry.options.get(CONF_IP_WATCHER_ENTITY):
+            return EntityWatcher(hass, on_change, entity_id)
+        _LOGGER.warning("No entity selected for the IP watcher of %s", entry.data.get("domain"))
+    return None
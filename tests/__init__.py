@@ -0,0 +1 @@
+"""Tests for the IPv64.net integration."""
@@ -0,0 +1,125 @@
+"""Helpers shared by the tests of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.ipv64.const import CONF_API_ECONOMY, CONF_API_KEY, DOMAIN
+from homeassistant.const import CONF_DOMAIN, CONF_SCAN_INTERVAL, CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+
+class FakeClock:
+    """Clock that only advances when the code under test sleeps or a test moves it.
+
+    Modules read it through `time.monotonic`, `time.time` and `asyncio.sleep`, which the
+    tests patch per module to the methods of the clock.
+    """
+
+    def __init__(self, now: float = 1000.0) -> None:
+        """Initialize the clock."""
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def time(self) -> float:
+        """Return the current time as a UNIX timestamp."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Advance the clock instead of sleeping."""
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+API_URL = "https://ipv64.net/api.php"
+UPDATE_URL = "https://ipv64.net/nic/update"
+CHECKIP_URL = "https://checkip.amazonaws.com/"
+
+ACCOUNT: dict[str, Any] = {
+    "account_status": "active",
+    "reg_date": "2020-01-01 00:00:00",
+    "dyndns_updates": 5,
+    "account_class": {"class_name": "Free", "dyndns_update_limit": 64, "api_limit": 64},
+    "info": "success",
+    "status": "200 OK",
+}
+DOMAINS: dict[str, Any] = {
+    "subdomains": {
+        "foo.ipv64.net": {
+            "updates": 1,
+            "wildcard": 1,
+            "domain_update_hash": "hash",
+            "ipv6prefix": "",
+            "dualstack": "",
+            "deactivated": 0,
+            "records": [
+                {"record_id": 1, "content": "192.0.2.1", "ttl": 60, "type": "A", "praefix": "", "last_update": "2025-01-15"},
+                {
+                    "record_id": 2,
+                    "content": "192.0.2.2",
+                    "ttl": 60,
+                    "type": "A",
+                    "praefix": "www",
+                    "last_update": "2025-01-15",
+                },
+            ],
+        }
+    },
+    "info": "success",
+}
+HEALTHCHECKS: dict[str, Any] = {
+    "domain": {"hc1": {"healthtoken": "hc1", "name": "Backup", "healthstatus": 2, "last_ping": "2025-01-15 12:00:00"}},
+    "info": "success",
+}
+
+
+def mock_api(
+    aioclient_mock: AiohttpClientMocker,
+    *,
+    ip: str = "192.0.2.1",
+    account: dict[str, Any] | None = None,
+    domains: dict[str, Any] | None = None,
+) -> None:
+    """Answer the requests of the integration, the public IP check returns `ip`."""
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(re.compile(r".*get_account_info.*"), json=account or ACCOUNT)
+    aioclient_mock.get(re.compile(r".*get_domains.*"), json=domains or DOMAINS)
+    aioclient_mock.get(re.compile(r".*get_healthchecks.*"), json=HEALTHCHECKS)
+    aioclient_mock.get(re.compile(r".*get_healthcheck_statistics.*"), json={"statistics": {}})
+    aioclient_mock.get(CHECKIP_URL, text=f"{ip}\n")
+    aioclient_mock.get(UPDATE_URL, json={"status": "success"})
+    aioclient_mock.post(API_URL, json={"info": "success", "add_domain": "ok"})
+    aioclient_mock.delete(API_URL, json={"info": "success"})
+
+
+def api_calls(aioclient_mock: AiohttpClientMocker) -> list[str]:
+    """Return the endpoints requested so far, the API action or the URL without query of other requests."""
+    calls = []
+    for method, url, *_ in aioclient_mock.mock_calls:
+        if str(url).startswith(API_URL):
+            calls.append(f"{method.lower()} {next(iter(url.query), '')}".strip())
+        else:
+            calls.append(str(url.with_query(None)))
+    return calls
+
+
+def create_entry(
+    hass: HomeAssistant, *, entry_id: str = "e1", domain: str = "foo.ipv64.net", **options: Any
+) -> MockConfigEntry:
+    """Add a config entry of `domain` with the API key "key" to hass."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_DOMAIN: domain, CONF_API_KEY: "key", CONF_TOKEN: "token"},
+        options={CONF_SCAN_INTERVAL: 23, CONF_API_ECONOMY: True, **options},
+        entry_id=entry_id,
+    )
+    entry.add_to_hass(hass)
+    return entry
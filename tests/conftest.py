@@ -0,0 +1,45 @@
+"""Fixtures for the tests of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.ipv64 import limiter, retry
+
+from .common import FakeClock, mock_api
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    """Return a clock the modules under test are patched to in their `clock` fixture."""
+    return FakeClock()
+
+
+@pytest.fixture
+def api(
+    aioclient_mock: AiohttpClientMocker, enable_custom_integrations: None, fake_clock: FakeClock
+) -> Iterator[AiohttpClientMocker]:
+    """Serve the mocked IPv64.net API and public IP check to the sessions the integration creates.
+
+    The rate limit and the retries wait on the fake clock.
+    """
+
+    def create_session(*args: Any) -> Any:
+        return aioclient_mock.create_session(asyncio.get_running_loop())
+
+    mock_api(aioclient_mock)
+    with (
+        patch("custom_components.ipv64.coordinator.create_session", create_session),
+        patch("custom_components.ipv64.pinger.create_session", create_session),
+        patch.object(limiter, "time", SimpleNamespace(monotonic=fake_clock.monotonic)),
+        patch.object(limiter, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=fake_clock.sleep)),
+        patch.object(retry, "asyncio", SimpleNamespace(timeout=asyncio.timeout, sleep=fake_clock.sleep)),
+    ):
+        yield aioclient_mock
@@ -0,0 +1,290 @@
+"""Tests for the data update coordinator of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta
+import re
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.ipv64 import coordinator as coordinator_module, scheduler
+from custom_components.ipv64.const import (
+    CONF_API_ECONOMY,
+    DOMAIN,
+    SERVICE_ADD_DOMAIN,
+    SERVICE_DELETE_DOMAIN,
+    SERVICE_REFRESH,
+    TIER_IP,
+    TIER_METADATA,
+)
+from custom_components.ipv64.coordinator import IPv64DataUpdateCoordinator
+from homeassistant.const import CONF_DOMAIN, CONF_DOMAINS
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import CHECKIP_URL, DOMAINS, UPDATE_URL, FakeClock, api_calls, create_entry, mock_api
+
+CACHE_KEY = "ipv64_e1_data"
+
+
+def _cache(cache_time: str) -> dict[str, Any]:
+    """Return a stored cache of foo.ipv64.net written at `cache_time`."""
+    return {
+        "version": 1,
+        "key": CACHE_KEY,
+        "data": {
+            "domain": "foo.ipv64.net",
+            "cache_time": cache_time,
+            "ip_address": "198.51.100.1",
+            "account": {"account_status": "active", "reg_date": "2020-01-01 00:00:00", "account": "Free"},
+            "domains": {
+                "records": [
+                    {
+                        "name": "foo.ipv64.net",
+                        "ip_address": "198.51.100.1",
+                        "record_type": "A",
+                        "ttl": 60,
+                        "failover_policy": 0,
+                        "deactivated": False,
+                        "last_update": None,
+                    }
+                ],
+                "metadata": {},
+            },
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    ("age", "used"),
+    [(timedelta(minutes=30), True), (timedelta(minutes=150), False)],
+)
+@pytest.mark.parametrize("aware", [True, False])
+async def test_cache_age(
+    hass: HomeAssistant,
+    api: AiohttpClientMocker,
+    hass_storage: dict[str, Any],
+    *,
+    age: timedelta,
+    used: bool,
+    aware: bool,
+) -> None:
+    """Test a cache is only used within the maximum age, also if written in local time without an offset."""
+    await hass.config.async_set_time_zone("Europe/Berlin")
+    entry = create_entry(hass, cache_max_age=120)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    # Unloading writes the pending data, which would be read instead of the stored cache
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    written = dt_util.utcnow() - age
+    hass_storage[CACHE_KEY] = _cache(
+        written.isoformat() if aware else dt_util.as_local(written).replace(tzinfo=None).isoformat()
+    )
+    assert await coordinator.async_load_cache() is used
+
+
+async def test_cache_time_in_utc(hass: HomeAssistant, api: AiohttpClientMocker, hass_storage: dict[str, Any]) -> None:
+    """Test the cache is written with the time in UTC."""
+    entry = create_entry(hass, cache_save_delay=0)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    cache_time = datetime.fromisoformat(hass_storage[CACHE_KEY]["data"]["cache_time"])
+    assert cache_time.utcoffset() == timedelta(0)
+    assert dt_util.utcnow() - cache_time < timedelta(minutes=1)
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize(("status", "kept"), [(503, True), (401, False)])
+async def test_account_info_error(hass: HomeAssistant, api: AiohttpClientMocker, status: int, kept: bool) -> None:
+    """Test the account info is kept after a transient error and an invalid API key fails the refresh."""
+    entry = create_entry(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    account = coordinator.account
+    assert account is not None
+
+    api.clear_requests()
+    api.get(re.compile(r".*get_account_info.*"), status=status)
+    api.get(re.compile(r".*get_domains.*"), json=DOMAINS)
+    api.get(CHECKIP_URL, text="192.0.2.1\n")
+    coordinator.scheduler.async_invalidate()
+    coordinator.invalidate_metadata()
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is kept
+    assert coordinator.account is (account if kept else None)
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.fixture
+def clock(fake_clock: FakeClock) -> Iterator[FakeClock]:
+    """Age the refresh tiers and the shared account data on a fake clock."""
+    with (
+        patch.object(coordinator_module, "time", SimpleNamespace(monotonic=fake_clock.monotonic, time=time.time)),
+        patch.object(scheduler, "time", SimpleNamespace(monotonic=fake_clock.monotonic)),
+    ):
+        yield fake_clock
+
+
+async def test_metadata_tier(hass: HomeAssistant, api: AiohttpClientMocker, clock: FakeClock) -> None:
+    """Test the account and domain data are only fetched when the metadata tier is due."""
+    entry = create_entry(hass, **{CONF_API_ECONOMY: False})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert api_calls(api) == ["get get_account_info", "get get_domains", UPDATE_URL]
+    assert coordinator.refreshed_tiers == {TIER_IP, TIER_METADATA}
+
+    # Between metadata refreshes, only the IP is updated
+    api.mock_calls.clear()
+    clock.now += 23 * 60
+    assert not coordinator.metadata_due
+    await coordinator.async_refresh()
+    assert api_calls(api) == [UPDATE_URL]
+    assert coordinator.refreshed_tiers == {TIER_IP}
+
+    # Unchanged account and domain data only refresh the IP tier
+    api.mock_calls.clear()
+    clock.now += 60 * 60
+    assert coordinator.metadata_due
+    await coordinator.async_refresh()
+    assert api_calls(api) == ["get get_account_info", "get get_domains", UPDATE_URL]
+    assert coordinator.refreshed_tiers == {TIER_IP}
+
+    mock_api(api, domains={"subdomains": {**DOMAINS["subdomains"], "bar.ipv64.net": {"records": []}}, "info": "success"})
+    clock.now += 60 * 60
+    await coordinator.async_refresh()
+    assert api_calls(api) == ["get get_account_info", "get get_domains", UPDATE_URL]
+    assert coordinator.refreshed_tiers == {TIER_IP, TIER_METADATA}
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize(("service", "method"), [(SERVICE_ADD_DOMAIN, "post"), (SERVICE_DELETE_DOMAIN, "delete")])
+async def test_domain_change_invalidates_metadata(
+    hass: HomeAssistant, api: AiohttpClientMocker, clock: FakeClock, service: str, method: str
+) -> None:
+    """Test adding or deleting a domain fetches the account and domain data with the refresh that follows."""
+    entry = create_entry(hass, **{CONF_API_ECONOMY: False})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    api.mock_calls.clear()
+    await hass.services.async_call(DOMAIN, service, {CONF_DOMAIN: "bar.ipv64.net"}, blocking=True)
+    assert api_calls(api) == [method, "get get_account_info", "get get_domains", UPDATE_URL]
+    assert not coordinator.metadata_due
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+class FakeCycle:
+    """Refresh cycle that records its options and waits until the test releases it."""
+
+    def __init__(self) -> None:
+        """Initialize the cycle."""
+        self.calls: list[tuple[bool, bool]] = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self, is_economy: bool = False, force_refresh: bool = False) -> dict[str, Any]:
+        """Run a cycle, returns its number as result."""
+        self.calls.append((is_economy, force_refresh))
+        self.started.set()
+        await self.release.wait()
+        self.release.clear()
+        return {CONF_DOMAIN: "foo.ipv64.net", "cycle": len(self.calls)}
+
+    async def async_next(self) -> None:
+        """Finish the cycle in flight and wait for the next one to start."""
+        self.started.clear()
+        self.release.set()
+        async with asyncio.timeout(5):
+            await self.started.wait()
+
+
+@pytest.fixture
+async def cycle(hass: HomeAssistant, api: AiohttpClientMocker) -> AsyncIterator[tuple[IPv64DataUpdateCoordinator, FakeCycle]]:
+    """Set up foo.ipv64.net and run its refresh cycles with a fake cycle."""
+    entry = create_entry(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    fake_cycle = FakeCycle()
+    with patch.object(coordinator, "_async_refresh_cycle", fake_cycle):
+        yield coordinator, fake_cycle
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+def _refresh_service(hass: HomeAssistant, *, economy: bool) -> asyncio.Task[Any]:
+    """Start a call of the refresh service, returns the task of the call."""
+    return hass.async_create_task(
+        hass.services.async_call(DOMAIN, SERVICE_REFRESH, {CONF_API_ECONOMY: economy}, blocking=True, return_response=True),
+        eager_start=False,
+    )
+
+
+async def test_concurrent_refreshes_share_cycle(
+    hass: HomeAssistant, cycle: tuple[IPv64DataUpdateCoordinator, FakeCycle]
+) -> None:
+    """Test scheduled refreshes arriving during a cycle join it."""
+    coordinator, fake_cycle = cycle
+    refreshes = [hass.async_create_task(coordinator.async_refresh(), eager_start=False) for _ in range(3)]
+    await fake_cycle.started.wait()
+    await asyncio.sleep(0)
+
+    fake_cycle.release.set()
+    await asyncio.gather(*refreshes)
+
+    assert fake_cycle.calls == [(False, False)]
+    assert coordinator.joined_refreshes == 2
+
+
+@pytest.mark.parametrize(("economy", "follow_up_economy"), [((True, True), True), ((True, False), False)])
+async def test_forced_refresh_queues_one_follow_up(
+    hass: HomeAssistant,
+    cycle: tuple[IPv64DataUpdateCoordinator, FakeCycle],
+    economy: tuple[bool, bool],
+    follow_up_economy: bool,
+) -> None:
+    """Test forced refreshes during a cycle share one follow-up, which callers join until it starts."""
+    coordinator, fake_cycle = cycle
+    scheduled = hass.async_create_task(coordinator.async_refresh(), eager_start=False)
+    await fake_cycle.started.wait()
+
+    with patch.object(coordinator, "async_set_updated_data") as publish:
+        forced = [_refresh_service(hass, economy=value) for value in economy]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert coordinator.queued_refreshes == 1
+
+        # The follow-up took over, a scheduled refresh arriving now joins it
+        await fake_cycle.async_next()
+        await scheduled
+        joining = hass.async_create_task(coordinator.async_refresh(), eager_start=False)
+        await asyncio.sleep(0)
+
+        fake_cycle.release.set()
+        responses = await asyncio.gather(*forced)
+        await joining
+
+    assert fake_cycle.calls == [(False, False), (follow_up_economy, True)]
+    results = [response[CONF_DOMAINS]["foo.ipv64.net"] for response in responses]
+    assert [(result["cycle"], result["joined"]) for result in results] == [(2, False), (2, True)]
+    # Only the caller that queued the follow-up publishes it
+    assert publish.call_count == 1
+    assert coordinator.queued_refreshes == 1
+    assert coordinator.joined_refreshes == 2
+
+    # Without a cycle in flight, the next refresh starts a new one
+    fake_cycle.release.set()
+    await coordinator.async_refresh()
+    assert len(fake_cycle.calls) == 3
@@ -0,0 +1,69 @@
+"""Tests for the DNS client of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from custom_components.ipv64.dnsclient import DNS_TYPES, DNSError, build_dns_query, parse_dns_response
+
+QUERY_ID = 0x1234
+
+
+def _record(rtype: int, rdata: bytes, ttl: int = 300) -> bytes:
+    """Return an answer record for the name of the question."""
+    return b"\xc0\x0c" + struct.pack("!HHIH", rtype, 1, ttl, len(rdata)) + rdata
+
+
+def _response(name: str, qtype: int, records: list[bytes], *, flags: int = 0x8180, query_id: int = QUERY_ID) -> bytes:
+    """Return a response to the query for `name` with the answer `records`."""
+    question = build_dns_query(query_id, name, qtype)[12:]
+    return struct.pack("!HHHHHH", query_id, flags, 1, len(records), 0, 0) + question + b"".join(records)
+
+
+def test_parse_address_records() -> None:
+    """Test A, AAAA and TXT answers are returned with their TTL."""
+    message = _response(
+        "myip.opendns.com",
+        DNS_TYPES["A"],
+        [
+            _record(DNS_TYPES["A"], bytes([192, 0, 2, 1]), 60),
+            _record(DNS_TYPES["AAAA"], bytes.fromhex("20010db8000000000000000000000001")),
+            _record(DNS_TYPES["TXT"], b'\x0b"192.0.2.1"'),
+        ],
+    )
+
+    assert parse_dns_response(message, QUERY_ID) == [
+        (DNS_TYPES["A"], "192.0.2.1", 60),
+        (DNS_TYPES["AAAA"], "2001:db8::1", 300),
+        (DNS_TYPES["TXT"], '"192.0.2.1"', 300),
+    ]
+
+
+def test_parse_compressed_names() -> None:
+    """Test names in NS records are decompressed."""
+    message = _response("ipv64.net", DNS_TYPES["NS"], [_record(DNS_TYPES["NS"], b"\x03ns1\xc0\x0c")])
+
+    assert parse_dns_response(message, QUERY_ID) == [(DNS_TYPES["NS"], "ns1.ipv64.net", 300)]
+
+
+def test_parse_nxdomain() -> None:
+    """Test a name that does not exist has no records."""
+    assert parse_dns_response(_response("missing.ipv64.net", DNS_TYPES["A"], [], flags=0x8183), QUERY_ID) == []
+
+
+@pytest.mark.parametrize(
+    ("message", "error"),
+    [
+        (_response("ipv64.net", DNS_TYPES["A"], [], query_id=1), "does not match"),
+        (_response("ipv64.net", DNS_TYPES["A"], [], flags=0x8380), "truncated"),
+        (_response("ipv64.net", DNS_TYPES["A"], [], flags=0x8182), "rcode 2"),
+        (_response("ipv64.net", DNS_TYPES["A"], [_record(DNS_TYPES["A"], bytes(4))])[:-8], "Malformed"),
+        (_response("ipv64.net", DNS_TYPES["NS"], [_record(DNS_TYPES["NS"], b"\xc0\x27")]), "compression loop"),
+    ],
+)
+def test_parse_invalid_response(message: bytes, error: str) -> None:
+    """Test invalid responses raise DNSError."""
+    with pytest.raises(DNSError, match=error):
+        parse_dns_response(message, QUERY_ID)
@@ -0,0 +1,104 @@
+"""Tests for the services of the IPv64.net integration."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+import re
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.ipv64.const import (
+    DOMAIN,
+    SERVICE_ADD_DOMAIN,
+    SERVICE_ADD_DOMAINS,
+    SERVICE_DELETE_DOMAIN,
+    SERVICE_REFRESH,
+)
+from homeassistant.const import CONF_DOMAIN, CONF_DOMAINS
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .common import API_URL, CHECKIP_URL, DOMAINS, create_entry
+
+
+@pytest.fixture(autouse=True)
+async def setup_entry(hass: HomeAssistant, api: AiohttpClientMocker) -> AsyncIterator[None]:
+    """Set up foo.ipv64.net."""
+    entry = create_entry(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    yield
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("service", [SERVICE_ADD_DOMAIN, SERVICE_DELETE_DOMAIN])
+async def test_domain_service_response(hass: HomeAssistant, service: str) -> None:
+    """Test a domain service responds with its result."""
+    response = await hass.services.async_call(
+        DOMAIN, service, {CONF_DOMAIN: "bar.ipv64.net"}, blocking=True, return_response=True
+    )
+
+    assert response is not None
+    assert {key: response[key] for key in (CONF_DOMAIN, "success", "error")} == {
+        CONF_DOMAIN: "bar.ipv64.net",
+        "success": True,
+        "error": None,
+    }
+    assert response["duration"] >= 0
+
+
+async def test_domain_service_failure(hass: HomeAssistant, api: AiohttpClientMocker) -> None:
+    """Test a failed API request is in the response, or raised without one."""
+    api.clear_requests()
+    api.post(API_URL, json={"info": "error", "add_domain": "domain exists"})
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_ADD_DOMAIN, {CONF_DOMAIN: "bar.ipv64.net"}, blocking=True, return_response=True
+    )
+    assert response is not None
+    assert (response["success"], response["error"]) == (False, "Failed to add domain: domain exists")
+
+    with pytest.raises(HomeAssistantError, match="domain exists") as exc_info:
+        await hass.services.async_call(DOMAIN, SERVICE_ADD_DOMAIN, {CONF_DOMAIN: "bar.ipv64.net"}, blocking=True)
+    assert not isinstance(exc_info.value, ServiceValidationError)
+
+
+@pytest.mark.parametrize("service", [SERVICE_ADD_DOMAIN, SERVICE_DELETE_DOMAIN])
+async def test_domain_service_invalid_domain(hass: HomeAssistant, api: AiohttpClientMocker, service: str) -> None:
+    """Test a domain that is not allowed is reported as invalid input without a request."""
+    api.mock_calls.clear()
+
+    response = await hass.services.async_call(
+        DOMAIN, service, {CONF_DOMAIN: "bar.example.com"}, blocking=True, return_response=True
+    )
+    assert response is not None
+    assert (response["success"], response["error"]) == (False, "Domain bar.example.com not allowed")
+
+    with pytest.raises(ServiceValidationError, match="not allowed"):
+        await hass.services.async_call(DOMAIN, service, {CONF_DOMAIN: "bar.example.com"}, blocking=True)
+    with pytest.raises(ServiceValidationError, match="not allowed"):
+        await hass.services.async_call(DOMAIN, SERVICE_ADD_DOMAINS, {CONF_DOMAINS: ["bar.example.com"]}, blocking=True)
+    assert api.mock_calls == []
+
+
+async def test_refresh_response(hass: HomeAssistant, api: AiohttpClientMocker) -> None:
+    """Test the refresh responds with the result of each entry, also if it failed, and raises the error without one."""
+    response = await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True, return_response=True)
+    assert response is not None
+    assert (response["succeeded"], response["failed"]) == (1, 0)
+    assert response[CONF_DOMAINS]["foo.ipv64.net"]["success"]
+
+    api.clear_requests()
+    api.get(re.compile(r".*get_account_info.*"), status=401)
+    api.get(re.compile(r".*get_domains.*"), json=DOMAINS)
+    api.get(CHECKIP_URL, text="192.0.2.1\n")
+
+    response = await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True, return_response=True)
+    assert response is not None
+    assert (response["succeeded"], response["failed"]) == (0, 1)
+    result = response[CONF_DOMAINS]["foo.ipv64.net"]
+    assert not result["success"]
+    assert result["error"].startswith("Invalid API key")
+
+    with pytest.raises(HomeAssistantError, match="Invalid API key"):
+        await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
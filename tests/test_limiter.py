@@ -0,0 +1,71 @@
+"""Tests for the rate limiter of the IPv64.net API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ipv64 import limiter
+from custom_components.ipv64.limiter import TokenBucket
+
+from .common import FakeClock
+
+
+@pytest.fixture
+def clock(fake_clock: FakeClock) -> Iterator[FakeClock]:
+    """Run the limiter on a fake clock."""
+    with (
+        patch.object(limiter, "time", SimpleNamespace(monotonic=fake_clock.monotonic)),
+        patch.object(limiter, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=fake_clock.sleep)),
+    ):
+        yield fake_clock
+
+
+async def test_burst_within_capacity(clock: FakeClock) -> None:
+    """Test a burst up to the rate is not delayed and the next request waits for a token."""
+    bucket = TokenBucket(rate=3, period=10)
+
+    assert [await bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert await bucket.acquire() == pytest.approx(10 / 3)
+    assert clock.sleeps == [pytest.approx(10 / 3)]
+    assert bucket.requests == 4
+    assert bucket.throttled == 1
+
+
+async def test_refill_is_capped(clock: FakeClock) -> None:
+    """Test tokens accumulate while idle but never beyond the capacity."""
+    bucket = TokenBucket(rate=3, period=10)
+    for _ in range(3):
+        await bucket.acquire()
+
+    clock.now += 100
+    assert [await bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert await bucket.acquire() > 0
+
+
+async def test_waiters_are_spread_out(clock: FakeClock) -> None:
+    """Test concurrent requests are released one period apart in the order they arrived."""
+    bucket = TokenBucket(rate=1, period=2)
+    order: list[int] = []
+
+    async def request(index: int) -> float:
+        wait = await bucket.acquire()
+        order.append(index)
+        return wait
+
+    waits = await asyncio.gather(*(request(index) for index in range(4)))
+
+    assert order == [0, 1, 2, 3]
+    assert waits == [0.0, pytest.approx(2), pytest.approx(2), pytest.approx(2)]
+    assert clock.now == pytest.approx(1006)
+    assert bucket.as_dict() == {
+        "requests": 4,
+        "throttled": 3,
+        "total_wait": 6.0,
+        "max_wait": 2.0,
+        "average_wait": 2.0,
+    }
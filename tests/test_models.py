@@ -0,0 +1,79 @@
+"""Tests for the account and domain data of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from custom_components.ipv64.models import DomainList, DomainMetadata, DomainRecord
+
+PAYLOAD: dict[str, Any] = {
+    "subdomains": {
+        "foo.ipv64.net": {
+            "updates": 12,
+            "wildcard": 1,
+            "domain_update_hash": "hash",
+            "ipv6prefix": "",
+            "dualstack": "",
+            "deactivated": 0,
+            "records": [
+                {"record_id": 1, "content": "192.0.2.1", "ttl": 60, "type": "A", "praefix": "", "last_update": "2025-01-15"},
+                {"record_id": 2, "content": "2001:db8::1", "ttl": 60, "type": "AAAA", "praefix": ""},
+                {"record_id": 3, "content": "192.0.2.2", "ttl": "3600", "type": "A", "praefix": "www", "deactivated": 1},
+            ],
+        },
+        "bar.ipv64.net": {"records": [{"content": "v=spf1 -all", "ttl": 300, "type": "TXT", "failover_policy": "1"}]},
+    }
+}
+
+
+def test_from_api() -> None:
+    """Test records are named by their prefix and dual-stack records are merged."""
+    domain_list = DomainList.from_api(PAYLOAD)
+
+    assert list(domain_list.records) == ["foo.ipv64.net", "www.foo.ipv64.net", "bar.ipv64.net"]
+    foo = domain_list.records["foo.ipv64.net"]
+    assert (foo.ipv4, foo.ipv6, foo.last_update) == ("192.0.2.1", "2001:db8::1", "2025-01-15")
+    www = domain_list.records["www.foo.ipv64.net"]
+    assert (www.ttl, www.deactivated, www.ipv6) == (3600, True, None)
+    assert domain_list.records["bar.ipv64.net"].failover_policy == 1
+    assert domain_list.metadata_for("www.foo.ipv64.net") is domain_list.metadata["foo.ipv64.net"]
+    assert domain_list.metadata["bar.ipv64.net"] == DomainMetadata()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_round_trip(compact: bool) -> None:
+    """Test both storage formats restore the same list after a trip through JSON."""
+    domain_list = DomainList.from_api(PAYLOAD)
+
+    stored = json.loads(json.dumps(domain_list.as_dict(compact=compact)))
+
+    assert ("rows" in stored) is compact
+    assert DomainList.from_dict(stored) == domain_list
+
+
+def test_compact_format() -> None:
+    """Test the compact format lists the record fields once and leaves out unset metadata."""
+    stored = DomainList.from_api(PAYLOAD).as_dict(compact=True)
+
+    assert stored["fields"][0] == "name"
+    assert len(stored["rows"]) == 3
+    assert all(len(row) == len(stored["fields"]) for row in stored["rows"])
+    assert stored["metadata"]["bar.ipv64.net"] == {}
+    assert stored["metadata"]["foo.ipv64.net"]["ipv6prefix"] == ""
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_restore_without_ip6_address(compact: bool) -> None:
+    """Test lists stored before dual-stack support are restored."""
+    record = DomainRecord("foo.ipv64.net", "192.0.2.1", "A", 60, 0, False, None)
+    stored = DomainList({record.name: record}, {}).as_dict(compact=compact)
+    if compact:
+        stored["fields"].remove("ip6_address")
+        stored["rows"] = [row[:-1] for row in stored["rows"]]
+    else:
+        del stored["records"][0]["ip6_address"]
+
+    assert DomainList.from_dict(stored).records == {record.name: record}
@@ -0,0 +1,132 @@
+"""Tests for the queue of the DynDNS updates of the IPv64.net integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ipv64 import outbox
+from custom_components.ipv64.outbox import PendingUpdate, UpdateOutbox
+from homeassistant.core import HomeAssistant
+
+from .common import FakeClock
+
+KEY = "ipv64_test_outbox"
+NOW = 1_750_000_000.0
+
+
+@pytest.fixture
+def clock(fake_clock: FakeClock) -> Iterator[FakeClock]:
+    """Run the outbox on a fake clock with the longest jitter delay."""
+    fake_clock.now = NOW
+    with (
+        patch.object(outbox, "time", SimpleNamespace(time=fake_clock.time)),
+        patch.object(outbox, "random", SimpleNamespace(uniform=lambda low, high: high)),
+    ):
+        yield fake_clock
+
+
+async def test_delivered_without_write(hass: HomeAssistant, hass_storage: dict[str, Any], clock: FakeClock) -> None:
+    """Test an update delivered at the first attempt is never written."""
+    updates = UpdateOutbox(hass, KEY)
+    update = await updates.async_enqueue("foo.ipv64.net", "192.0.2.1", None)
+
+    assert update.due
+    assert updates.get("foo.ipv64.net") is update
+    await updates.async_delivered("foo.ipv64.net")
+
+    assert updates.get("foo.ipv64.net") is None
+    assert KEY not in hass_storage
+    assert updates.as_dict() == {
+        "pending": [],
+        "queued": 1,
+        "superseded": 0,
+        "delivered": 1,
+        "failed": 0,
+        "discarded": 0,
+    }
+
+
+async def test_supersede(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test the same addresses keep the queued update and other addresses replace it."""
+    updates = UpdateOutbox(hass, KEY)
+    queued = await updates.async_enqueue("foo.ipv64.net", "192.0.2.1", None)
+    await updates.async_failed("foo.ipv64.net", "unavailable")
+
+    assert await updates.async_enqueue("foo.ipv64.net", "192.0.2.1", None) is queued
+    assert not queued.due
+
+    newer = await updates.async_enqueue("foo.ipv64.net", "192.0.2.2", "2001:db8::1")
+    assert newer is not queued
+    assert newer.due
+    assert newer.attempts == 0
+    assert updates.superseded == 1
+    assert updates.queued == 2
+
+
+async def test_backoff(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test failed updates are retried with doubling delays up to the maximum."""
+    updates = UpdateOutbox(hass, KEY)
+    await updates.async_enqueue("foo.ipv64.net", "192.0.2.1", None)
+
+    delays = []
+    for _ in range(8):
+        update = await updates.async_failed("foo.ipv64.net", "unavailable")
+        assert update is not None
+        delays.append(update.next_attempt - clock.now)
+
+    assert delays == [60, 120, 240, 480, 960, 1920, 3600, 3600]
+    assert update.attempts == 8
+    assert update.last_error == "unavailable"
+    assert updates.next_attempt == NOW + 3600
+
+    clock.now += 3600
+    assert update.due
+
+
+async def test_retry_at(hass: HomeAssistant, clock: FakeClock) -> None:
+    """Test a given retry time replaces the backoff, e.g. the daily reset."""
+    updates = UpdateOutbox(hass, KEY)
+    await updates.async_enqueue("foo.ipv64.net", "192.0.2.1", None)
+
+    update = await updates.async_failed("foo.ipv64.net", "limit reached", retry_at=NOW + 7200)
+
+    assert update is not None
+    assert update.next_attempt == NOW + 7200
+    assert await updates.async_failed("bar.ipv64.net", "unknown") is None
+
+
+async def test_persisted_across_restart(hass: HomeAssistant, hass_storage: dict[str, Any], clock: FakeClock) -> None:
+    """Test a failed update is stored and restored until it was delivered."""
+    updates = UpdateOutbox(hass, KEY)
+    await updates.async_enqueue("foo.ipv64.net", "192.0.2.1", None)
+    await updates.async_failed("foo.ipv64.net", "unavailable")
+
+    assert [update["domain"] for update in hass_storage[KEY]["data"]["pending"]] == ["foo.ipv64.net"]
+
+    restored = UpdateOutbox(hass, KEY)
+    await restored.async_load()
+    update = restored.get("foo.ipv64.net")
+    assert update is not None
+    assert update.as_dict() == updates.as_dict()["pending"][0]
+
+    await restored.async_discard("foo.ipv64.net", "DNS already up to date")
+    assert hass_storage[KEY]["data"]["pending"] == []
+    assert restored.discarded == 1
+
+
+async def test_load_skips_invalid(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test invalid stored updates are ignored."""
+    hass_storage[KEY] = {
+        "version": 1,
+        "key": KEY,
+        "data": {"pending": [{"ip": "192.0.2.1"}, PendingUpdate("foo.ipv64.net", None, "2001:db8::1").as_dict()]},
+    }
+    updates = UpdateOutbox(hass, KEY)
+    await updates.async_load()
+
+    assert [update["domain"] for update in updates.as_dict()["pending"]] == ["foo.ipv64.net"]
@@ -0,0 +1,253 @@
+"""Tests for the public IP resolver of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+import struct
+from typing import Any
+from unittest.mock import Mock, patch
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from custom_components.ipv64 import resolver
+from custom_components.ipv64.metrics import EndpointMetrics
+from custom_components.ipv64.resolver import (
+    DNSProvider,
+    HTTPProvider,
+    IPProvider,
+    IPResolveError,
+    PublicIPResolver,
+    create_provider,
+)
+
+
+class FakeProvider(IPProvider):
+    """Provider answering with a fixed address or error once released."""
+
+    def __init__(self, name: str, address: str | None = None, *, error: Exception | None = None) -> None:
+        """Initialize the provider, it answers right away."""
+        super().__init__(name)
+        self.address = address
+        self.error = error
+        self.release = asyncio.Event()
+        self.release.set()
+        self.started = asyncio.Event()
+
+    async def _async_resolve(self) -> str:
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        assert self.address is not None
+        return self.address
+
+
+class DNSServer(asyncio.DatagramProtocol):
+    """DNS server answering every query with the configured records."""
+
+    def __init__(self, records: list[tuple[int, bytes]]) -> None:
+        """Initialize the server with (type, rdata) answers."""
+        self.records = records
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        assert isinstance(transport, asyncio.DatagramTransport)
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        """Answer the query with the records, keeping its ID and question."""
+        assert self.transport is not None
+        header = struct.pack("!HHHHHH", struct.unpack_from("!H", data)[0], 0x8180, 1, len(self.records), 0, 0)
+        answers = b"".join(
+            b"\xc0\x0c" + struct.pack("!HHIH", rtype, 1, 0, len(rdata)) + rdata for rtype, rdata in self.records
+        )
+        self.transport.sendto(header + data[12:] + answers, addr)
+
+
+@pytest.fixture(autouse=True)
+def hedge_delay() -> Iterator[None]:
+    """Start the next provider after 10 milliseconds instead of a second."""
+    with patch.object(resolver, "IP_HEDGE_DELAY", 0.01):
+        yield
+
+
+@pytest.fixture
+async def dns_server(socket_enabled: None) -> AsyncIterator[tuple[DNSServer, int]]:
+    """Run a DNS server on a local UDP port."""
+    server = DNSServer([(1, bytes([192, 0, 2, 1]))])
+    transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+    yield server, transport.get_extra_info("sockname")[1]
+    transport.close()
+
+
+@pytest.fixture
+async def session(socket_enabled: None) -> AsyncIterator[aiohttp.ClientSession]:
+    """Return a client session."""
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+async def test_http_provider(aiohttp_server: Any, session: aiohttp.ClientSession) -> None:
+    """Test the address is read from the response body and failures are counted."""
+    bodies = {"/ip": "192.0.2.1\n", "/invalid": "<html>"}
+
+    async def handler(request: web.Request) -> web.Response:
+        if request.path not in bodies:
+            return web.Response(status=503)
+        return web.Response(text=bodies[request.path])
+
+    app = web.Application()
+    app.router.add_get("/{path}", handler)
+    server = await aiohttp_server(app)
+
+    provider = HTTPProvider("http", session, str(server.make_url("/ip")))
+    assert await provider.async_resolve() == "192.0.2.1"
+    invalid = HTTPProvider("invalid", session, str(server.make_url("/invalid")))
+    with pytest.raises(IPResolveError):
+        await invalid.async_resolve()
+    unavailable = HTTPProvider("unavailable", session, str(server.make_url("/down")))
+    with pytest.raises(aiohttp.ClientResponseError):
+        await unavailable.async_resolve()
+
+    assert provider.stats.as_dict()["successes"] == 1
+    assert provider.stats.last_latency is not None
+    assert invalid.stats.failures == 1
+    assert invalid.stats.last_error == "Invalid IP address '<html>'"
+    assert unavailable.stats.failures == 1
+
+
+async def test_dns_provider(dns_server: tuple[DNSServer, int]) -> None:
+    """Test the address is read from the answer of the queried type."""
+    server, port = dns_server
+    provider = DNSProvider("dns", "127.0.0.1", port, "myip.opendns.com")
+    assert await provider.async_resolve() == "192.0.2.1"
+
+    server.records = [(16, b'\x0b"192.0.2.2"')]
+    txt = DNSProvider("txt", "127.0.0.1", port, "whoami.cloudflare", qtype=16, qclass=3)
+    assert await txt.async_resolve() == "192.0.2.2"
+
+    # An answer of another type than the queried one does not count
+    with pytest.raises(IPResolveError, match="no address"):
+        await provider.async_resolve()
+    assert provider.stats.successes == 1
+    assert provider.stats.failures == 1
+
+
+async def test_provider_metrics(
+    aiohttp_server: Any, session: aiohttp.ClientSession, dns_server: tuple[DNSServer, int]
+) -> None:
+    """Test lookups over HTTP and DNS are recorded in the metrics of the public IP check."""
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text="192.0.2.1")
+
+    app = web.Application()
+    app.router.add_get("/ip", handler)
+    server = await aiohttp_server(app)
+    metrics = EndpointMetrics()
+    _, port = dns_server
+
+    http = HTTPProvider("http", session, str(server.make_url("/ip")), metrics)
+    missing = HTTPProvider("missing", session, str(server.make_url("/missing")), metrics)
+    dns = DNSProvider("dns", "127.0.0.1", port, "myip.opendns.com", metrics=metrics)
+    assert await http.async_resolve() == "192.0.2.1"
+    assert await dns.async_resolve() == "192.0.2.1"
+    with pytest.raises(aiohttp.ClientResponseError):
+        await missing.async_resolve()
+
+    assert metrics.requests == 3
+    assert metrics.errors == 1
+    assert metrics.statuses == {200: 1, 404: 1}
+    assert metrics.latency.count == 2
+
+
+def test_create_provider() -> None:
+    """Test providers are created from their URLs."""
+    session = Mock(spec=aiohttp.ClientSession)
+
+    assert isinstance(create_provider("https://api.ipify.org/", session), HTTPProvider)
+    provider = create_provider("dns://[2620:119:35::35]:5353/myip.opendns.com?type=AAAA", session)
+    assert isinstance(provider, DNSProvider)
+    assert provider.name == "dns://[2620:119:35::35]:5353/myip.opendns.com?type=AAAA"
+
+    for spec in ("dns://1.1.1.1/whoami.cloudflare?type=MX", "dns://1.1.1.1/", "ftp://example.com/ip"):
+        with pytest.raises(ValueError, match="Unsupported"):
+            create_provider(spec, session)
+
+
+async def test_resolver_hedges_slow_provider() -> None:
+    """Test the next provider starts when the first is slow and the first answer wins."""
+    slow = FakeProvider("slow", "192.0.2.1")
+    slow.release.clear()
+    fast = FakeProvider("fast", "192.0.2.2")
+
+    assert await PublicIPResolver([slow, fast]).async_resolve() == "192.0.2.2"
+    assert fast.stats.wins == 1
+    assert slow.stats.cancelled == 1
+
+
+async def test_resolver_moves_on_after_failure() -> None:
+    """Test the next provider starts right away when one fails."""
+    failing = FakeProvider("failing", error=IPResolveError("down"))
+    backup = FakeProvider("backup", "192.0.2.1")
+
+    with patch.object(resolver, "IP_HEDGE_DELAY", 60):
+        async with asyncio.timeout(5):
+            assert await PublicIPResolver([failing, backup]).async_resolve() == "192.0.2.1"
+    assert failing.stats.failures == 1
+
+
+async def test_resolver_agreement() -> None:
+    """Test an address has to be reported by the required number of providers."""
+    providers = [
+        FakeProvider("first", "192.0.2.1"),
+        FakeProvider("wrong", "198.51.100.1"),
+        FakeProvider("third", "192.0.2.1"),
+    ]
+    ip_resolver = PublicIPResolver(providers, agreement=2)
+
+    assert await ip_resolver.async_resolve() == "192.0.2.1"
+    assert providers[2].stats.wins == 1
+    assert ip_resolver.as_dict()["agreement"] == 2
+
+    disagreeing = PublicIPResolver([FakeProvider("a", "192.0.2.1"), FakeProvider("b", "198.51.100.1")], agreement=2)
+    with pytest.raises(IPResolveError, match="disagree"):
+        await disagreeing.async_resolve()
+
+
+async def test_resolver_version() -> None:
+    """Test answers of the other address family are skipped."""
+    providers = [FakeProvider("v4", "192.0.2.1"), FakeProvider("v6", "2001:db8::1")]
+
+    assert await PublicIPResolver(providers, version=6).async_resolve() == "2001:db8::1"
+    with pytest.raises(IPResolveError, match="not an IPv6 address"):
+        await PublicIPResolver(providers[:1], version=6).async_resolve()
+
+
+async def test_resolver_all_failed() -> None:
+    """Test the errors of all providers are reported."""
+    providers = [FakeProvider("a", error=IPResolveError("down")), FakeProvider("b", error=TimeoutError())]
+
+    with pytest.raises(IPResolveError, match="All IP providers failed: a: down; b: "):
+        await PublicIPResolver(providers).async_resolve()
+
+
+async def test_resolver_cancelled() -> None:
+    """Test cancelling the resolver cancels the requests of all started providers."""
+    providers = [FakeProvider("a", "192.0.2.1"), FakeProvider("b", "192.0.2.1")]
+    for provider in providers:
+        provider.release.clear()
+
+    task = asyncio.create_task(PublicIPResolver(providers).async_resolve())
+    async with asyncio.timeout(5):
+        await providers[1].started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert [provider.stats.cancelled for provider in providers] == [1, 1]
+    assert [provider.stats.wins for provider in providers] == [0, 0]
@@ -0,0 +1,143 @@
+"""Tests for the retry helper of the IPv64.net requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import aiohttp
+import pytest
+
+from custom_components.ipv64 import retry
+from custom_components.ipv64.retry import async_retry, is_retryable, retry_after
+
+from .common import FakeClock
+
+
+def _response_error(status: int, headers: dict[str, str] | None = None) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(Mock(), (), status=status, message="error", headers=headers)
+
+
+@pytest.fixture
+def clock(fake_clock: FakeClock) -> Iterator[FakeClock]:
+    """Run the retry helper on a fake clock, with the longest backoff instead of a random one."""
+    with (
+        patch.object(retry, "time", SimpleNamespace(monotonic=fake_clock.monotonic)),
+        patch.object(retry, "asyncio", SimpleNamespace(timeout=asyncio.timeout, sleep=fake_clock.sleep)),
+        patch.object(retry, "random", SimpleNamespace(uniform=lambda low, high: high)),
+    ):
+        yield fake_clock
+
+
+class FlakyRequest:
+    """Request raising the given errors before it succeeds."""
+
+    def __init__(self, *errors: Exception) -> None:
+        """Initialize the request."""
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        """Raise the next error or succeed."""
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_retry_after_seconds() -> None:
+    """Test a Retry-After header in seconds."""
+    assert retry_after(_response_error(429, {"Retry-After": "7"})) == 7.0
+    assert retry_after(_response_error(503, {"Retry-After": "0"})) == 0.0
+
+
+def test_retry_after_http_date() -> None:
+    """Test a Retry-After header with an HTTP date, a date in the past means no delay."""
+    future = datetime.now(UTC) + timedelta(seconds=30)
+    assert retry_after(_response_error(429, {"Retry-After": format_datetime(future, usegmt=True)})) == pytest.approx(30, abs=2)
+
+    past = datetime.now(UTC) - timedelta(minutes=5)
+    assert retry_after(_response_error(503, {"Retry-After": format_datetime(past, usegmt=True)})) == 0.0
+
+
+@pytest.mark.parametrize(
+    ("status", "headers"),
+    [
+        (429, None),
+        (429, {"Retry-After": ""}),
+        (429, {"Retry-After": "soon"}),
+        (500, {"Retry-After": "7"}),
+    ],
+)
+def test_retry_after_ignored(status: int, headers: dict[str, str] | None) -> None:
+    """Test missing or invalid headers and statuses that do not carry a Retry-After."""
+    assert retry_after(_response_error(status, headers)) is None
+
+
+def test_is_retryable() -> None:
+    """Test which errors are worth another attempt."""
+    assert is_retryable(TimeoutError())
+    assert is_retryable(aiohttp.ClientConnectionError())
+    assert is_retryable(_response_error(503))
+    assert not is_retryable(_response_error(401))
+    assert not is_retryable(_response_error(429), frozenset({503}))
+    assert not is_retryable(ValueError())
+
+
+async def test_retries_until_success(clock: FakeClock) -> None:
+    """Test transient errors are retried with exponential backoff."""
+    request = FlakyRequest(aiohttp.ClientConnectionError(), _response_error(502))
+
+    assert await async_retry(request, "test", attempts=3, deadline=60) == "ok"
+    assert request.calls == 3
+    assert clock.sleeps == [retry.RETRY_DELAY, retry.RETRY_DELAY * 2]
+
+
+async def test_non_retryable_error_is_raised_at_once(clock: FakeClock) -> None:
+    """Test a client error fails without another attempt."""
+    request = FlakyRequest(_response_error(401))
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await async_retry(request, "test")
+    assert request.calls == 1
+    assert clock.sleeps == []
+
+
+async def test_last_attempt_is_raised(clock: FakeClock) -> None:
+    """Test the error of the last attempt is raised when all attempts failed."""
+    request = FlakyRequest(TimeoutError(), TimeoutError(), aiohttp.ClientConnectionError("last"))
+
+    with pytest.raises(aiohttp.ClientConnectionError, match="last"):
+        await async_retry(request, "test", attempts=3, deadline=60)
+    assert request.calls == 3
+
+
+async def test_retry_after_is_honoured(clock: FakeClock) -> None:
+    """Test the delay requested by the server replaces the backoff."""
+    request = FlakyRequest(_response_error(429, {"Retry-After": "4"}))
+
+    assert await async_retry(request, "test", deadline=60) == "ok"
+    assert clock.sleeps == [4.0]
+
+
+async def test_deadline_stops_retries(clock: FakeClock) -> None:
+    """Test no retry is started that would end after the deadline."""
+    request = FlakyRequest(_response_error(503, {"Retry-After": "30"}))
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await async_retry(request, "test", deadline=10)
+    assert request.calls == 1
+    assert clock.sleeps == []
+
+
+async def test_custom_retryable_statuses(clock: FakeClock) -> None:
+    """Test a status left out of the retryable statuses is raised at once."""
+    request = FlakyRequest(_response_error(429))
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await async_retry(request, "test", retryable_statuses=retry.RETRYABLE_STATUSES - {429})
+    assert request.calls == 1
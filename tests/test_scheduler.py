@@ -0,0 +1,214 @@
+"""Tests for the account scheduler of the IPv64.net integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.ipv64.const import DATA_RATE_LIMITERS, DATA_SCHEDULERS, DOMAIN
+from custom_components.ipv64.scheduler import AccountScheduler, next_daily_reset, plan_poll_interval
+from homeassistant.core import HomeAssistant
+
+from .common import create_entry
+
+BASE = timedelta(minutes=23)
+# 23:00 in Berlin, an hour before the daily reset
+BEFORE_RESET = datetime(2025, 1, 15, 22, 0, tzinfo=UTC)
+
+
+def _plan(*, since_change: float | None = None, stable_for: float = 0, failed: bool = False) -> dict[str, Any]:
+    """Return the plan half a day before the reset with an unknown budget."""
+    return plan_poll_interval(
+        BASE,
+        BEFORE_RESET - timedelta(hours=12),
+        remaining_updates=None,
+        cost_per_poll=1.0,
+        since_change=since_change,
+        stable_for=stable_for,
+        failed=failed,
+    )
+
+
+@pytest.mark.parametrize(
+    ("now", "reset"),
+    [
+        # Winter time (UTC+1)
+        (datetime(2025, 1, 15, 22, 30, tzinfo=UTC), datetime(2025, 1, 15, 23, 0, tzinfo=UTC)),
+        (datetime(2025, 1, 15, 23, 0, tzinfo=UTC), datetime(2025, 1, 16, 23, 0, tzinfo=UTC)),
+        # Summer time (UTC+2)
+        (datetime(2025, 7, 1, 21, 30, tzinfo=UTC), datetime(2025, 7, 1, 22, 0, tzinfo=UTC)),
+        # The day the clocks go forward
+        (datetime(2025, 3, 30, 12, 0, tzinfo=UTC), datetime(2025, 3, 30, 22, 0, tzinfo=UTC)),
+    ],
+)
+def test_next_daily_reset(now: datetime, reset: datetime) -> None:
+    """Test the daily reset is at midnight in Berlin."""
+    assert next_daily_reset(now) == reset
+
+
+def test_plan_default() -> None:
+    """Test the configured interval is kept without a reason to change it."""
+    plan = _plan()
+
+    assert plan["interval"] == 23
+    assert plan["reason"] == "default"
+    assert plan["minutes_until_reset"] == 13 * 60
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "interval", "reason"),
+    [
+        ({"failed": True}, 5, "failure"),
+        ({"since_change": 10 * 60}, 5, "recent_change"),
+        ({"since_change": 45 * 60, "stable_for": 45 * 60}, 23, "default"),
+        ({"stable_for": 2 * 3600}, 46, "stable"),
+        ({"stable_for": 4 * 3600}, 92, "stable"),
+        ({"stable_for": 48 * 3600}, 240, "stable"),
+    ],
+)
+def test_plan_adapts_to_changes(kwargs: dict[str, Any], interval: float, reason: str) -> None:
+    """Test failures and recent changes poll fast and a stable IP polls less often."""
+    plan = _plan(**kwargs)
+
+    assert plan["interval"] == interval
+    assert plan["reason"] == reason
+
+
+def test_plan_keeps_longer_base_interval() -> None:
+    """Test a configured interval above the maximum is not shortened for a stable IP."""
+    plan = plan_poll_interval(
+        timedelta(minutes=300), BEFORE_RESET, remaining_updates=None, cost_per_poll=1.0, since_change=None, stable_for=86400
+    )
+
+    assert plan["interval"] == 300
+    assert plan["reason"] == "default"
+
+
+def test_plan_stretches_to_budget() -> None:
+    """Test the interval is stretched so the projected updates fit the remaining budget."""
+    # 6 updates left, 4 are kept for manual refreshes, 2 for the hour until the reset
+    plan = plan_poll_interval(BASE, BEFORE_RESET, remaining_updates=6, cost_per_poll=1.0, since_change=60, stable_for=60)
+
+    assert plan["interval"] == 30
+    assert plan["reason"] == "budget"
+    assert plan["minutes_until_reset"] == 60
+    assert plan["projected_updates"] == 2
+
+
+@pytest.mark.parametrize("remaining_updates", [4, 0])
+def test_plan_waits_for_reset_when_budget_exhausted(remaining_updates: int) -> None:
+    """Test an exhausted budget waits for the daily reset, even after a failure."""
+    now = BEFORE_RESET + timedelta(minutes=50)
+    plan = plan_poll_interval(
+        BASE, now, remaining_updates=remaining_updates, cost_per_poll=0.5, since_change=None, stable_for=0, failed=True
+    )
+
+    assert plan["interval"] == 10
+    assert plan["reason"] == "budget"
+    assert plan["minutes_until_reset"] == 10
+
+
+def test_plan_without_update_cost() -> None:
+    """Test polls that send no updates are not limited by the budget."""
+    plan = plan_poll_interval(BASE, BEFORE_RESET, remaining_updates=0, cost_per_poll=0, since_change=None, stable_for=0)
+
+    assert plan["interval"] == 23
+    assert plan["reason"] == "default"
+    assert plan["projected_updates"] == 0
+
+
+async def test_fetch_shared_by_concurrent_callers(hass: HomeAssistant) -> None:
+    """Test concurrent callers share one request and later callers reuse its result."""
+    scheduler = AccountScheduler(hass, "key")
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "account"
+
+    tasks = [hass.async_create_task(scheduler.async_fetch_shared("account", fetch), eager_start=False) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["account"] * 3
+    assert await scheduler.async_fetch_shared("account", fetch) == "account"
+    assert calls == 1
+    assert scheduler.shared_fetches == 1
+    assert scheduler.shared_hits == 3
+
+
+async def test_fetch_shared_failure_is_not_cached(hass: HomeAssistant) -> None:
+    """Test the waiting callers get the error of a failed request and the next caller retries it."""
+    scheduler = AccountScheduler(hass, "key")
+    release = asyncio.Event()
+
+    async def fail() -> str:
+        await release.wait()
+        raise ConnectionError("unreachable")
+
+    tasks = [hass.async_create_task(scheduler.async_fetch_shared("account", fail), eager_start=False) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        assert isinstance(result, ConnectionError)
+
+    async def fetch() -> str:
+        return "account"
+
+    assert await scheduler.async_fetch_shared("account", fetch) == "account"
+    assert scheduler.shared_fetches == 2
+
+
+async def test_fetch_shared_cancelled_caller(hass: HomeAssistant) -> None:
+    """Test cancelling the caller running the request lets a waiting caller run it again."""
+    scheduler = AccountScheduler(hass, "key")
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "account"
+
+    first = hass.async_create_task(scheduler.async_fetch_shared("account", fetch), eager_start=False)
+    await asyncio.sleep(0)
+    waiters = [hass.async_create_task(scheduler.async_fetch_shared("account", fetch), eager_start=False) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["account"] * 2
+    assert calls == 2
+    assert scheduler.shared_fetches == 2
+    assert scheduler.shared_hits == 1
+
+
+async def test_removed_with_last_entry(hass: HomeAssistant, api: AiohttpClientMocker) -> None:
+    """Test the scheduler and the rate limiter of an API key are dropped when its last entry is unloaded."""
+    entries = [create_entry(hass), create_entry(hass, entry_id="e2", domain="www.foo.ipv64.net")]
+    # Setting up the integration sets up both entries
+    assert await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+    scheduler = hass.data[DOMAIN][DATA_SCHEDULERS]["key"]
+    assert len(scheduler.coordinators) == 2
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    assert hass.data[DOMAIN][DATA_SCHEDULERS] == {"key": scheduler}
+    assert hass.data[DOMAIN][DATA_RATE_LIMITERS] == {"key": scheduler.limiter}
+
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    assert hass.data[DOMAIN][DATA_SCHEDULERS] == {}
+    assert hass.data[DOMAIN][DATA_RATE_LIMITERS] == {}
@@ -0,0 +1,156 @@
+"""Tests for the sensors of the IPv64.net integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import re
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.ipv64.const import CONF_FORCE_UPDATE, CONF_HEALTHCHECK_INTERVAL, DOMAIN
+from custom_components.ipv64.coordinator import IPv64DataUpdateCoordinator
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .common import ACCOUNT, CHECKIP_URL, DOMAINS, create_entry, mock_api
+
+SENSORS = {
+    "sensor.ipv64_foo_ipv64_net_dyndns_counter_today",
+    "sensor.ipv64_foo_ipv64_net_remaining_updates",
+    "sensor.ipv64_foo_ipv64_net_status",
+    "sensor.ipv64_foo_ipv64_net_ip",
+    "sensor.ipv64_www_foo_ipv64_net_ip",
+    "sensor.ipv64_foo_ipv64_net_last_update",
+}
+
+
+async def _async_setup(hass: HomeAssistant, **options: Any) -> IPv64DataUpdateCoordinator:
+    """Set up foo.ipv64.net with the DNS records published as 192.0.2.1, returns its coordinator."""
+    entry = create_entry(hass, **options)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def _async_refresh_written(
+    hass: HomeAssistant, coordinator: IPv64DataUpdateCoordinator, freezer: FrozenDateTimeFactory
+) -> set[str]:
+    """Refresh the coordinator a minute later, returns the sensors whose state was written."""
+
+    def reported() -> dict[str, datetime]:
+        return {state.entity_id: state.last_reported for state in hass.states.async_all(SENSOR_DOMAIN)}
+
+    before = reported()
+    freezer.tick(60)
+    await coordinator.async_refresh()
+    return {entity_id for entity_id, last_reported in reported().items() if last_reported != before.get(entity_id)}
+
+
+async def test_healthchecks_owned_by_one_entry(hass: HomeAssistant, api: AiohttpClientMocker) -> None:
+    """Test entries sharing an API key create one sensor per healthcheck, which moves when its entry is unloaded."""
+    entity_registry = er.async_get(hass)
+    entries = [
+        create_entry(hass, **{CONF_HEALTHCHECK_INTERVAL: 5}),
+        create_entry(hass, entry_id="e2", domain="www.foo.ipv64.net", **{CONF_HEALTHCHECK_INTERVAL: 5}),
+    ]
+    assert await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+
+    def healthcheck_sensors() -> list[str]:
+        return [
+            entity.unique_id
+            for entity in entity_registry.entities.values()
+            if entity.domain == SENSOR_DOMAIN and "_healthcheck_" in entity.unique_id
+        ]
+
+    assert healthcheck_sensors() == [f"{DOMAIN}_e1_healthcheck_hc1"]
+    assert (
+        hass.states.get(entity_registry.async_get_entity_id(SENSOR_DOMAIN, DOMAIN, f"{DOMAIN}_e1_healthcheck_hc1")).state
+        == "up"
+    )
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+
+    assert f"{DOMAIN}_e2_healthcheck_hc1" in healthcheck_sensors()
+    entity_id = entity_registry.async_get_entity_id(SENSOR_DOMAIN, DOMAIN, f"{DOMAIN}_e2_healthcheck_hc1")
+    assert hass.states.get(entity_id).state == "up"
+
+    await hass.config_entries.async_unload(entries[1].entry_id)
+
+
+async def test_unchanged_refresh_skips_writes(
+    hass: HomeAssistant, api: AiohttpClientMocker, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a refresh without changes writes no state."""
+    coordinator = await _async_setup(hass)
+    assert {state.entity_id for state in hass.states.async_all(SENSOR_DOMAIN)} == SENSORS
+
+    assert await _async_refresh_written(hass, coordinator, freezer) == set()
+    assert coordinator.skipped_writes == len(SENSORS)
+
+
+async def test_changed_ip_writes_affected_sensors(
+    hass: HomeAssistant, api: AiohttpClientMocker, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test an IP update writes the sensors of the changed fields and domain, within the refreshed tiers."""
+    coordinator = await _async_setup(hass)
+    mock_api(api, ip="198.51.100.7")
+
+    # The status shows the update counter as well, but only follows the metadata tier
+    assert await _async_refresh_written(hass, coordinator, freezer) == {
+        "sensor.ipv64_foo_ipv64_net_dyndns_counter_today",
+        "sensor.ipv64_foo_ipv64_net_remaining_updates",
+        "sensor.ipv64_foo_ipv64_net_ip",
+        "sensor.ipv64_foo_ipv64_net_last_update",
+    }
+    assert coordinator.skipped_writes == 2
+    assert hass.states.get("sensor.ipv64_foo_ipv64_net_ip").state == "198.51.100.7"
+
+
+async def test_changed_account_writes_status(
+    hass: HomeAssistant, api: AiohttpClientMocker, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a changed account status is written by a refresh of the metadata tier."""
+    coordinator = await _async_setup(hass)
+    mock_api(api, account={**ACCOUNT, "account_status": "suspended", "dyndns_updates": 9})
+    coordinator.scheduler.async_invalidate()
+
+    assert await _async_refresh_written(hass, coordinator, freezer) == {
+        "sensor.ipv64_foo_ipv64_net_dyndns_counter_today",
+        "sensor.ipv64_foo_ipv64_net_remaining_updates",
+        "sensor.ipv64_foo_ipv64_net_status",
+    }
+    assert coordinator.skipped_writes == 3
+
+
+async def test_availability_written(hass: HomeAssistant, api: AiohttpClientMocker, freezer: FrozenDateTimeFactory) -> None:
+    """Test all sensors are written when they become unavailable and available again, but not in between."""
+    coordinator = await _async_setup(hass)
+    api.clear_requests()
+    api.get(re.compile(r".*get_account_info.*"), status=401)
+    api.get(re.compile(r".*get_domains.*"), json=DOMAINS)
+    api.get(CHECKIP_URL, text="192.0.2.1\n")
+    coordinator.scheduler.async_invalidate()
+
+    assert await _async_refresh_written(hass, coordinator, freezer) == SENSORS
+    assert {hass.states.get(entity_id).state for entity_id in SENSORS} == {STATE_UNAVAILABLE}
+    # The sensors are not notified of another failure
+    assert await _async_refresh_written(hass, coordinator, freezer) == set()
+    assert coordinator.skipped_writes == 0
+
+    mock_api(api)
+    assert await _async_refresh_written(hass, coordinator, freezer) == SENSORS
+    assert hass.states.get("sensor.ipv64_foo_ipv64_net_ip").state == "192.0.2.1"
+
+
+async def test_force_update(hass: HomeAssistant, api: AiohttpClientMocker, freezer: FrozenDateTimeFactory) -> None:
+    """Test the force update option writes the state on every refresh."""
+    coordinator = await _async_setup(hass, **{CONF_FORCE_UPDATE: True})
+
+    assert await _async_refresh_written(hass, coordinator, freezer) == SENSORS
+    assert coordinator.skipped_writes == 0